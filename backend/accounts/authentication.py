@@ -0,0 +1,95 @@
+"""Stateless JWT authentication backed by the claims in ``accounts.tokens``.
+
+``ClaimsJWTAuthentication`` returns a ``ClaimsUser`` built from the token, so
+authenticated reads and permission checks don't query ``accounts.User``.
+Tokens minted before a user's role, staff flags, password or active status
+changed are "stale": the change is recorded in ``revocations`` and such tokens
+fall back to loading the user from the database, so a demoted official loses
+write access as soon as their worker sees the record. Records live in the
+cache for one access-token lifetime and each process re-reads them at most
+every ``AUTH_REVOCATION_CHECK_SECONDS``; configure ``REDIS_URL`` so changes
+reach every worker (with the local-memory cache they only reach the process
+that made them, and other workers catch up when the access token expires).
+"""
+import threading
+import time
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import USER_CLAIMS
+
+REVOKED_PREFIX = "auth:revoked:"
+# Bound on remembered per-user lookups; the table is simply dropped when full.
+MAX_LOCAL_ENTRIES = 10000
+
+
+class ClaimsUser(TokenUser):
+    """Read-only user backed by token claims (``id``, ``username``, ``role``...)."""
+
+    @cached_property
+    def id(self) -> int:
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self) -> str:
+        return self.token.get("role", "")
+
+
+class RevocationCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, user_id) -> None:
+        now = int(time.time())
+        lifetime = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+        cache.set(f"{REVOKED_PREFIX}{user_id}", now, lifetime)
+        with self._lock:
+            self._local[int(user_id)] = (now, time.monotonic())
+
+    def revoked_at(self, user_id: int):
+        hit = self._local.get(user_id)
+        if hit is not None and time.monotonic() - hit[1] < self.ttl:
+            return hit[0]
+        revoked = cache.get(f"{REVOKED_PREFIX}{user_id}")
+        with self._lock:
+            if len(self._local) >= MAX_LOCAL_ENTRIES:
+                self._local.clear()
+            self._local[user_id] = (revoked, time.monotonic())
+        return revoked
+
+    def is_stale(self, user_id: int, issued_at) -> bool:
+        revoked = self.revoked_at(user_id)
+        return revoked is not None and (issued_at is None or issued_at <= revoked)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+revocations = RevocationCache(ttl=getattr(settings, "AUTH_REVOCATION_CHECK_SECONDS", 5))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        # Tokens issued before the claims existed, or before the user changed,
+        # go through the regular database lookup.
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            return super().get_user(validated_token)
+        if revocations.is_stale(user_id, validated_token.get("iat")):
+            return super().get_user(validated_token)
+        return ClaimsUser(validated_token)
@@ -0,0 +1,42 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .authentication import revocations
+from .models import User
+
+# Changes to these make previously issued tokens stale.
+TRACKED_FIELDS = ("role", "is_staff", "is_superuser", "is_active", "password", "username", "email")
+_MISSING = object()
+
+
+def _snapshot(instance):
+    # Read from __dict__ so deferred fields aren't fetched.
+    return tuple(instance.__dict__.get(f, _MISSING) for f in TRACKED_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def snapshot_claims(sender, instance, **kwargs):
+    instance._claims_snapshot = _snapshot(instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_on_change(sender, instance, created, **kwargs):
+    current = _snapshot(instance)
+    if not created and current != instance._claims_snapshot:
+        _revoke_on_commit(instance.pk)
+    instance._claims_snapshot = current
+
+
+@receiver(post_delete, sender=User)
+def revoke_on_delete(sender, instance, **kwargs):
+    _revoke_on_commit(instance.pk)
+
+
+def _revoke_on_commit(user_id):
+    # After commit, like the cache invalidations: a rolled-back change must not
+    # revoke tokens, and a revocation recorded before commit could be read
+    # and answered from the old row by a concurrent request.
+    transaction.on_commit(partial(revocations.revoke, user_id))
@@ -1,3 +1,189 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from config import replica
+from .authentication import ClaimsJWTAuthentication, ClaimsUser, revocations
+from .models import User
+from .tokens import ClaimsRefreshToken
+
+
+def access_token(user) -> str:
+    return str(ClaimsRefreshToken.for_user(user).access_token)
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        revocations.clear()
+        self.user = User.objects.create_user(username="official", password="pw", role=User.Role.OFFICIAL)
+        self.token = access_token(self.user)
+
+    def authenticate(self, token=None):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token or self.token}")
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def change(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            for name, value in fields.items():
+                setattr(user, name, value)
+            user.save()
+        return user
+
+    def test_fresh_token_needs_no_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual((user.id, user.role), (self.user.pk, User.Role.OFFICIAL))
+
+    def test_role_change_makes_old_tokens_load_the_user(self):
+        self.change(role=User.Role.CITIZEN)
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.role, User.Role.CITIZEN)
+
+    def test_password_change_revokes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.set_password("new")
+            user.save()
+        self.assertIsInstance(self.authenticate(), User)
+
+    def test_deactivation_rejects_old_tokens(self):
+        self.change(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_delete_rejects_old_tokens(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.user.pk).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_untracked_change_keeps_claims(self):
+        self.change(first_name="Ada")
+        self.assertIsInstance(self.authenticate(), ClaimsUser)
+
+    def test_revokes_only_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.role = User.Role.CITIZEN
+            self.user.save()
+            self.assertIsInstance(self.authenticate(), ClaimsUser)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertIsInstance(self.authenticate(), User)
+
+    def test_rolled_back_change_does_not_revoke(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.user.role = User.Role.CITIZEN
+                    self.user.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertIsInstance(self.authenticate(), ClaimsUser)
+
+    def test_demoted_official_loses_write_access(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(client.post("/api/projects/", {"title": "Bridge"}, format="json").status_code, 201)
+        self.change(role=User.Role.CITIZEN)
+        self.assertEqual(client.post("/api/projects/", {"title": "Tunnel"}, format="json").status_code, 403)
+
+
+@mock.patch("config.replica.enabled", return_value=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = replica.ReplicaRouter()
+        self.user = User(pk=7, username="citizen")
+        self.token = access_token(self.user)
+
+    def request(self, method="get", token=None, **extra):
+        if token:
+            extra["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+        return getattr(RequestFactory(), method)("/api/projects/", **extra)
+
+    def run_request(self, request, write=False, status=200):
+        """Pass ``request`` through the middleware; return the read aliases before/after writing."""
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(User))
+            if write:
+                self.router.db_for_write(User)
+                reads.append(self.router.db_for_read(User))
+            return HttpResponse(status=status)
+
+        replica.ReplicaRoutingMiddleware(view)(request)
+        return reads
+
+    def test_outside_requests_use_primary(self, enabled):
+        self.assertEqual(self.router.db_for_read(User), "default")
+        with replica.use_replica():
+            self.assertEqual(self.router.db_for_read(User), "replica")
+            with replica.use_primary():
+                self.assertEqual(self.router.db_for_read(User), "default")
+            self.assertEqual(self.router.db_for_write(User), "default")
+            self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_safe_requests_read_from_replica(self, enabled):
+        self.assertEqual(self.run_request(self.request()), ["replica"])
+        self.assertEqual(self.run_request(self.request(token=self.token)), ["replica"])
+
+    def test_unsafe_and_session_requests_use_primary(self, enabled):
+        self.assertEqual(self.run_request(self.request("post")), ["default"])
+        cookie = self.request()
+        cookie.COOKIES[settings.SESSION_COOKIE_NAME] = "abc"
+        self.assertEqual(self.run_request(cookie), ["default"])
+
+    def test_reads_after_a_write_stay_on_primary(self, enabled):
+        self.assertEqual(self.run_request(self.request(), write=True), ["replica", "default"])
+
+    def test_write_pins_the_token_user(self, enabled):
+        self.run_request(self.request("post", token=self.token), write=True)
+        self.assertTrue(replica.is_pinned(7))
+        self.assertEqual(self.run_request(self.request(token=self.token)), ["default"])
+
+        other = access_token(User(pk=8, username="other"))
+        self.assertEqual(self.run_request(self.request(token=other)), ["replica"])
+        self.assertEqual(self.run_request(self.request()), ["replica"])
+
+    def test_failed_or_read_only_requests_do_not_pin(self, enabled):
+        self.run_request(self.request("post", token=self.token), write=True, status=400)
+        self.run_request(self.request("post", token=self.token))
+        self.assertFalse(replica.is_pinned(7))
+
+    def test_unverified_tokens_do_not_pin(self, enabled):
+        forged = jwt.encode(
+            {"token_type": "access", "user_id": 7, "exp": 4102444800, "jti": "x"}, "wrong-key", algorithm="HS256"
+        )
+        self.run_request(self.request("post", token=forged), write=True)
+        self.run_request(self.request("post", token="not-a-token"), write=True)
+        self.assertFalse(replica.is_pinned(7))
+
+    async def test_async_requests_are_routed(self, enabled):
+        reads = []
+
+        async def view(request):
+            reads.append(self.router.db_for_read(User))
+            self.router.db_for_write(User)
+            return HttpResponse()
+
+        middleware = replica.ReplicaRoutingMiddleware(view)
+        await middleware(self.request("post", token=self.token))
+        await middleware(self.request(token=self.token))
+        self.assertEqual(reads, ["default", "default"])
+        self.assertTrue(replica.is_pinned(7))
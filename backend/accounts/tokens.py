@@ -0,0 +1,19 @@
+"""JWTs that carry the fields permission checks need, so requests can be
+authorized without loading the user (see ``accounts.authentication``)."""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Copied onto the access token with the other refresh-token claims.
+USER_CLAIMS = ("username", "email", "role", "is_staff", "is_superuser")
+
+
+def add_user_claims(token, user) -> None:
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        add_user_claims(token, user)
+        return token
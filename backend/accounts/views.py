@@ -2,9 +2,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .serializers import RegisterSerializer
+from .tokens import ClaimsRefreshToken
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
@@ -15,7 +15,7 @@ class RegisterView(APIView):
         user = serializer.save()
 
         # Auto-login: return tokens immediately
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response(
             {
                 "user": {
@@ -35,6 +35,7 @@ class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        # Answered from the token's claims (see accounts.authentication).
         user = request.user
         return Response(
             {
@@ -0,0 +1,188 @@
+"""In-process buffer for analytics beacons.
+
+Beacon views append to the buffer and return immediately; events are written
+with ``bulk_create`` once ``ANALYTICS_BUFFER_MAX_EVENTS`` accumulate or the
+oldest pending event is ``ANALYTICS_BUFFER_FLUSH_SECONDS`` old. The buffer is
+flushed at interpreter exit; if a flush fails (database down, shutdown race),
+events are spooled as NDJSON to ``ANALYTICS_SPOOL_DIR`` and loaded back by
+``manage.py drain_analytics``, which also recovers the events of spool files a
+crashed process left half-written.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .ingest import write_events
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    def __init__(self, max_events: int, flush_seconds: float, spool_dir: Path):
+        self.max_events = max_events
+        self.flush_seconds = flush_seconds
+        self.spool_dir = Path(spool_dir)
+        self._searches = []
+        self._views = []
+        self._oldest = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._searches) + len(self._views)
+
+    def add_search(self, query: str, created_at=None) -> None:
+        self._add(self._searches, (query, created_at or timezone.now()))
+
+    def add_project_view(self, project_id: int, created_at=None) -> None:
+        self._add(self._views, (project_id, created_at or timezone.now()))
+
+    async def aadd_search(self, query: str, created_at=None) -> None:
+        if self._append(self._searches, (query, created_at or timezone.now())):
+            await sync_to_async(self.flush)()
+
+    async def aadd_project_view(self, project_id: int, created_at=None) -> None:
+        if self._append(self._views, (project_id, created_at or timezone.now())):
+            await sync_to_async(self.flush)()
+
+    def _add(self, target, item):
+        if self._append(target, item):
+            self.flush()
+
+    def _append(self, target, item) -> bool:
+        """Queue ``item``; returns whether the buffer is due for a flush."""
+        with self._lock:
+            target.append(item)
+            now = time.monotonic()
+            if self._oldest is None:
+                self._oldest = now
+            due = len(self) >= self.max_events or now - self._oldest >= self.flush_seconds
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return due
+
+    def _take(self):
+        with self._lock:
+            searches, views = self._searches, self._views
+            self._searches, self._views = [], []
+            self._oldest = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return searches, views
+
+    def flush(self) -> int:
+        """Write pending events; on failure spool them to disk. Returns events handled."""
+        with self._flush_lock:
+            searches, views = self._take()
+            if not searches and not views:
+                return 0
+            try:
+                return write_events(searches, views)
+            except Exception:
+                logger.exception("analytics flush failed; spooling %d events", len(searches) + len(views))
+                self.spool(searches, views)
+                return 0
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # Timer threads aren't request threads; release their connections.
+            connections.close_all()
+
+    def spool(self, searches, views) -> Path:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spool_dir / f"{os.getpid()}-{uuid.uuid4().hex}.ndjson"
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            for query, ts in searches:
+                fh.write(json.dumps({"type": "search", "query": query, "created_at": ts.isoformat()}) + "\n")
+            for pid, ts in views:
+                fh.write(json.dumps({"type": "project_view", "project_id": pid, "created_at": ts.isoformat()}) + "\n")
+        tmp.replace(path)
+        return path
+
+    def drain_spool(self) -> int:
+        """Load spooled events back into the database, deleting each file on success."""
+        if not self.spool_dir.exists():
+            return 0
+        self._recover_partial_spools()
+        total = 0
+        for path in sorted(self.spool_dir.glob("*.ndjson")):
+            # Claim the file first so concurrent drains don't load it twice.
+            claimed = path.with_suffix(".draining")
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue
+            searches, views = [], []
+            with claimed.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # The last line of a recovered partial spool file.
+                        logger.warning("skipping truncated analytics event in %s", path.name)
+                        continue
+                    ts = parse_datetime(row["created_at"])
+                    if row["type"] == "search":
+                        searches.append((row["query"], ts))
+                    else:
+                        views.append((int(row["project_id"]), ts))
+            try:
+                total += write_events(searches, views)
+            except Exception:
+                claimed.rename(path)
+                raise
+            claimed.unlink()
+        return total
+
+    def _recover_partial_spools(self) -> None:
+        """Queue ``.tmp`` files left by a process that died while spooling.
+
+        A file still being written is never older than one flush interval.
+        """
+        stale_before = time.time() - self.flush_seconds
+        for tmp in self.spool_dir.glob("*.tmp"):
+            try:
+                if tmp.stat().st_mtime < stale_before:
+                    tmp.rename(tmp.with_suffix(".ndjson"))
+            except FileNotFoundError:
+                continue  # Finished or recovered concurrently.
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> EventBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = EventBuffer(
+                    max_events=settings.ANALYTICS_BUFFER_MAX_EVENTS,
+                    flush_seconds=settings.ANALYTICS_BUFFER_FLUSH_SECONDS,
+                    spool_dir=settings.ANALYTICS_SPOOL_DIR,
+                )
+                atexit.register(_buffer.flush)
+    return _buffer
@@ -0,0 +1,107 @@
+"""Retention for the raw analytics event tables.
+
+Raw events older than the retention window are folded into the daily rollups
+and then deleted (optionally archived to gzipped NDJSON first), one day and
+one bounded batch at a time. Pulse and the project counters only read the
+rollups for anything older than "recent", so they are unaffected.
+"""
+import gzip
+import json
+from collections import Counter
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import ProjectViewDaily, ProjectViewEvent, SearchEvent, SearchQueryDaily
+from .rollups import add_search_totals
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _ensure_rollups(rollup, key, counts, day):
+    """Raise ``rollup`` rows for ``day`` to at least the raw ``counts``.
+
+    Rollups are normally written together with their events, so they already
+    match; taking the maximum also covers days recorded before rollups
+    existed and days whose raw rows were partly deleted by an earlier run.
+    Returns how much each key was raised by.
+    """
+    existing = {getattr(row, key): row for row in rollup.objects.filter(day=day)}
+    create, update, added = [], [], {}
+    for value, n in counts.items():
+        row = existing.get(value)
+        if row is None:
+            create.append(rollup(day=day, count=n, **{key: value}))
+            added[value] = n
+        elif row.count < n:
+            added[value] = n - row.count
+            row.count = n
+            update.append(row)
+    rollup.objects.bulk_create(create)
+    rollup.objects.bulk_update(update, ["count"])
+    return added
+
+
+def _archive(path: Path, rows) -> None:
+    with gzip.open(path, "at", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, default=str) + "\n")
+
+
+def _purge(model, start, end, batch_size, archive_path, fields):
+    deleted = 0
+    qs = model.objects.filter(created_at__gte=start, created_at__lt=end).order_by("id")
+    while True:
+        rows = list(qs.values("id", *fields)[:batch_size])
+        if not rows:
+            return deleted
+        if archive_path is not None:
+            _archive(archive_path, rows)
+        with transaction.atomic():
+            deleted += model.objects.filter(id__in=[r["id"] for r in rows]).delete()[0]
+
+
+def compact_day(day, batch_size=5000, archive_dir: Path | None = None) -> tuple[int, int]:
+    """Fold one day of raw events into the rollups and delete them."""
+    start, end = _day_range(day)
+
+    searches = Counter(dict(
+        SearchEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+        .exclude(query="")
+        .values("query").annotate(n=Count("id")).order_by()
+        .values_list("query", "n")
+    ))
+    views = Counter(dict(
+        ProjectViewEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+        .values("project_id").annotate(n=Count("id")).order_by()
+        .values_list("project_id", "n")
+    ))
+    with transaction.atomic():
+        add_search_totals(_ensure_rollups(SearchQueryDaily, "query", searches, day))
+        _ensure_rollups(ProjectViewDaily, "project_id", views, day)
+
+    search_archive = view_archive = None
+    if archive_dir is not None:
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        search_archive = archive_dir / f"searches-{day.isoformat()}.ndjson.gz"
+        view_archive = archive_dir / f"views-{day.isoformat()}.ndjson.gz"
+
+    return (
+        _purge(SearchEvent, start, end, batch_size, search_archive, ("query", "created_at")),
+        _purge(ProjectViewEvent, start, end, batch_size, view_archive, ("project_id", "created_at")),
+    )
+
+
+def oldest_event_day():
+    found = [
+        model.objects.aggregate(first=Min("created_at"))["first"]
+        for model in (SearchEvent, ProjectViewEvent)
+    ]
+    found = [ts for ts in found if ts is not None]
+    return timezone.localdate(min(found)) if found else None
@@ -0,0 +1,41 @@
+from django.db import IntegrityError, transaction
+
+from projects import counters
+from projects.models import Project
+from .models import ProjectViewEvent, SearchEvent
+from .rollups import record_project_views, record_searches
+
+BATCH_SIZE = 1000
+
+
+def write_events(searches, views) -> int:
+    """Insert ``(query, created_at)`` and ``(project_id, created_at)`` events.
+
+    Rows, their rollup increments and the project view counters are written in
+    one transaction. Views for
+    projects deleted since they were accepted are dropped rather than failing
+    the whole batch.
+    """
+    try:
+        return _write(searches, views)
+    except IntegrityError:
+        existing = set(
+            Project.objects.filter(id__in={pid for pid, _ in views}).values_list("id", flat=True)
+        )
+        return _write(searches, [(pid, ts) for pid, ts in views if pid in existing])
+
+
+def _write(searches, views) -> int:
+    with transaction.atomic():
+        SearchEvent.objects.bulk_create(
+            [SearchEvent(query=query, created_at=ts) for query, ts in searches],
+            batch_size=BATCH_SIZE,
+        )
+        ProjectViewEvent.objects.bulk_create(
+            [ProjectViewEvent(project_id=pid, created_at=ts) for pid, ts in views],
+            batch_size=BATCH_SIZE,
+        )
+        record_searches(searches)
+        record_project_views(views)
+        counters.add_views(views)
+    return len(searches) + len(views)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.models import ProjectViewDaily, ProjectViewEvent, SearchEvent, SearchQueryDaily
+from analytics.rollups import rebuild_search_totals
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily analytics rollups from the raw event tables, for the days "
+        "inside the ANALYTICS_RETENTION_DAYS window that compact_analytics leaves alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Only rebuild the most recent N days (default: the whole retention window).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        batch_size = options["batch_size"]
+        # Older days may have been partly compacted: their raw events no longer
+        # add up to the rollups, so rebuilding them would lose counts.
+        today = timezone.localdate()
+        since = today - timedelta(days=settings.ANALYTICS_RETENTION_DAYS - 1)
+        if days:
+            since = max(since, today - timedelta(days=days - 1))
+        tz = timezone.get_current_timezone()
+
+        searches = (
+            SearchEvent.objects.exclude(query="")
+            .annotate(day=TruncDate("created_at", tzinfo=tz))
+            .values("day", "query")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        views = (
+            ProjectViewEvent.objects.annotate(day=TruncDate("created_at", tzinfo=tz))
+            .values("day", "project_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        searches = searches.filter(day__gte=since)
+        views = views.filter(day__gte=since)
+
+        # Rollup rows for days that still have raw events are replaced; days
+        # whose raw events are gone keep their existing rollups.
+        search_days = set(searches.values_list("day", flat=True).distinct())
+        view_days = set(views.values_list("day", flat=True).distinct())
+
+        with transaction.atomic():
+            SearchQueryDaily.objects.filter(day__in=search_days).delete()
+            ProjectViewDaily.objects.filter(day__in=view_days).delete()
+            SearchQueryDaily.objects.bulk_create(
+                (SearchQueryDaily(day=r["day"], query=r["query"], count=r["count"]) for r in searches.iterator()),
+                batch_size=batch_size,
+            )
+            ProjectViewDaily.objects.bulk_create(
+                (ProjectViewDaily(day=r["day"], project_id=r["project_id"], count=r["count"]) for r in views.iterator()),
+                batch_size=batch_size,
+            )
+            if search_days:
+                rebuild_search_totals()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rollups rebuilt. Search days: {len(search_days)}, View days: {len(view_days)}"
+        ))
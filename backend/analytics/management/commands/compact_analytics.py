@@ -0,0 +1,53 @@
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.compaction import compact_day, oldest_event_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold raw analytics events older than the retention window into the daily "
+        "rollups, then delete them (optionally archiving them first) in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Keep raw events for the most recent N days (default: ANALYTICS_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--archive-dir",
+            default=None,
+            help="Write deleted rows to gzipped NDJSON files in this directory.",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else settings.ANALYTICS_RETENTION_DAYS
+        if days < 1:
+            raise CommandError("--days must be at least 1.")
+        archive_dir = Path(options["archive_dir"]) if options["archive_dir"] else None
+        cutoff = timezone.localdate() - timedelta(days=days - 1)
+
+        day = oldest_event_day()
+        total_days = total_searches = total_views = 0
+        while day is not None and day < cutoff:
+            searches, views = compact_day(day, options["batch_size"], archive_dir)
+            if searches or views:
+                total_days += 1
+                total_searches += searches
+                total_views += views
+                self.stdout.write(f"{day}: {searches} searches, {views} views")
+            # Skip straight to the next day that still has raw events.
+            day = max(day + timedelta(days=1), oldest_event_day() or cutoff)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Compaction complete. Days: {total_days}, Searches removed: {total_searches}, "
+            f"Views removed: {total_views}"
+        ))
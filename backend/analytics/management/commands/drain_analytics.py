@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.buffer import get_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Load spooled analytics event files (written when a worker could not reach the "
+        "database) into the database, including files a crashed worker left half-written."
+    )
+
+    def handle(self, *args, **options):
+        drained = get_buffer().drain_spool()
+        self.stdout.write(self.style.SUCCESS(f"Drain complete. Loaded from spool: {drained}"))
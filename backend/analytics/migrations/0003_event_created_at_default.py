@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projectviewevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='searchevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
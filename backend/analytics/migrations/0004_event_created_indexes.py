@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_event_created_at_default'),
+        ('projects', '0007_project_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectviewevent',
+            index=models.Index(fields=['created_at'], name='projectviewevent_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchevent',
+            index=models.Index(fields=['created_at'], name='searchevent_created_idx'),
+        ),
+    ]
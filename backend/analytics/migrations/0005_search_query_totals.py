@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:09
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def fill_totals(apps, schema_editor):
+    SearchQueryDaily = apps.get_model("analytics", "SearchQueryDaily")
+    SearchQueryTotal = apps.get_model("analytics", "SearchQueryTotal")
+    rows = SearchQueryDaily.objects.values("query").annotate(total=Sum("count")).order_by()
+    SearchQueryTotal.objects.bulk_create(
+        (SearchQueryTotal(query=row["query"], count=row["total"]) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_event_created_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchQueryTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=200, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-count'], name='searchquerytotal_count_idx')],
+            },
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
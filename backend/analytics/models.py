@@ -1,10 +1,52 @@
 from django.db import models
+from django.utils import timezone
 from projects.models import Project
 
+# created_at defaults to "now" rather than auto_now_add so buffered events keep
+# the time they were received, not the time they were flushed.
 class SearchEvent(models.Model):
     query = models.CharField(max_length=200, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"], name="searchevent_created_idx")]
 
 class ProjectViewEvent(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="view_events")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"], name="projectviewevent_created_idx")]
+
+
+# Daily rollups, maintained incrementally by analytics.rollups as events are
+# recorded. Pulse reads these instead of scanning the raw event tables.
+class SearchQueryDaily(models.Model):
+    day = models.DateField()
+    query = models.CharField(max_length=200)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "query"], name="searchquerydaily_day_query_uniq"),
+        ]
+
+class ProjectViewDaily(models.Model):
+    day = models.DateField()
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="daily_views")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "project"], name="projectviewdaily_day_project_uniq"),
+        ]
+
+
+# Running all-time totals per query, kept next to the daily rollup so the
+# all-time top searches don't re-sum every day of history.
+class SearchQueryTotal(models.Model):
+    query = models.CharField(max_length=200, unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["-count"], name="searchquerytotal_count_idx")]
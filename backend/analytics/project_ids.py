@@ -0,0 +1,88 @@
+"""Cached set of existing project IDs used to validate view beacons.
+
+Avoids a ``Project`` lookup per beacon. The set is kept in sync with local
+saves/deletes via signals (``analytics.signals``) and reloaded periodically to
+pick up changes made by other processes.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from projects.models import Project
+
+
+class ProjectIdCache:
+    def __init__(self, ttl: float, miss_reload_interval: float = 5.0):
+        self.ttl = ttl
+        # Unknown IDs trigger a reload at most this often, so a flood of bogus
+        # IDs can't turn into a query per request.
+        self.miss_reload_interval = miss_reload_interval
+        self._ids: set[int] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self) -> set[int]:
+        return self._store(set(Project.objects.values_list("id", flat=True).iterator(chunk_size=10000)))
+
+    async def _aload(self) -> set[int]:
+        return self._store({pid async for pid in Project.objects.values_list("id", flat=True).aiterator(chunk_size=10000)})
+
+    def _store(self, ids: set[int]) -> set[int]:
+        with self._lock:
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+        return ids
+
+    def _current(self) -> set[int]:
+        ids = self._ids
+        if ids is None or time.monotonic() - self._loaded_at >= self.ttl:
+            ids = self._load()
+        return ids
+
+    def contains(self, project_id: int) -> bool:
+        if project_id in self._current():
+            return True
+        if time.monotonic() - self._loaded_at >= self.miss_reload_interval:
+            return project_id in self._load()
+        return False
+
+    def filter(self, project_ids) -> set[int]:
+        known = self._current()
+        return {pid for pid in project_ids if pid in known}
+
+    # Async variants for the ASGI views: the in-memory checks stay on the
+    # event loop and only reloads touch the database.
+    async def _acurrent(self) -> set[int]:
+        ids = self._ids
+        if ids is None or time.monotonic() - self._loaded_at >= self.ttl:
+            ids = await self._aload()
+        return ids
+
+    async def acontains(self, project_id: int) -> bool:
+        if project_id in await self._acurrent():
+            return True
+        if time.monotonic() - self._loaded_at >= self.miss_reload_interval:
+            return project_id in await self._aload()
+        return False
+
+    async def afilter(self, project_ids) -> set[int]:
+        known = await self._acurrent()
+        return {pid for pid in project_ids if pid in known}
+
+    def add(self, project_id: int) -> None:
+        with self._lock:
+            if self._ids is not None:
+                self._ids.add(project_id)
+
+    def discard(self, project_id: int) -> None:
+        with self._lock:
+            if self._ids is not None:
+                self._ids.discard(project_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = None
+
+
+project_ids = ProjectIdCache(ttl=getattr(settings, "ANALYTICS_PROJECT_ID_CACHE_SECONDS", 300))
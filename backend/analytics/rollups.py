@@ -0,0 +1,86 @@
+"""Incremental maintenance of the daily analytics rollups and search totals.
+
+Counts are added with a single ``INSERT ... ON CONFLICT DO UPDATE`` per batch
+(Postgres and SQLite), so concurrent writers never lose increments and
+recording an event costs one statement regardless of history size.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ProjectViewDaily, SearchQueryDaily, SearchQueryTotal
+
+
+def _upsert_counts(model, key_fields, counts):
+    if not counts:
+        return
+    using = router.db_for_write(model)
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    fields = [model._meta.get_field(name) for name in key_fields]
+    columns = [f.column for f in fields]
+
+    if connection.vendor in ("postgresql", "sqlite"):
+        cols = ", ".join(connection.ops.quote_name(c) for c in columns)
+        placeholders = ", ".join(["%s"] * (len(columns) + 1))
+        sql = (
+            f"INSERT INTO {table} ({cols}, count) VALUES ({placeholders}) "
+            f"ON CONFLICT ({cols}) DO UPDATE SET count = {table}.count + excluded.count"
+        )
+        # Sorted so concurrent batches lock conflicting rows in the same
+        # order instead of deadlocking.
+        params = [
+            (*(f.get_db_prep_value(v, connection) for f, v in zip(fields, key)), n)
+            for key, n in sorted(counts.items())
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+        return
+
+    for key, n in counts.items():
+        lookup = dict(zip(columns, key))
+        with transaction.atomic(using=using):
+            updated = model.objects.using(using).filter(**lookup).update(count=F("count") + n)
+            if not updated:
+                try:
+                    with transaction.atomic(using=using):
+                        model.objects.using(using).create(count=n, **lookup)
+                except IntegrityError:
+                    model.objects.using(using).filter(**lookup).update(count=F("count") + n)
+
+
+def record_searches(events):
+    """Add ``(query, created_at)`` pairs to the daily search rollup and the totals."""
+    counts = Counter(
+        (timezone.localdate(created_at), query) for query, created_at in events if query
+    )
+    _upsert_counts(SearchQueryDaily, ("day", "query"), counts)
+    add_search_totals(Counter(query for query, _ in events if query))
+
+
+def add_search_totals(counts):
+    """Add ``{query: n}`` to the all-time search totals."""
+    _upsert_counts(SearchQueryTotal, ("query",), {(query,): n for query, n in counts.items() if n})
+
+
+def rebuild_search_totals():
+    """Recompute the all-time search totals from the daily rollup."""
+    with transaction.atomic():
+        SearchQueryTotal.objects.all().delete()
+        SearchQueryTotal.objects.bulk_create(
+            (
+                SearchQueryTotal(query=row["query"], count=row["total"])
+                for row in SearchQueryDaily.objects.values("query").annotate(total=Sum("count")).order_by().iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+def record_project_views(events):
+    """Add ``(project_id, created_at)`` pairs to the daily view rollup."""
+    counts = Counter(
+        (timezone.localdate(created_at), project_id) for project_id, created_at in events
+    )
+    _upsert_counts(ProjectViewDaily, ("day", "project"), counts)
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+MAX_BATCH_EVENTS = 200
+# Client clocks are trusted within this window; anything outside it is
+# recorded at server receive time instead.
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+MAX_EVENT_AGE = timedelta(days=1)
+
+
+class BeaconEventSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=["search", "project_view"])
+    query = serializers.CharField(required=False, allow_blank=True, trim_whitespace=True)
+    project_id = serializers.IntegerField(required=False, min_value=1)
+    ts = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if attrs["type"] == "search":
+            attrs["query"] = (attrs.get("query") or "")[:200]
+        elif attrs.get("project_id") is None:
+            raise serializers.ValidationError({"project_id": "Required for project_view events."})
+
+        now = timezone.now()
+        ts = attrs.get("ts")
+        if ts is None or ts > now + MAX_CLOCK_SKEW or ts < now - MAX_EVENT_AGE:
+            attrs["ts"] = now
+        return attrs
+
+
+class BeaconBatchSerializer(serializers.Serializer):
+    events = BeaconEventSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_EVENTS)
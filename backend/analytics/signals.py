@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from .project_ids import project_ids
+
+
+@receiver(post_save, sender=Project)
+def remember_project_id(sender, instance, created, **kwargs):
+    if created:
+        project_ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def forget_project_id(sender, instance, **kwargs):
+    project_ids.discard(instance.pk)
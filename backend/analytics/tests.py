@@ -1,3 +1,67 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .compaction import compact_day
+from .ingest import write_events
+from .models import SearchEvent, SearchQueryDaily, SearchQueryTotal
+from .rollups import rebuild_search_totals
+
+
+def at(days_ago):
+    day = timezone.localdate() - timedelta(days=days_ago)
+    return timezone.make_aware(datetime.combine(day, time(12)))
+
+
+class SearchRollupTests(TestCase):
+    def totals(self):
+        return dict(SearchQueryTotal.objects.values_list("query", "count"))
+
+    def test_events_update_daily_rows_and_totals(self):
+        write_events([("roads", at(0)), ("roads", at(0)), ("water", at(1)), ("", at(0))], [])
+        write_events([("roads", at(1))], [])
+        self.assertEqual(
+            set(SearchQueryDaily.objects.values_list("day", "query", "count")),
+            {
+                (at(0).date(), "roads", 2),
+                (at(1).date(), "roads", 1),
+                (at(1).date(), "water", 1),
+            },
+        )
+        self.assertEqual(self.totals(), {"roads": 3, "water": 1})
+        self.assertEqual(SearchEvent.objects.count(), 5)
+
+    def test_compaction_keeps_totals_and_adds_unrolled_events(self):
+        write_events([("roads", at(200)), ("roads", at(200))], [])
+        # Recorded before rollups existed: raw rows only.
+        SearchEvent.objects.bulk_create([SearchEvent(query="water", created_at=at(200))] * 3)
+
+        self.assertEqual(compact_day(at(200).date()), (5, 0))
+        self.assertFalse(SearchEvent.objects.exists())
+        self.assertEqual(self.totals(), {"roads": 2, "water": 3})
+        compact_day(at(200).date())
+        self.assertEqual(self.totals(), {"roads": 2, "water": 3})
+
+    def test_rebuild_matches_daily_rows(self):
+        write_events([("roads", at(0)), ("water", at(3))], [])
+        SearchQueryTotal.objects.filter(query="roads").update(count=50)
+        rebuild_search_totals()
+        self.assertEqual(self.totals(), {"roads": 1, "water": 1})
+
+
+class PulseSearchTests(TransactionTestCase):
+    # Pulse runs its queries on pool threads, which only see committed rows.
+    def setUp(self):
+        cache.clear()
+
+    def test_all_time_and_weekly_top_searches(self):
+        write_events(
+            [("roads", at(30))] * 3 + [("water", at(1))] * 2 + [("roads", at(0))],
+            [],
+        )
+        payload = APIClient().get("/api/pulse/").json()
+        self.assertEqual(payload["top_searches"], [{"query": "roads", "count": 4}, {"query": "water", "count": 2}])
+        self.assertEqual(payload["top_searches_7d"], [{"query": "water", "count": 2}, {"query": "roads", "count": 1}])
@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from .buffer import get_buffer
+from .ingest import write_events
+from .project_ids import project_ids
+
+
+def is_known_project(project_id: int) -> bool:
+    return project_ids.contains(project_id)
+
+
+async def ais_known_project(project_id: int) -> bool:
+    return await project_ids.acontains(project_id)
+
+
+def track_search(query: str) -> None:
+    if settings.ANALYTICS_BUFFER_ENABLED:
+        get_buffer().add_search(query)
+    else:
+        write_events([(query, timezone.now())], [])
+
+
+def track_project_view(project_id: int) -> None:
+    if settings.ANALYTICS_BUFFER_ENABLED:
+        get_buffer().add_project_view(project_id)
+    else:
+        write_events([], [(project_id, timezone.now())])
+
+
+async def atrack_search(query: str) -> None:
+    if settings.ANALYTICS_BUFFER_ENABLED:
+        await get_buffer().aadd_search(query)
+    else:
+        await sync_to_async(write_events)([(query, timezone.now())], [])
+
+
+async def atrack_project_view(project_id: int) -> None:
+    if settings.ANALYTICS_BUFFER_ENABLED:
+        await get_buffer().aadd_project_view(project_id)
+    else:
+        await sync_to_async(write_events)([], [(project_id, timezone.now())])
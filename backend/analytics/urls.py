@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import TrackSearchView, TrackProjectView, PulseView
+from .views import TrackSearchView, TrackProjectView, TrackBatchView, PulseView
 
 urlpatterns = [
     path("analytics/search/", TrackSearchView.as_view()),
     path("analytics/project-view/", TrackProjectView.as_view()),
+    path("analytics/batch/", TrackBatchView.as_view()),
     path("pulse/", PulseView.as_view()),
 ]
@@ -1,123 +1,183 @@
+import asyncio
 from datetime import timedelta
 
-from django.db.models import Count
+from django.db.models import Sum
 from django.utils import timezone
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
 from rest_framework import status
 
-from .models import SearchEvent, ProjectViewEvent
+from config.asyncviews import AsyncAPIView, json_response, run_in_thread
+from config.http_cache import cached_response
+from .models import SearchEvent, ProjectViewEvent, SearchQueryDaily, SearchQueryTotal, ProjectViewDaily
+from .ingest import write_events
+from .project_ids import project_ids
+from .serializers import BeaconBatchSerializer
+from .tracking import ais_known_project, atrack_project_view, atrack_search
+from projects.budget import get_budget_summary
 from projects.models import Project
 
-class TrackSearchView(APIView):
-    permission_classes = [AllowAny]
+# Beacons and Pulse are async views (see config.asyncviews): under ASGI they
+# don't hold a worker thread while waiting on the buffer or the database.
 
-    def post(self, request):
-        q = (request.data.get("query") or "").strip()[:200]
+class TrackSearchView(AsyncAPIView):
+    async def post(self, request):
+        q = self.get_data(request).get("query")
+        q = q.strip()[:200] if isinstance(q, str) else ""
         if q:
-            SearchEvent.objects.create(query=q)
-        return Response({"ok": True}, status=status.HTTP_201_CREATED)
+            await atrack_search(q)
+        return json_response({"ok": True}, status=status.HTTP_202_ACCEPTED)
 
-class TrackProjectView(APIView):
-    permission_classes = [AllowAny]
-
-    def post(self, request):
-        pid = request.data.get("project_id")
+class TrackProjectView(AsyncAPIView):
+    async def post(self, request):
+        pid = self.get_data(request).get("project_id")
         if pid is None:
-            return Response({"error": "project_id required"}, status=400)
+            return json_response({"error": "project_id required"}, status=400)
 
         try:
             pid_int = int(pid)
         except (TypeError, ValueError):
-            return Response({"error": "project_id must be an integer"}, status=400)
+            return json_response({"error": "project_id must be an integer"}, status=400)
 
         if pid_int <= 0:
-            return Response({"error": "project_id must be positive"}, status=400)
-
-        try:
-            p = Project.objects.get(id=pid_int)
-        except Project.DoesNotExist:
-            return Response({"error": "project not found"}, status=404)
-
-        ProjectViewEvent.objects.create(project=p)
-        return Response({"ok": True}, status=status.HTTP_201_CREATED)
-
-class PulseView(APIView):
-    permission_classes = [AllowAny]
-
-    def get(self, request):
-        total_projects = Project.objects.count()
-        since = timezone.now() - timedelta(days=7)
-
-        status_counts = (
-            Project.objects.values("status")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-
-        top_searches = (
-            SearchEvent.objects.exclude(query="")
-            .values("query")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
-        )
-
-        top_viewed = (
-            ProjectViewEvent.objects.values("project_id", "project__title", "project__status", "project__county")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
+            return json_response({"error": "project_id must be positive"}, status=400)
+
+        if not await ais_known_project(pid_int):
+            return json_response({"error": "project not found"}, status=404)
+
+        await atrack_project_view(pid_int)
+        return json_response({"ok": True}, status=status.HTTP_202_ACCEPTED)
+
+class TrackBatchView(AsyncAPIView):
+    """Accept a batch of mixed search/project-view beacons in one request.
+
+    Beacons are anonymous, so JWT decoding is skipped entirely. Views for
+    unknown projects and empty searches are dropped and counted as rejected.
+    """
+
+    async def post(self, request):
+        serializer = BeaconBatchSerializer(data=self.get_data(request))
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data["events"]
+
+        known = await project_ids.afilter({e["project_id"] for e in events if e["type"] == "project_view"})
+        searches = [(e["query"], e["ts"]) for e in events if e["type"] == "search" and e["query"]]
+        views = [
+            (e["project_id"], e["ts"])
+            for e in events
+            if e["type"] == "project_view" and e["project_id"] in known
+        ]
+
+        accepted = await run_in_thread(write_events, searches, views) if searches or views else 0
+        return json_response(
+            {"accepted": accepted, "rejected": len(events) - len(searches) - len(views)},
+            status=status.HTTP_201_CREATED,
         )
 
-        top_searches_7d = (
-            SearchEvent.objects.filter(created_at__gte=since)
-            .exclude(query="")
-            .values("query")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
-        )
 
-        trending_projects_7d = (
-            ProjectViewEvent.objects.filter(created_at__gte=since)
-            .values("project_id", "project__title", "project__status", "project__county")
-            .annotate(count=Count("id"))
-            .order_by("-count")[:10]
+# Pulse sections are independent queries; each runs on its own thread and
+# connection so they overlap instead of running back to back.
+
+def _top_searches(since=None):
+    if since is None:
+        # All-time: the running totals, read through their count index.
+        return list(SearchQueryTotal.objects.filter(count__gt=0).order_by("-count").values("query", "count")[:10])
+    rows = SearchQueryDaily.objects.filter(day__gte=since)
+    return list(rows.values("query").annotate(count=Sum("count")).order_by("-count")[:10])
+
+
+def _top_viewed():
+    # All-time and engagement rankings read the denormalized counters on
+    # Project (see projects.counters), each backed by an index.
+    return [
+        {
+            "project_id": p["id"],
+            "project__title": p["title"],
+            "project__status": p["status"],
+            "project__county": p["county"],
+            "count": p["view_count"],
+        }
+        for p in Project.objects.filter(view_count__gt=0)
+        .order_by("-view_count", "-id")
+        .values("id", "title", "status", "county", "view_count")[:10]
+    ]
+
+
+def _most_discussed():
+    return list(
+        Project.objects.filter(comment_count__gt=0)
+        .order_by("-comment_count", "-id")
+        .values("id", "title", "status", "county", "comment_count", "open_report_count")[:10]
+    )
+
+
+def _trending_projects(since):
+    return list(
+        ProjectViewDaily.objects.filter(day__gte=since)
+        .values("project_id", "project__title", "project__status", "project__county")
+        .annotate(count=Sum("count"))
+        .order_by("-count")[:10]
+    )
+
+
+def _recent_searches():
+    # Primary-key order matches insertion order and avoids sorting the
+    # whole event table on created_at.
+    return list(SearchEvent.objects.order_by("-id").values("query", "created_at")[:10])
+
+
+def _recent_views():
+    return list(
+        ProjectViewEvent.objects.order_by("-id")
+        .values("project_id", "project__title", "created_at")[:10]
+    )
+
+
+class PulseView(AsyncAPIView):
+    # Event data has no version counter; the 30s bucket bounds its staleness.
+    @cached_response("projects", max_age=30, bucket_seconds=30)
+    async def get(self, request):
+        # Event aggregates come from the rollups (see analytics.rollups): 7-day
+        # lists sum a week of daily rows, all-time lists read running totals.
+        since = timezone.localdate() - timedelta(days=6)
+        (
+            budget,
+            top_searches,
+            top_viewed,
+            most_discussed,
+            top_searches_7d,
+            trending_projects_7d,
+            recent_searches,
+            recent_views,
+        ) = await asyncio.gather(
+            run_in_thread(get_budget_summary),
+            run_in_thread(_top_searches),
+            run_in_thread(_top_viewed),
+            run_in_thread(_most_discussed),
+            run_in_thread(_top_searches, since),
+            run_in_thread(_trending_projects, since),
+            run_in_thread(_recent_searches),
+            run_in_thread(_recent_views),
         )
 
-        recent_searches = list(
-            SearchEvent.objects.order_by("-created_at")
-            .values("query", "created_at")[:10]
+        # Project counts come from the cached budget summary's status breakdown.
+        total_projects = sum(row["projects"] for row in budget["by_status"])
+        status_counts = sorted(
+            ({"status": row["status"], "count": row["projects"]} for row in budget["by_status"]),
+            key=lambda row: -row["count"],
         )
-        recent_views = list(
-            ProjectViewEvent.objects.order_by("-created_at")
-            .values("project_id", "project__title", "created_at")[:10]
-        )
-
-        # budget totals (spent will be added in step 3; safe if missing)
-        total_budget = 0.0
-        total_spent = None
-
-        if any(f.name == "budget" for f in Project._meta.fields):
-            for p in Project.objects.all().only("budget"):
-                if p.budget:
-                    total_budget += float(p.budget)
-
-        if any(f.name == "spent_amount" for f in Project._meta.fields):
-            total_spent_val = 0.0
-            for p in Project.objects.all().only("spent_amount"):
-                if getattr(p, "spent_amount", None):
-                    total_spent_val += float(p.spent_amount)
-            total_spent = total_spent_val
 
-        return Response({
+        return json_response({
             "total_projects": total_projects,
-            "status_counts": list(status_counts),
-            "top_searches": list(top_searches),
-            "top_viewed": list(top_viewed),
-            "top_searches_7d": list(top_searches_7d),
-            "trending_projects_7d": list(trending_projects_7d),
+            "status_counts": status_counts,
+            "top_searches": top_searches,
+            "top_viewed": top_viewed,
+            "most_discussed": most_discussed,
+            "top_searches_7d": top_searches_7d,
+            "trending_projects_7d": trending_projects_7d,
             "recent_searches": recent_searches,
             "recent_views": recent_views,
-            "total_budget": total_budget,
-            "total_spent": total_spent,  # null until step 3
+            # Numeric totals kept for existing clients; `budget` carries exact
+            # decimal strings plus per-county and per-status breakdowns.
+            "total_budget": float(budget["total_budget"]),
+            "total_spent": float(budget["total_spent"]),
+            "budget": budget,
         })
@@ -0,0 +1,151 @@
+"""In-process load generators that drive the real WSGI and ASGI handlers.
+
+Both run the full middleware stack, URL resolution and request_started /
+request_finished signals, without sockets, so the numbers compare the two
+serving paths rather than network or server overhead.
+"""
+import asyncio
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+
+
+@dataclass
+class Call:
+    method: str
+    path: str
+    query: str = ""
+    body: bytes = b""
+    content_type: str = "application/json"
+
+
+def default_host() -> str:
+    return next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith((".", "*"))), "localhost")
+
+
+def summarize(latencies, errors, elapsed) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def run_wsgi(calls, threads: int) -> dict:
+    """Issue ``calls`` from ``threads`` threads through ``WSGIHandler``."""
+    handler = WSGIHandler()
+    host = default_host()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    pending = iter(calls)
+
+    def request(call):
+        environ = {
+            "REQUEST_METHOD": call.method,
+            "PATH_INFO": call.path,
+            "QUERY_STRING": call.query,
+            "HTTP_HOST": host,
+            "CONTENT_TYPE": call.content_type,
+            "CONTENT_LENGTH": str(len(call.body)),
+        }
+        setup_testing_defaults(environ)
+        environ["wsgi.input"].write(call.body)
+        environ["wsgi.input"].seek(0)
+        status = []
+        started = time.perf_counter()
+        response = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+        try:
+            b"".join(response)
+        finally:
+            # Fires request_finished, which closes or keeps connections
+            # according to the connection mode.
+            response.close()
+        return time.perf_counter() - started, int(status[0][:3]) < 400
+
+    def worker():
+        while True:
+            with lock:
+                call = next(pending, None)
+            if call is None:
+                return
+            elapsed, ok = request(call)
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += not ok
+
+    threads = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], time.perf_counter() - started)
+
+
+def run_asgi(calls, concurrency: int) -> dict:
+    """Issue ``calls`` from ``concurrency`` coroutines through ``ASGIHandler``."""
+    return asyncio.run(_run_asgi(list(calls), concurrency))
+
+
+async def _run_asgi(calls, concurrency):
+    app = ASGIHandler()
+    host = default_host().encode()
+    latencies, errors = [], 0
+    pending = iter(calls)
+
+    async def request(call):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": call.method,
+            "scheme": "http",
+            "path": call.path,
+            "raw_path": call.path.encode(),
+            "query_string": call.query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", host),
+                (b"content-type", call.content_type.encode()),
+                (b"content-length", str(len(call.body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80),
+        }
+        body_sent = False
+        status = []
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": call.body, "more_body": False}
+            # Never disconnect; Django cancels this once the response is sent.
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        return time.perf_counter() - started, status[0] < 400
+
+    async def worker():
+        nonlocal errors
+        for call in pending:
+            elapsed, ok = await request(call)
+            latencies.append(elapsed)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
@@ -0,0 +1,210 @@
+import gc
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from accounts.tokens import ClaimsRefreshToken
+from analytics.buffer import get_buffer
+from benchmarks import synthetic
+from config import instrumentation
+from config.asyncviews import shutdown_query_threads
+from projects.models import Project
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+# name: (path, query string); {project} is the most-engaged project.
+ENDPOINTS = {
+    "projects-list": ("/api/projects/", ""),
+    "projects-filtered": ("/api/projects/", "county=Nairobi&status=ONGOING&ordering=-comment_count"),
+    "projects-detail": ("/api/projects/{project}/", ""),
+    "projects-bundle": ("/api/projects/{project}/bundle/", ""),
+    "map-all": ("/api/projects/map/", ""),
+    "map-clusters": ("/api/projects/map/", "bbox=33.9,-4.7,41.9,5.0&zoom=6"),
+    "map-points": ("/api/projects/map/", "bbox=36.6,-1.45,37.1,-1.1&zoom=12"),
+    "pulse": ("/api/pulse/", ""),
+    "comments": ("/api/projects/{project}/comments/", ""),
+    "reports": ("/api/projects/{project}/reports/", ""),
+    "reports-admin": ("/api/reports/", "status=OPEN"),
+}
+# Endpoints that need an official's token.
+AUTHENTICATED = {"reports-admin"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure query count, p50/p95 latency and response size of the main read endpoints "
+        "against synthetic datasets of several sizes, in a throwaway test database. With "
+        "--check, exit with an error when an endpoint needs more queries than the stored "
+        "baseline or, if the baseline has latencies, its median latency regresses past the "
+        "tolerance."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated project counts.")
+        parser.add_argument("--comments", type=float, default=5, help="Comments per project.")
+        parser.add_argument("--reports", type=float, default=2, help="Reports per project.")
+        parser.add_argument("--events", type=float, default=20, help="Analytics events per project.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=20, help="Timed requests per endpoint.")
+        parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument("--check", action="store_true", help="Fail on regressions against the baseline.")
+        parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline.")
+        parser.add_argument(
+            "--with-latency", action="store_true",
+            help="With --save-baseline, also store latencies. Only for a baseline kept on the machine that checks it.",
+        )
+        parser.add_argument(
+            "--latency-tolerance", type=float, default=0.5,
+            help="Allowed p50 slowdown as a fraction of the baseline; negative skips latency checks.",
+        )
+        parser.add_argument(
+            "--latency-slack-ms", type=float, default=2.0,
+            help="Absolute p50 slowdown always allowed, so sub-millisecond noise doesn't fail runs.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(n) for n in options["sizes"].split(",")})
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        endpoints = [name.strip() for name in options["endpoints"].split(",") if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}.")
+        baseline_path = Path(options["baseline"])
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        if options["check"] and not baseline:
+            raise CommandError(f"No baseline at {baseline_path}; run with --save-baseline first.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+        # Also counts the queries Pulse runs on its worker threads.
+        instrumentation.install()
+        try:
+            vendor = connection.vendor
+            results = {str(size): self._run_size(size, endpoints, options) for size in sizes}
+        finally:
+            # Write buffered bundle views while the test database still exists.
+            get_buffer().flush()
+            shutdown_query_threads()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        failures = []
+        if options["check"]:
+            failures = self._compare(results, baseline.get(vendor, {}), options)
+        if options["save_baseline"]:
+            stored = baseline.setdefault(vendor, {})
+            # Latencies only compare on the machine that measured them; the
+            # shared baseline gates query counts.
+            keep = ("queries", "p50_ms", "p95_ms") if options["with_latency"] else ("queries",)
+            for size, rows in results.items():
+                stored_size = stored.setdefault(size, {})
+                for name, row in rows.items():
+                    stored_size[name] = {key: row[key] for key in keep}
+            baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"Baseline for {vendor} written to {baseline_path}.")
+        if failures:
+            raise CommandError("Regressions against baseline:\n  " + "\n  ".join(failures))
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def _run_size(self, size, endpoints, options):
+        call_command("flush", interactive=False, verbosity=0)
+        started = time.perf_counter()
+        counts = synthetic.generate(
+            projects=size,
+            comments=int(size * options["comments"]),
+            reports=int(size * options["reports"]),
+            events=int(size * options["events"]),
+            seed=options["seed"],
+        )
+        self.stdout.write(
+            f"\n{size} projects ({', '.join(f'{n} {name}' for name, n in counts.items())}) "
+            f"generated in {time.perf_counter() - started:.1f}s"
+        )
+        project = Project.objects.order_by("-comment_count", "id").values_list("id", flat=True).first()
+        official = get_user_model().objects.filter(role=get_user_model().Role.OFFICIAL).first()
+        token = str(ClaimsRefreshToken.for_user(official).access_token)
+
+        self.stdout.write(f"{'endpoint':<18} {'queries':>8} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>10}")
+        rows = {}
+        for name in endpoints:
+            path, query = ENDPOINTS[name]
+            headers = {"Authorization": f"Bearer {token}"} if name in AUTHENTICATED else {}
+            rows[name] = self._measure(Client(headers=headers), path.format(project=project), query, options["repeat"])
+            get_buffer().flush()
+            row = rows[name]
+            self.stdout.write(
+                f"{name:<18} {row['queries']:>8} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['bytes']:>10}"
+            )
+        return rows
+
+    def _measure(self, client, path, query, repeat):
+        latencies, queries, size = [], [], 0
+        # Like timeit, keep collector pauses out of the timings.
+        gc.collect()
+        gc.disable()
+        try:
+            # Two untimed warm-up requests; a unique parameter keeps every
+            # request a response-cache miss.
+            for i in range(repeat + 2):
+                params = f"{query}&_bench={i}" if query else f"_bench={i}"
+                started = time.perf_counter()
+                with instrumentation.capture() as stats:
+                    response = client.get(f"{path}?{params}")
+                    body = b"".join(response) if response.streaming else response.content
+                elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise CommandError(f"GET {path}?{params} returned {response.status_code}: {body[:200]!r}")
+                if i >= 2:
+                    latencies.append(elapsed)
+                    queries.append(stats.queries)
+                    size = len(body)
+        finally:
+            gc.enable()
+        latencies.sort()
+        return {
+            # Median, so an occasional analytics buffer flush doesn't count.
+            "queries": int(statistics.median(queries)),
+            "p50_ms": round(statistics.median(latencies) * 1000, 3),
+            "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 3),
+            "bytes": size,
+        }
+
+    def _compare(self, results, baseline, options):
+        tolerance, slack = options["latency_tolerance"], options["latency_slack_ms"]
+        failures = []
+        for size, rows in results.items():
+            for name, row in rows.items():
+                expected = baseline.get(size, {}).get(name)
+                if expected is None:
+                    self.stdout.write(self.style.WARNING(f"No baseline for {name} at {size} projects."))
+                    continue
+                if row["queries"] > expected["queries"]:
+                    failures.append(f"{name} @ {size}: {row['queries']} queries (baseline {expected['queries']})")
+                if tolerance < 0 or "p50_ms" not in expected:
+                    continue
+                # Gated on the median: p95 of a few dozen requests mostly
+                # measures the noise of a shared CI runner.
+                limit = expected["p50_ms"] * (1 + tolerance) + slack
+                if row["p50_ms"] > limit:
+                    failures.append(
+                        f"{name} @ {size}: p50 {row['p50_ms']:.2f} ms (baseline {expected['p50_ms']:.2f} ms, "
+                        f"limit {limit:.2f} ms)"
+                    )
+        return failures
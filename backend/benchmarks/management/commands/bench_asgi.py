@@ -0,0 +1,64 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.loadgen import Call, run_asgi, run_wsgi
+from projects.models import Project
+
+ENDPOINTS = ("pulse", "search", "project-view", "batch")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the async endpoints (beacons, Pulse) served through the ASGI "
+        "handler against the WSGI handler. Beacons write analytics events, so run it against "
+        "a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints.")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and server.")
+        parser.add_argument("--concurrency", type=int, default=16, help="WSGI threads / ASGI coroutines.")
+        parser.add_argument(
+            "--cold", action="store_true", help="Bust the Pulse response cache on every request."
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [name.strip() for name in options["endpoints"].split(",") if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoint(s): {', '.join(sorted(unknown))}.")
+        project_ids = list(Project.objects.values_list("id", flat=True)[:1000])
+        if not project_ids:
+            raise CommandError("Needs at least one project in the database.")
+
+        rng = random.Random(0)
+        total, concurrency = options["requests"], options["concurrency"]
+        self.stdout.write(
+            f"{'endpoint':<14} {'wsgi req/s':>11} {'p95 ms':>8} {'asgi req/s':>11} {'p95 ms':>8} {'speedup':>8} {'errors':>7}"
+        )
+        for name in endpoints:
+            calls = [self._call(name, i, rng, project_ids, options["cold"]) for i in range(total)]
+            # Warm both paths (imports, ID cache, connections) before timing.
+            run_wsgi(calls[:concurrency], concurrency)
+            run_asgi(calls[:concurrency], concurrency)
+            wsgi = run_wsgi(calls, concurrency)
+            asgi = run_asgi(calls, concurrency)
+            speedup = asgi["rps"] / wsgi["rps"] if wsgi["rps"] else 0.0
+            self.stdout.write(
+                f"{name:<14} {wsgi['rps']:>11.1f} {wsgi['p95_ms']:>8.2f} {asgi['rps']:>11.1f} "
+                f"{asgi['p95_ms']:>8.2f} {speedup:>7.2f}x {wsgi['errors'] + asgi['errors']:>7}"
+            )
+
+    def _call(self, name, i, rng, project_ids, cold):
+        if name == "pulse":
+            return Call("GET", "/api/pulse/", f"bench={i}" if cold else "")
+        if name == "search":
+            return Call("POST", "/api/analytics/search/", body=json.dumps({"query": f"bench {i % 50}"}).encode())
+        if name == "project-view":
+            body = {"project_id": rng.choice(project_ids)}
+            return Call("POST", "/api/analytics/project-view/", body=json.dumps(body).encode())
+        events = [{"type": "project_view", "project_id": rng.choice(project_ids)} for _ in range(10)]
+        events.append({"type": "search", "query": f"bench {i % 50}"})
+        return Call("POST", "/api/analytics/batch/", body=json.dumps({"events": events}).encode())
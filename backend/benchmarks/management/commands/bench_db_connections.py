@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.loadgen import Call, run_wsgi
+from config.db import MODES
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request throughput under each DB_CONN_MODE. Every mode runs in its own "
+        "process, driving the real WSGI handler from several threads so connection "
+        "open/close behaves as in production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to compare.")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per mode.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--path", default="/api/health/?check=db", help="Endpoint to request.")
+        parser.add_argument("--worker", action="store_true", help="Internal: run one mode and print JSON.")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            self.stdout.write(json.dumps(self._run(options["path"], options["requests"], options["threads"])))
+            return
+
+        modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown mode(s): {', '.join(sorted(unknown))}.")
+
+        self.stdout.write(f"{'mode':<12} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for mode in modes:
+            result = subprocess.run(
+                [
+                    sys.executable, sys.argv[0], "bench_db_connections", "--worker",
+                    "--path", options["path"],
+                    "--requests", str(options["requests"]),
+                    "--threads", str(options["threads"]),
+                ],
+                env={**os.environ, "DB_CONN_MODE": mode},
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode:
+                raise CommandError(f"{mode} worker failed:\n{result.stderr}")
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            self.stdout.write(
+                f"{mode:<12} {stats['rps']:>10.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['errors']:>7}"
+            )
+
+    def _run(self, path, total, thread_count):
+        path, _, query = path.partition("?")
+        run_wsgi([Call("GET", path, query)], 1)  # Warm up imports and the first connection/pool.
+        return run_wsgi([Call("GET", path, query)] * total, thread_count)
@@ -0,0 +1,116 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from config.fastpath import RowSerializer
+from config.renderers import FastJSONRenderer
+from feedback.models import Comment
+from feedback.serializers import CommentSerializer
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from reports.models import Report
+from reports.serializers import ReportSerializer
+
+DATASETS = {
+    "projects": (Project, ProjectSerializer),
+    "comments": (Comment, CommentSerializer),
+    "reports": (Report, ReportSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ModelSerializer + JSONRenderer with the RowSerializer + FastJSONRenderer "
+        "list path on synthetic rows. Data is created in a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated row counts.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median is reported).")
+        parser.add_argument("--dataset", choices=[*DATASETS, "all"], default="all")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(n) for n in options["sizes"].split(",")})
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        datasets = list(DATASETS) if options["dataset"] == "all" else [options["dataset"]]
+
+        with transaction.atomic():
+            querysets = self._generate(max(sizes))
+            self.stdout.write(f"{'dataset':<10} {'rows':>8} {'drf ms':>10} {'fast ms':>10} {'speedup':>8}  identical")
+            for name in datasets:
+                for size in sizes:
+                    self._measure(name, querysets[name], size, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _generate(self, count):
+        self.stdout.write(f"Generating {count} rows per dataset...")
+        user = get_user_model().objects.create_user(username=f"bench-{time.time_ns()}", password=None)
+        start_id = (Project.objects.order_by("-id").values_list("id", flat=True).first() or 0)
+        Project.objects.bulk_create(
+            (
+                Project(
+                    title=f"Benchmark project {i}",
+                    description="Synthetic row for serializer benchmarks.",
+                    county="Nairobi",
+                    status=Project.Status.ONGOING,
+                    budget=Decimal("1000000.00") + i,
+                    spent_amount=Decimal("2500.50"),
+                    progress=i % 101,
+                    latitude=Decimal("-1.286389"),
+                    longitude=Decimal("36.817223"),
+                )
+                for i in range(count)
+            ),
+            batch_size=2000,
+        )
+        projects = Project.objects.filter(id__gt=start_id).order_by("id")
+        project_ids = list(projects.values_list("id", flat=True)[:100])
+        Comment.objects.bulk_create(
+            (Comment(project_id=project_ids[i % len(project_ids)], user=user, body=f"Comment {i}") for i in range(count)),
+            batch_size=2000,
+        )
+        Report.objects.bulk_create(
+            (
+                Report(project_id=project_ids[i % len(project_ids)], user=user, description=f"Report {i}")
+                for i in range(count)
+            ),
+            batch_size=2000,
+        )
+        return {
+            "projects": projects,
+            "comments": Comment.objects.filter(user=user).select_related("user", "project").order_by("id"),
+            "reports": Report.objects.filter(user=user).select_related("user", "project").order_by("id"),
+        }
+
+    def _measure(self, name, queryset, size, repeat):
+        _, serializer_class = DATASETS[name]
+        rows = RowSerializer(serializer_class)
+
+        def drf():
+            return JSONRenderer().render(serializer_class(queryset[:size], many=True).data)
+
+        def fast():
+            return FastJSONRenderer().render(rows.serialize(rows.values(queryset)[:size]))
+
+        drf_ms, drf_out = self._time(drf, repeat)
+        fast_ms, fast_out = self._time(fast, repeat)
+        self.stdout.write(
+            f"{name:<10} {size:>8} {drf_ms:>10.1f} {fast_ms:>10.1f} {drf_ms / fast_ms:>7.1f}x  "
+            f"{'yes' if drf_out == fast_out else 'NO'}"
+        )
+
+    @staticmethod
+    def _time(fn, repeat):
+        timings, out = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            out = fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), out
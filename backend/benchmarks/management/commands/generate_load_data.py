@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load a production-scale synthetic dataset: projects across all 47 counties, "
+        "users of every role, comments, reports and analytics events. The same --seed "
+        "always produces the same data. Adds to whatever is already in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=200_000)
+        parser.add_argument("--comments", type=int, default=400_000)
+        parser.add_argument("--reports", type=int, default=100_000)
+        parser.add_argument("--events", type=int, default=300_000, help="Project views and searches.")
+        parser.add_argument("--users", type=int, help="Default: one per 20 comments and reports.")
+        parser.add_argument("--days", type=int, default=90, help="Spread events over this many days.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=synthetic.BATCH_SIZE, help="Rows per INSERT transaction.")
+
+    def handle(self, *args, **options):
+        counts = [options[name] for name in ("projects", "comments", "reports", "events")]
+        if min(counts) < 0 or (options["users"] or 0) < 0:
+            raise CommandError("Row counts must not be negative.")
+        if options["batch_size"] < 1 or options["days"] < 1:
+            raise CommandError("--batch-size and --days must be positive.")
+        if not options["projects"] and (options["comments"] or options["reports"]):
+            raise CommandError("Comments and reports need --projects.")
+
+        started = time.perf_counter()
+
+        def log(message):
+            self.stdout.write(f"[{time.perf_counter() - started:7.1f}s] {message}")
+
+        created = synthetic.generate(
+            projects=options["projects"],
+            comments=options["comments"],
+            reports=options["reports"],
+            events=options["events"],
+            users=options["users"],
+            seed=options["seed"],
+            days=options["days"],
+            batch_size=options["batch_size"],
+            log=log,
+        )
+        total = sum(created.values())
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s).")
+        )
@@ -0,0 +1,347 @@
+"""Deterministic synthetic data shaped like production.
+
+Projects are spread over the 47 counties in proportion to population (2019
+census) and scattered around each county's centre. Comments, reports and
+project views favour a small set of popular projects, and events lean towards
+recent days and daytime hours. The same ``seed`` always produces the same rows.
+
+Rows are inserted with ``bulk_create``, one transaction per batch, so model
+signals don't run; denormalized counters are planned up front and written with
+the projects, and rollups and caches are kept consistent here instead.
+"""
+import random
+from collections import Counter
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from analytics.models import ProjectViewEvent, SearchEvent
+from analytics.project_ids import project_ids
+from analytics.rollups import record_project_views, record_searches
+from config.http_cache import bump_version
+from feedback.models import Comment
+from projects import counters
+from projects.budget import invalidate_budget_summary
+from projects.models import Project
+from reports.models import OPEN_STATUSES, Report
+
+BATCH_SIZE = 2000
+
+COUNTIES = (
+    # name, latitude, longitude, spread (degrees), population (thousands)
+    ("Mombasa", -4.04, 39.66, 0.08, 1208),
+    ("Kwale", -4.18, 39.46, 0.35, 867),
+    ("Kilifi", -3.51, 39.91, 0.45, 1454),
+    ("Tana River", -1.65, 39.65, 0.9, 316),
+    ("Lamu", -2.27, 40.90, 0.35, 144),
+    ("Taita Taveta", -3.40, 38.37, 0.5, 341),
+    ("Garissa", -0.45, 39.65, 0.9, 841),
+    ("Wajir", 1.75, 40.06, 1.0, 781),
+    ("Mandera", 3.94, 41.86, 0.6, 867),
+    ("Marsabit", 2.33, 37.99, 1.1, 460),
+    ("Isiolo", 0.35, 37.58, 0.7, 268),
+    ("Meru", 0.05, 37.65, 0.35, 1546),
+    ("Tharaka-Nithi", -0.30, 37.88, 0.2, 393),
+    ("Embu", -0.54, 37.45, 0.2, 609),
+    ("Kitui", -1.37, 38.01, 0.7, 1136),
+    ("Machakos", -1.52, 37.26, 0.35, 1422),
+    ("Makueni", -1.80, 37.62, 0.4, 988),
+    ("Nyandarua", -0.18, 36.52, 0.25, 638),
+    ("Nyeri", -0.42, 36.95, 0.2, 759),
+    ("Kirinyaga", -0.50, 37.28, 0.12, 610),
+    ("Murang'a", -0.72, 37.15, 0.2, 1057),
+    ("Kiambu", -1.17, 36.83, 0.2, 2418),
+    ("Turkana", 3.12, 35.60, 1.2, 927),
+    ("West Pokot", 1.62, 35.39, 0.4, 621),
+    ("Samburu", 1.10, 36.70, 0.6, 310),
+    ("Trans Nzoia", 1.02, 35.00, 0.15, 990),
+    ("Uasin Gishu", 0.51, 35.27, 0.2, 1163),
+    ("Elgeyo-Marakwet", 0.80, 35.51, 0.2, 454),
+    ("Nandi", 0.18, 35.13, 0.2, 886),
+    ("Baringo", 0.47, 35.97, 0.4, 667),
+    ("Laikipia", 0.36, 36.78, 0.4, 519),
+    ("Nakuru", -0.30, 36.07, 0.35, 2162),
+    ("Narok", -1.08, 35.87, 0.6, 1158),
+    ("Kajiado", -1.85, 36.78, 0.5, 1118),
+    ("Kericho", -0.37, 35.28, 0.15, 902),
+    ("Bomet", -0.78, 35.34, 0.15, 876),
+    ("Kakamega", 0.28, 34.75, 0.2, 1868),
+    ("Vihiga", 0.08, 34.72, 0.06, 590),
+    ("Bungoma", 0.56, 34.56, 0.2, 1671),
+    ("Busia", 0.46, 34.11, 0.15, 894),
+    ("Siaya", -0.06, 34.29, 0.2, 993),
+    ("Kisumu", -0.09, 34.77, 0.15, 1156),
+    ("Homa Bay", -0.53, 34.46, 0.2, 1132),
+    ("Migori", -1.06, 34.47, 0.2, 1116),
+    ("Kisii", -0.68, 34.77, 0.1, 1267),
+    ("Nyamira", -0.57, 34.94, 0.08, 606),
+    ("Nairobi", -1.29, 36.82, 0.08, 4397),
+)
+_COUNTY_WEIGHTS = list(accumulate(c[4] for c in COUNTIES))
+
+SECTORS = (
+    ("Road", "Resurfacing, drainage and signage along {place} access roads."),
+    ("Water Pipeline", "New pipes and storage tanks to improve supply in {place}."),
+    ("Health Centre", "Construction and equipping of a level 3 health facility in {place}."),
+    ("Classroom Block", "Additional classrooms and sanitation for {place} primary school."),
+    ("Market", "Covered stalls, lighting and waste collection point for {place} market."),
+    ("Borehole", "Solar-powered borehole and water kiosk serving {place}."),
+    ("Bridge", "Replacement footbridge and approach roads in {place}."),
+    ("Street Lighting", "Floodlights and solar street lights across {place}."),
+    ("Irrigation Scheme", "Canals and pumps for smallholder farms around {place}."),
+    ("Sewerage", "Trunk sewer extension and treatment upgrades in {place}."),
+)
+# Status, share of projects and progress range.
+STATUSES = (
+    (Project.Status.PLANNED, 20, (0, 0)),
+    (Project.Status.ONGOING, 45, (5, 95)),
+    (Project.Status.COMPLETED, 25, (100, 100)),
+    (Project.Status.STALLED, 10, (10, 70)),
+)
+_STATUS_WEIGHTS = list(accumulate(s[1] for s in STATUSES))
+REPORT_CATEGORIES = (
+    (Report.Category.DELAY, 35),
+    (Report.Category.QUALITY, 25),
+    (Report.Category.BUDGET, 18),
+    (Report.Category.CORRUPTION, 12),
+    (Report.Category.OTHER, 10),
+)
+REPORT_STATUSES = (
+    (Report.Status.OPEN, 45),
+    (Report.Status.IN_REVIEW, 20),
+    (Report.Status.RESOLVED, 25),
+    (Report.Status.DISMISSED, 10),
+)
+COMMENTS = (
+    "Work has started on site, good to see progress.",
+    "Contractor has not been seen for weeks.",
+    "When is this expected to be completed?",
+    "The quality of materials looks poor.",
+    "This has really helped our community.",
+    "Please publish the full budget breakdown.",
+)
+# Share of analytics events per local hour (EAT), quiet overnight.
+HOURLY = (1, 1, 1, 1, 1, 2, 4, 7, 9, 9, 8, 8, 8, 8, 8, 8, 8, 9, 10, 10, 8, 6, 3, 2)
+_HOURLY_WEIGHTS = list(accumulate(HOURLY))
+# Skew of engagement towards popular projects (Zipf exponent).
+POPULARITY = 0.8
+SEARCH_SHARE = 0.25
+
+
+def _weighted(rng, choices, cum_weights, k):
+    return [c[0] for c in rng.choices(choices, cum_weights=cum_weights, k=k)]
+
+
+def create_users(rng, count: int, prefix: str = "synthetic", batch_size: int = BATCH_SIZE) -> dict:
+    """Create ``count`` users of every role (admins and officials ~1% each); return ids by role."""
+    User = get_user_model()
+    sizes = {
+        User.Role.ADMIN: max(1, count // 100),
+        User.Role.OFFICIAL: max(1, count // 100),
+    }
+    sizes[User.Role.CITIZEN] = max(1, count - sum(sizes.values()))
+    # One unusable hash for everyone: hashing a password per row dominates otherwise.
+    password = make_password(None)
+    start = User.objects.filter(username__startswith=f"{prefix}-").count()
+    ids = {}
+    for role, n in sizes.items():
+        users = [
+            User(
+                username=f"{prefix}-{role.lower()}-{start + i}",
+                email=f"{role.lower()}{start + i}@example.com",
+                password=password,
+                role=role,
+                is_staff=role == User.Role.ADMIN,
+            )
+            for i in range(n)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+        ids[role] = [user.pk for user in users]
+    return ids
+
+
+def _project(rng, i, county, today):
+    name, lat, lng, spread, _ = county
+    sector, blurb = rng.choice(SECTORS)
+    status, _, (low, high) = rng.choices(STATUSES, cum_weights=_STATUS_WEIGHTS)[0]
+    # Log-normal budgets: median ~KES 40M, a long tail into the billions.
+    budget = Decimal(min(rng.lognormvariate(17.5, 1.3), 9.9e11)).quantize(Decimal("1000"))
+    progress = rng.randint(low, high)
+    start = today - timedelta(days=rng.randint(-180, 4 * 365))
+    if status == Project.Status.PLANNED:
+        start = today + timedelta(days=rng.randint(14, 365))
+    spent = budget * Decimal(min(progress * rng.uniform(0.8, 1.3), 100) / 100)
+    return Project(
+        title=f"{name} {sector} Project #{i}",
+        description=blurb.format(place=name),
+        county=name,
+        status=status,
+        budget=budget,
+        spent_amount=spent.quantize(Decimal("0.01")),
+        progress=progress,
+        latitude=Decimal(lat + rng.gauss(0, spread / 2)).quantize(Decimal("0.000001")),
+        longitude=Decimal(lng + rng.gauss(0, spread / 2)).quantize(Decimal("0.000001")),
+        start_date=start,
+        end_date=start + timedelta(days=rng.randint(180, 4 * 365)),
+    )
+
+
+def create_projects(rng, count, counters, batch_size=BATCH_SIZE) -> list:
+    """Create ``count`` projects; return their ids, most popular first.
+
+    ``counters`` maps counter fields to a ``Counter`` of planned values by
+    project index, so the denormalized counters are written with the rows.
+    """
+    today = timezone.localdate()
+    counties = rng.choices(COUNTIES, cum_weights=_COUNTY_WEIGHTS, k=count)
+    ids = []
+    for start in range(0, count, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, count)):
+            project = _project(rng, i, counties[i], today)
+            project.geohash = project.compute_geohash()
+            for field, values in counters.items():
+                setattr(project, field, values[i])
+            batch.append(project)
+        with transaction.atomic():
+            Project.objects.bulk_create(batch)
+        ids.extend(project.pk for project in batch)
+    return ids
+
+
+def _popularity(count):
+    """Cumulative Zipf-like weights for ``count`` project indexes."""
+    return list(accumulate(1 / (rank + 1) ** POPULARITY for rank in range(count)))
+
+
+def days_ago(rng, count, days) -> list:
+    """How many days before today each of ``count`` events happened; recent days are busier."""
+    return [int(days * rng.random() ** 2) for _ in range(count)]
+
+
+def timestamps(rng, offsets, now=None) -> list:
+    """Aware datetimes ``offsets`` days before ``now``'s date, at hours weighted by ``HOURLY``."""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    tz = timezone.get_current_timezone()
+    hours = _weighted(rng, [(h,) for h in range(24)], _HOURLY_WEIGHTS, len(offsets))
+    return [
+        min(datetime.combine(today - timedelta(days=ago), time(hour), tz) + timedelta(seconds=rng.randrange(3600)), now)
+        for ago, hour in zip(offsets, hours)
+    ]
+
+
+def generate(
+    projects: int,
+    comments: int = 0,
+    reports: int = 0,
+    events: int = 0,
+    users: int | None = None,
+    seed: int = 0,
+    days: int = 90,
+    batch_size: int = BATCH_SIZE,
+    log=None,
+) -> dict:
+    """Insert a synthetic dataset and return row counts per model.
+
+    ``events`` project views and searches are spread over the last ``days``
+    days and added to the daily rollups. ``log`` is called with a short
+    message after each stage.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    if users is None:
+        users = max(10, (comments + reports) // 20)
+    user_ids = create_users(rng, users, prefix=f"synthetic{seed}", batch_size=batch_size)
+    all_users = [uid for ids in user_ids.values() for uid in ids]
+    log(f"users: {len(all_users)}")
+
+    # Everything that feeds a counter is drawn before the projects exist.
+    popularity = _popularity(projects)
+    indexes = range(projects)
+    views = events - round(events * SEARCH_SHARE) if projects else 0
+    comment_targets = rng.choices(indexes, cum_weights=popularity, k=comments) if projects else []
+    report_targets = rng.choices(indexes, cum_weights=popularity, k=reports) if projects else []
+    report_statuses = _weighted(rng, REPORT_STATUSES, list(accumulate(w for _, w in REPORT_STATUSES)), len(report_targets))
+    view_targets = rng.choices(indexes, cum_weights=popularity, k=views) if projects else []
+    # Only the day of each view is kept up front; times are drawn per batch.
+    view_days = days_ago(rng, views, days)
+    window = (timezone.localdate() - counters.window_start()).days
+    ids = create_projects(
+        rng,
+        projects,
+        {
+            "comment_count": Counter(comment_targets),
+            "report_count": Counter(report_targets),
+            "open_report_count": Counter(
+                index for index, status in zip(report_targets, report_statuses) if status in OPEN_STATUSES
+            ),
+            "view_count": Counter(view_targets),
+            "views_7d": Counter(index for index, ago in zip(view_targets, view_days) if ago <= window),
+        },
+        batch_size,
+    )
+    log(f"projects: {len(ids)}")
+
+    for start in range(0, len(comment_targets), batch_size):
+        batch = [
+            Comment(project_id=ids[index], user_id=rng.choice(all_users), body=rng.choice(COMMENTS))
+            for index in comment_targets[start:start + batch_size]
+        ]
+        with transaction.atomic():
+            Comment.objects.bulk_create(batch)
+    log(f"comments: {len(comment_targets)}")
+
+    categories = _weighted(rng, REPORT_CATEGORIES, list(accumulate(w for _, w in REPORT_CATEGORIES)), len(report_targets))
+    rows = list(zip(report_targets, categories, report_statuses))
+    for start in range(0, len(rows), batch_size):
+        batch = [
+            Report(
+                project_id=ids[index],
+                user_id=rng.choice(all_users),
+                category=category,
+                status=status,
+                description=f"{category.label} concern raised by residents.",
+            )
+            for index, category, status in rows[start:start + batch_size]
+        ]
+        with transaction.atomic():
+            Report.objects.bulk_create(batch)
+    log(f"reports: {len(rows)}")
+
+    terms = [name.lower() for name, *_ in COUNTIES] + [sector.lower() for sector, _ in SECTORS]
+    searches = events - views
+    now = timezone.now()
+    for start in range(0, max(searches, views), batch_size):
+        search_batch = [
+            (" ".join(rng.sample(terms, rng.randint(1, 2))), ts)
+            for ts in timestamps(rng, days_ago(rng, min(batch_size, max(searches - start, 0)), days), now)
+        ]
+        view_batch = list(zip(
+            (ids[index] for index in view_targets[start:start + batch_size]),
+            timestamps(rng, view_days[start:start + batch_size], now),
+        ))
+        with transaction.atomic():
+            SearchEvent.objects.bulk_create([SearchEvent(query=q, created_at=ts) for q, ts in search_batch])
+            ProjectViewEvent.objects.bulk_create([ProjectViewEvent(project_id=pid, created_at=ts) for pid, ts in view_batch])
+            record_searches(search_batch)
+            record_project_views(view_batch)
+    log(f"events: {searches + views}")
+
+    invalidate_budget_summary()
+    for table in ("projects", "comments", "reports"):
+        bump_version(table)
+    project_ids.clear()
+    return {
+        "users": len(all_users),
+        "projects": len(ids),
+        "comments": len(comment_targets),
+        "reports": len(rows),
+        "events": searches + views,
+    }
@@ -0,0 +1,175 @@
+"""Per-project activity fan-out for the server-sent event stream.
+
+Model signals publish ``(event, data)`` pairs for a project once the write
+commits; ``stream()`` feeds them to ``GET /api/projects/<id>/activity/``
+subscribers on the ASGI app. Two hubs are available (``ACTIVITY_BACKEND``):
+
+* ``memory``: fan-out to asyncio queues in this process. Only subscribers in
+  the process that handled the write see the event, so use it with a single
+  ASGI worker.
+* ``redis`` (default when ``REDIS_URL`` is set; requires the ``redis``
+  package): events are published to ``activity:<project_id>`` channels and
+  each process keeps one pattern subscription that fans out locally.
+
+Events are not replayed: subscribers whose queue fills up (slow clients) lose
+their backlog and get a ``resync`` event telling them to refetch, and clients
+refetch whenever their stream (re)connects, since anything published while
+they were disconnected is gone.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import redis
+    from redis import asyncio as aioredis
+except ImportError:  # Optional; only needed for ACTIVITY_BACKEND=redis.
+    redis = aioredis = None
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "activity:"
+RESYNC = ("resync", "{}")
+
+
+class InProcessHub:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, project_id: int, event: str, data: str) -> None:
+        self.dispatch(project_id, (event, data))
+
+    def dispatch(self, project_id: int, message) -> None:
+        # Called from request threads and event loops alike; each queue is
+        # only touched from its own loop.
+        with self._lock:
+            targets = list(self._subscribers.get(project_id, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                pass  # Loop already closed; its subscriber is going away.
+
+    @staticmethod
+    def _offer(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers[project_id].add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(project_id)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[project_id]
+
+
+class RedisHub(InProcessHub):
+    def __init__(self, url: str, queue_size: int = 100):
+        if redis is None:
+            raise RuntimeError("ACTIVITY_BACKEND=redis requires the `redis` package.")
+        super().__init__(queue_size)
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._listeners = {}
+
+    def publish(self, project_id: int, event: str, data: str) -> None:
+        self._client.publish(f"{CHANNEL_PREFIX}{project_id}", f"{event} {data}")
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int):
+        loop = asyncio.get_running_loop()
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self._listen())
+        async with super().subscribe(project_id) as queue:
+            yield queue
+
+    async def _listen(self):
+        while True:
+            try:
+                client = aioredis.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        project_id = int(message["channel"].decode().rpartition(":")[2])
+                        event, _, data = message["data"].decode().partition(" ")
+                        self.dispatch(project_id, (event, data))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("activity subscription lost; reconnecting")
+                await asyncio.sleep(1)
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub() -> InProcessHub:
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                queue_size = getattr(settings, "ACTIVITY_QUEUE_SIZE", 100)
+                if getattr(settings, "ACTIVITY_BACKEND", "memory") == "redis":
+                    _hub = RedisHub(settings.REDIS_URL, queue_size)
+                else:
+                    _hub = InProcessHub(queue_size)
+    return _hub
+
+
+def publish_on_commit(project_id: int, event: str, payload: dict) -> None:
+    """Broadcast ``payload`` to the project's subscribers after the current transaction commits."""
+    data = json.dumps(payload, cls=JSONEncoder, separators=(",", ":"))
+
+    def send():
+        try:
+            get_hub().publish(project_id, event, data)
+        except Exception:
+            # A broken broker must not fail the write that triggered it.
+            logger.exception("activity publish failed for project %s", project_id)
+
+    transaction.on_commit(send)
+
+
+async def stream(project_id: int):
+    """Server-sent event frames for one subscriber, ending after ``ACTIVITY_STREAM_SECONDS``.
+
+    ``EventSource`` reconnects on its own, so bounding each connection keeps
+    long-lived streams from pinning workers forever.
+    """
+    loop = asyncio.get_running_loop()
+    heartbeat = getattr(settings, "ACTIVITY_HEARTBEAT_SECONDS", 15)
+    deadline = loop.time() + getattr(settings, "ACTIVITY_STREAM_SECONDS", 300)
+    yield "retry: 3000\n\n"
+    async with get_hub().subscribe(project_id) as queue:
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=min(heartbeat, remaining))
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event}\ndata: {data}\n\n"
@@ -0,0 +1,163 @@
+"""Base class and helpers for async-native endpoints on the ASGI app.
+
+DRF views are sync-only, so under ASGI every request to them costs a worker
+thread. Endpoints that are mostly I/O (analytics beacons, Pulse) are plain
+Django async views instead. ``AsyncAPIView`` keeps the API's conventions:
+JSON or form bodies, DRF ``ValidationError``/``ParseError`` details as error
+responses, and the same JSON renderer. No authentication classes run by default
+(the beacons and Pulse are anonymous, and skipping JWT decoding is part of
+their speed); throttling follows ``DEFAULT_THROTTLE_CLASSES`` like any DRF
+view. Set ``authentication_classes``/``throttle_classes`` on a view to change
+either; both run on the request's sync thread before the handler.
+"""
+import asyncio
+import contextvars
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, ParseError, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+_renderer = JSONRenderer()
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    return HttpResponse(_renderer.render(data), status=status, content_type="application/json")
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return getattr(settings, "ASYNC_QUERY_THREADS", 8)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix="async-query")
+    return _executor
+
+
+def shutdown_query_threads() -> None:
+    """Close the query threads' connections and stop them.
+
+    Needed before dropping a database they used (e.g. a test database); the
+    next ``run_in_thread`` starts a new pool.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+    # Connections are per thread; each task waits for the others, so every
+    # worker runs exactly one.
+    barrier = threading.Barrier(_pool_size())
+
+    def close():
+        barrier.wait()
+        connections.close_all()
+
+    for _ in range(_pool_size()):
+        executor.submit(close)
+    executor.shutdown(wait=True)
+
+
+async def run_in_thread(func, *args):
+    """Run blocking ``func`` on a shared query thread and its connection.
+
+    Unlike the async ORM (which serializes a request's queries on one thread),
+    awaiting several of these with ``asyncio.gather`` runs them concurrently.
+    The pool is process-wide and bounded, so so are the connections it holds,
+    whether the view runs under ASGI or in a per-request loop under WSGI.
+    """
+
+    def call():
+        try:
+            return func(*args)
+        finally:
+            # Pool threads never see request_finished; apply CONN_MAX_AGE here.
+            close_old_connections()
+
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), context.run, call)
+
+
+async def iterate_in_thread(iterable):
+    """Async iterator over a blocking ``iterable``, advanced one item at a time.
+
+    Under ASGI, ``StreamingHttpResponse`` collects a sync iterator into a list
+    before sending anything; this keeps large streams in constant memory. Every
+    step runs on the request's sync thread, which owns the iterable's database
+    connection and cursor.
+    """
+    iterator = iter(iterable)
+    step = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while (item := await step(iterator, done)) is not done:
+            yield item
+    finally:
+        # Close a generator (and its cursor) on the same thread, also when the
+        # client disconnects mid-stream.
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAPIView(View):
+    authentication_classes = ()
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            if self.authentication_classes or self.throttle_classes:
+                # Authenticators and throttle caches block; run them like a
+                # sync view would.
+                await sync_to_async(self.initial)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+            response = json_response(detail, status=exc.status_code)
+            if getattr(exc, "wait", None):
+                response["Retry-After"] = "%d" % exc.wait
+            if exc.status_code == 401 and self.authentication_classes:
+                response["WWW-Authenticate"] = self.authentication_classes[0]().authenticate_header(request)
+            return response
+
+    def initial(self, request):
+        """DRF authentication and throttling; sets ``request.user``/``request.auth``."""
+        drf_request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        # Invalid credentials raise here, as in APIView.
+        drf_request.user
+        waits = [
+            throttle.wait()
+            for throttle in (cls() for cls in self.throttle_classes)
+            if not throttle.allow_request(drf_request, self)
+        ]
+        if waits:
+            raise Throttled(max((wait for wait in waits if wait is not None), default=None))
+
+    def get_data(self, request):
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError as exc:
+                raise ParseError(f"JSON parse error - {exc}")
+            if not isinstance(data, dict):
+                raise ParseError("Expected a JSON object.")
+            return data
+        return request.POST
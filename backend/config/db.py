@@ -0,0 +1,74 @@
+"""Database connection strategies, selected with ``DB_CONN_MODE``.
+
+* ``direct`` (default): a new connection per request (``CONN_MAX_AGE=0``).
+* ``persistent``: connections are reused for ``DB_CONN_MAX_AGE`` seconds and
+  checked with ``CONN_HEALTH_CHECKS`` before reuse.
+* ``pool``: Django's native psycopg pool (Postgres only; needs psycopg-pool).
+* ``pgbouncer``: persistent connections that are safe behind a
+  transaction-mode pooler such as PgBouncer or the Supabase pooler, i.e. no
+  server-side cursors and no prepared statements. Opt in only when running
+  behind such a pooler: without server-side cursors ``.iterator()`` (used by
+  the exports) loads whole result sets into memory.
+
+Pool and pgbouncer options only apply to Postgres; on SQLite every mode falls
+back to plain (``direct``/``persistent``) connection settings.
+"""
+import os
+
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+MODES = ("direct", "persistent", "pool", "pgbouncer")
+DEFAULT_MODE = "direct"
+
+
+def _int_env(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} must be an integer.")
+
+
+def database_config(default_url: str, mode: str | None = None, env: str = "DATABASE_URL") -> dict:
+    """Build a ``DATABASES`` entry from the ``env`` URL for the configured connection mode."""
+    mode = (mode or os.getenv("DB_CONN_MODE") or DEFAULT_MODE).lower()
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"DB_CONN_MODE must be one of: {', '.join(MODES)}.")
+
+    config = dj_database_url.config(env=env, default=default_url, conn_max_age=0)
+    postgres = "postgresql" in config["ENGINE"]
+    options = config.setdefault("OPTIONS", {})
+
+    if mode in ("persistent", "pgbouncer"):
+        config["CONN_MAX_AGE"] = _int_env("DB_CONN_MAX_AGE", "600")
+        config["CONN_HEALTH_CHECKS"] = True
+
+    if postgres and mode == "pool":
+        # The pool owns connection reuse; Django requires CONN_MAX_AGE=0 here.
+        options["pool"] = {
+            "min_size": _int_env("DB_POOL_MIN_SIZE", "2"),
+            "max_size": _int_env("DB_POOL_MAX_SIZE", "10"),
+            "timeout": _int_env("DB_POOL_TIMEOUT", "10"),
+        }
+    elif postgres and mode == "pgbouncer":
+        # Transaction poolers hand each transaction to any server connection,
+        # so named cursors and prepared statements can't outlive it.
+        config["DISABLE_SERVER_SIDE_CURSORS"] = True
+        options["prepare_threshold"] = None
+
+    config["CONN_MODE"] = mode
+    return config
+
+
+def describe(connection) -> dict:
+    """Summary of a connection's strategy, for the health endpoint."""
+    settings = connection.settings_dict
+    pool = settings.get("OPTIONS", {}).get("pool")
+    return {
+        "mode": settings.get("CONN_MODE", "direct"),
+        "vendor": connection.vendor,
+        "conn_max_age": settings.get("CONN_MAX_AGE", 0),
+        "health_checks": settings.get("CONN_HEALTH_CHECKS", False),
+        "pool": {"min_size": pool.get("min_size"), "max_size": pool.get("max_size")} if isinstance(pool, dict) else bool(pool),
+        "server_side_cursors": not settings.get("DISABLE_SERVER_SIDE_CURSORS", False),
+    }
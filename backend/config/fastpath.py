@@ -0,0 +1,220 @@
+"""Fast read path for list endpoints.
+
+``RowSerializer`` compiles a DRF serializer into a ``.values()`` projection
+and a per-row mapper that reproduces the serializer's output (same
+keys, order and formatting) without building model instances or running the
+per-field serializer machinery. Only plain read fields are supported; anything
+else raises ``TypeError`` when compiling, so a fast path can't silently drift
+from its serializer.
+"""
+import decimal
+from functools import cached_property
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .renderers import FastJSONRenderer
+
+
+class PerRequest:
+    """Converter that must be rebuilt for each request (e.g. timezone-aware)."""
+
+    def __init__(self, bind):
+        self.bind = bind
+
+
+def _decimal_converter(field):
+    if not getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING):
+        raise TypeError("DecimalField without coerce_to_string is not supported.")
+    if field.localize or field.normalize_output:
+        raise TypeError("Localized/normalized DecimalField is not supported.")
+    if field.decimal_places is None:
+        return lambda value: f"{value:f}"
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+    return lambda value: f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+
+def _datetime_converter(field):
+    if getattr(field, "format", api_settings.DATETIME_FORMAT).lower() != "iso-8601":
+        raise TypeError("Only ISO 8601 DateTimeField output is supported.")
+    if getattr(field, "timezone", None) is not None:
+        raise TypeError("DateTimeField with an explicit timezone is not supported.")
+    if not settings.USE_TZ:
+        return lambda value: value.isoformat()
+
+    # DRF renders in the timezone active for the request.
+    def bind():
+        tz = timezone.get_current_timezone()
+
+        def convert(value):
+            text = value.astimezone(tz).isoformat()
+            return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+        return convert
+
+    return PerRequest(bind)
+
+
+def _date_converter(field):
+    if getattr(field, "format", api_settings.DATE_FORMAT).lower() != "iso-8601":
+        raise TypeError("Only ISO 8601 DateField output is supported.")
+    return lambda value: value.isoformat()
+
+
+def _identity(field):
+    return None
+
+
+# Exact field classes only: subclasses may override to_representation.
+CONVERTERS = {
+    # Fields whose representation of a database value is the value itself.
+    serializers.BooleanField: _identity,
+    serializers.CharField: _identity,
+    serializers.ChoiceField: _identity,
+    serializers.IntegerField: _identity,
+    serializers.PrimaryKeyRelatedField: _identity,
+    serializers.ReadOnlyField: _identity,
+    serializers.DecimalField: _decimal_converter,
+    serializers.DateTimeField: _datetime_converter,
+    serializers.DateField: _date_converter,
+}
+
+
+def parse_fieldset(params, available, views=None) -> tuple | None:
+    """Resolve ``fields=``/``exclude=``/``view=`` query params to field names.
+
+    Returns ``None`` when the full representation was asked for. Names keep
+    the order of ``available``.
+    """
+    views = views or {}
+    view = params.get("view")
+    fields = [f.strip() for f in params.get("fields", "").split(",") if f.strip()]
+    exclude = {f.strip() for f in params.get("exclude", "").split(",") if f.strip()}
+    if not (view or fields or exclude):
+        return None
+    if view and fields:
+        raise ValidationError({"fields": "Use either fields or view, not both."})
+    if view and view not in views:
+        raise ValidationError({"view": f"Must be one of: {', '.join(views)}."})
+    unknown = sorted((set(fields) | exclude) - set(available))
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+    selected = set(fields) if fields else set(views[view]) if view else set(available)
+    selected -= exclude
+    if not selected:
+        raise ValidationError({"fields": "At least one field must be selected."})
+    return tuple(name for name in available if name in selected)
+
+
+class RowSerializer:
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        # Optional subset of the serializer's field names to emit.
+        self.fields = fields
+        self._subsets = {}
+
+    def subset(self, fields) -> "RowSerializer":
+        """A ``RowSerializer`` emitting only ``fields`` (cached per field set)."""
+        key = tuple(fields)
+        if key not in self._subsets:
+            self._subsets[key] = RowSerializer(self.serializer_class, fields=key)
+        return self._subsets[key]
+
+    @cached_property
+    def field_names(self) -> tuple:
+        serializer = self.serializer_class()
+        return tuple(name for name, field in serializer.fields.items() if not field.write_only)
+
+    @cached_property
+    def _compiled(self):
+        serializer = self.serializer_class()
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise TypeError(f"{self.serializer_class.__name__} overrides to_representation.")
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (self.fields is not None and name not in self.fields):
+                continue
+            factory = CONVERTERS.get(type(field))
+            if factory is None or field.source == "*":
+                raise TypeError(f"Field {name!r} ({type(field).__name__}) cannot be projected.")
+            converter = factory(field)
+            columns.append((name, field.source.replace(".", "__"), converter))
+        return columns, self._build_mapper(columns)
+
+    @staticmethod
+    def _build_mapper(columns):
+        # make(*converters) binds the non-None converters, in column order, and
+        # returns the row mapper; None values are passed through unconverted.
+        layout = tuple((name, lookup, converter is not None) for name, lookup, converter in columns)
+
+        def make(*converters):
+            bound = iter(converters)
+            spec = tuple((name, lookup, next(bound) if converted else None) for name, lookup, converted in layout)
+
+            def row(r):
+                return {name: v if (v := r[lookup]) is None or c is None else c(v) for name, lookup, c in spec}
+
+            return row
+
+        return make
+
+    @property
+    def lookups(self) -> tuple:
+        return tuple(dict.fromkeys(lookup for _, lookup, _ in self._compiled[0]))
+
+    def values(self, queryset, *extra):
+        """Project ``queryset`` to the looked-up columns plus ``extra`` ones."""
+        return queryset.values(*dict.fromkeys((*self.lookups, *extra)))
+
+    def serialize(self, rows) -> list[dict]:
+        columns, make = self._compiled
+        row = make(*(
+            c.bind() if isinstance(c, PerRequest) else c
+            for _, _, c in columns if c is not None
+        ))
+        return [row(r) for r in rows]
+
+
+class FastListMixin:
+    """Serve GET list requests through ``row_serializer`` and ``FastJSONRenderer``.
+
+    Other actions keep the regular serializer and renderers.
+    """
+
+    row_serializer: RowSerializer
+
+    def get_row_serializer(self) -> RowSerializer:
+        return self.row_serializer
+
+    def _is_fast_list(self):
+        action = getattr(self, "action", None)
+        return action == "list" or (action is None and self.request.method in ("GET", "HEAD"))
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if not self._is_fast_list():
+            return renderers
+        return [FastJSONRenderer() if type(r) is JSONRenderer else r for r in renderers]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        row_serializer = self.get_row_serializer()
+        # Cursor pagination reads its ordering columns from each row, whether
+        # or not they are part of the output.
+        extra = ()
+        if self.paginator is not None and hasattr(self.paginator, "get_ordering"):
+            extra = tuple(f.lstrip("-") for f in self.paginator.get_ordering(request, queryset, self))
+        rows = row_serializer.values(queryset, *extra)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.serialize(page))
+        return Response(row_serializer.serialize(rows))
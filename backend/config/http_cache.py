@@ -0,0 +1,191 @@
+"""Conditional GET and server-side response caching for read-only endpoints.
+
+Each cached endpoint declares the tables its payload depends on. Every table
+has a version counter in the cache, bumped by model signals on save/delete
+(see the ``signals`` module of each app). The ETag of a response is a hash of
+the request path/query, the accepted format and those versions, so:
+
+* a client revalidating with ``If-None-Match`` gets ``304`` until one of the
+  tables changes, without touching the database;
+* rendered bodies are stored under the same key, and stale entries are never
+  read again after a version bump (they just expire).
+
+Bumps are applied when the writing transaction commits, so a concurrent
+request can't store a body rendered from pre-commit rows under the new version.
+
+With the default local-memory cache, versions are per process. They then
+expire after ``HTTP_CACHE_SECONDS`` and are re-seeded, so other workers notice
+a change (and stop answering ``304``) within that time; configure
+``REDIS_URL`` to share versions and bodies across workers, where they never
+expire.
+
+With a read replica (``config.replica``), a bump also marks the table fresh for
+``REPLICA_PIN_SECONDS``; cache misses on fresh tables are rendered from the
+primary so a lagging replica can't store an old body under the new version.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+from . import replica
+
+VERSION_PREFIX = "httpcache:version:"
+BODY_PREFIX = "httpcache:body:"
+FRESH_PREFIX = "httpcache:fresh:"
+
+
+def _cache():
+    return caches[getattr(settings, "HTTP_CACHE_ALIAS", "default")]
+
+
+def _version_timeout():
+    # A per-process cache can't see other workers' bumps; expiring the
+    # versions bounds how long it keeps serving (and 304-ing) old payloads.
+    if isinstance(_cache(), LocMemCache):
+        return getattr(settings, "HTTP_CACHE_SECONDS", 60)
+    return None
+
+
+def get_versions(tables) -> dict:
+    cache = _cache()
+    keys = [VERSION_PREFIX + table for table in tables]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        # Seed from the clock so a flushed/restarted cache never reuses an
+        # old version number (and thus an old ETag).
+        cache.set_many(missing, _version_timeout())
+        found.update(missing)
+    return {table: found[VERSION_PREFIX + table] for table in tables}
+
+
+def bump_version(table: str) -> None:
+    """Invalidate ``table``'s cached responses once the current transaction commits."""
+    transaction.on_commit(lambda: _bump(table))
+
+
+def _bump(table):
+    cache = _cache()
+    key = VERSION_PREFIX + table
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), _version_timeout())
+    if replica.enabled():
+        cache.set(FRESH_PREFIX + table, 1, replica.pin_seconds())
+
+
+def _recently_written(tables) -> bool:
+    return replica.enabled() and bool(_cache().get_many([FRESH_PREFIX + table for table in tables]))
+
+
+def _cache_key(request, tables, bucket_seconds):
+    query = sorted(request.GET.lists())
+    parts = [
+        request.path,
+        repr(query),
+        getattr(getattr(request, "accepted_renderer", None), "format", ""),
+        repr(sorted(get_versions(tables).items())),
+    ]
+    if bucket_seconds:
+        parts.append(str(int(time.time() // bucket_seconds)))
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def _begin(request, tables, max_age, bucket_seconds):
+    """Return ``(key, headers, json_only, response)``; ``response`` is set on a 304 or cache hit."""
+    key = _cache_key(request, tables, bucket_seconds)
+    etag = quote_etag(key)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        for name, value in headers.items():
+            response[name] = value
+        return key, headers, False, response
+
+    json_only = getattr(getattr(request, "accepted_renderer", None), "format", "json") == "json"
+    if json_only:
+        hit = _cache().get(BODY_PREFIX + key)
+        if hit is not None:
+            content, content_type = hit
+            response = HttpResponse(content, content_type=content_type)
+            for name, value in headers.items():
+                response[name] = value
+            return key, headers, json_only, response
+    return key, headers, json_only, None
+
+
+def _finish(response, key, headers, json_only):
+    if response.status_code != 200:
+        return response
+    for name, value in headers.items():
+        response[name] = value
+    if json_only:
+        cache = _cache()
+        timeout = getattr(settings, "HTTP_CACHE_SECONDS", 60)
+
+        def store(rendered):
+            cache.set(BODY_PREFIX + key, (rendered.content, rendered["Content-Type"]), timeout)
+
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(store)
+        elif not response.streaming:
+            store(response)
+    return response
+
+
+def cached_response(*tables, max_age=60, bucket_seconds=None):
+    """Decorate a DRF or async view handler with ETag + response caching.
+
+    ``bucket_seconds`` additionally rolls the key over on a fixed interval, for
+    payloads that also depend on data without a version counter (e.g. Pulse).
+    Only JSON responses are stored; the browsable API is never cached.
+    """
+
+    def decorator(handler):
+        if iscoroutinefunction(handler):
+
+            @wraps(handler)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await handler(view, request, *args, **kwargs)
+                key, headers, json_only, response = await sync_to_async(_begin)(
+                    request, tables, max_age, bucket_seconds
+                )
+                if response is not None:
+                    return response
+                if await sync_to_async(_recently_written)(tables):
+                    with replica.use_primary():
+                        response = await handler(view, request, *args, **kwargs)
+                else:
+                    response = await handler(view, request, *args, **kwargs)
+                return await sync_to_async(_finish)(response, key, headers, json_only)
+
+            return async_wrapper
+
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return handler(view, request, *args, **kwargs)
+            key, headers, json_only, response = _begin(request, tables, max_age, bucket_seconds)
+            if response is not None:
+                return response
+            if _recently_written(tables):
+                with replica.use_primary():
+                    response = handler(view, request, *args, **kwargs)
+            else:
+                response = handler(view, request, *args, **kwargs)
+            return _finish(response, key, headers, json_only)
+
+        return wrapper
+
+    return decorator
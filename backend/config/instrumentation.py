@@ -0,0 +1,273 @@
+"""Per-request timing, query counting and Prometheus metrics.
+
+With ``METRICS_ENABLED=1``, ``InstrumentationMiddleware`` records the wall
+time of every request, the time and number of its database queries (through
+an execute wrapper on every connection, including the threads Pulse queries
+on), SQL it ran more than once and the response size. It then:
+
+* adds a ``Server-Timing`` header, shown in the browser's network panel;
+* logs one JSON line per request to ``config.instrumentation`` at INFO, or at
+  WARNING when the request took ``SLOW_REQUEST_MS`` or repeated one statement
+  ``DUPLICATE_QUERY_THRESHOLD`` times (a likely N+1);
+* aggregates per-route histograms, served in Prometheus text format by the
+  admin-only ``/api/metrics/``.
+
+Metrics are kept per process, so scrape every worker. When disabled (the
+default) the middleware removes itself and no wrapper is installed.
+"""
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+METRICS = {
+    "civitrack_http_requests_total": ("counter", "Requests by route, method and status.", None),
+    "civitrack_http_request_duration_seconds": ("histogram", "Wall time per request.", DURATION_BUCKETS),
+    "civitrack_http_request_db_seconds": ("histogram", "Database time per request.", DURATION_BUCKETS),
+    "civitrack_http_request_queries": ("histogram", "Database queries per request.", QUERY_BUCKETS),
+    "civitrack_http_request_duplicate_queries_total": (
+        "counter", "Queries repeating SQL already run in the same request.", None,
+    ),
+    "civitrack_http_response_size_bytes": ("histogram", "Response body size (non-streaming).", SIZE_BUCKETS),
+}
+METHODS = {"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"}
+# Longest SQL quoted in a log line.
+SQL_PREVIEW = 300
+
+
+def enabled() -> bool:
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+class QueryStats:
+    """Queries executed while this object is current (see ``capture``)."""
+
+    __slots__ = ("queries", "db_seconds", "statements", "_lock")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+        # Pulse's aggregates record from several threads at once.
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Queries whose SQL (parameters aside) already ran in this context."""
+        return self.queries - len(self.statements)
+
+    def most_repeated(self):
+        return self.statements.most_common(1)[0] if self.statements else ("", 0)
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _execute(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - started)
+
+
+def _install(sender=None, connection=None, **kwargs):
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute)
+
+
+def install() -> None:
+    """Wrap every connection opened from now on, and this thread's open ones."""
+    connection_created.connect(_install, dispatch_uid="config.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _install(connection=connection)
+
+
+@contextmanager
+def capture():
+    """Collect queries run in this context, and in threads that copy it, into a new ``QueryStats``."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Registry:
+    """Process-wide counters and histograms for ``METRICS``, keyed by label set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, name, labels, amount=1) -> None:
+        with self._lock:
+            self._values[name, labels] = self._values.get((name, labels), 0) + amount
+
+    def observe(self, name, labels, value) -> None:
+        buckets = METRICS[name][2]
+        with self._lock:
+            histogram = self._values.get((name, labels))
+            if histogram is None:
+                histogram = self._values[name, labels] = _Histogram(buckets)
+            histogram.counts[bisect_left(buckets, value)] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            items = sorted(
+                (key, (list(v.counts), v.sum, v.count) if isinstance(v, _Histogram) else v)
+                for key, v in self._values.items()
+            )
+        lines = []
+        for metric, (kind, help_text, buckets) in METRICS.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for (name, labels), value in items:
+                if name != metric:
+                    continue
+                if kind == "counter":
+                    lines.append(f"{metric}{_labels(labels)} {value}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, n in zip((*buckets, "+Inf"), counts):
+                    cumulative += n
+                    lines.append(f"{metric}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{metric}_sum{_labels(labels)} {total}")
+                lines.append(f"{metric}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels) -> str:
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+registry = Registry()
+
+
+def _route(request) -> str:
+    # Named routes (the DRF router's "projects-detail", ...) read better than
+    # their regexes; unmatched paths share one label to bound cardinality.
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+    return match.view_name if match.url_name else match.route
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed()
+        install()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with capture() as stats:
+            response = self.get_response(request)
+        return self._finish(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with capture() as stats:
+            response = await self.get_response(request)
+        return self._finish(request, response, stats, time.perf_counter() - started)
+
+    def _finish(self, request, response, stats, elapsed):
+        route = _route(request)
+        method = request.method if request.method in METHODS else "OTHER"
+        labels = (("route", route), ("method", method))
+        # Streaming bodies (exports, activity) aren't rendered yet, so only
+        # their time to first byte is measured.
+        size = None if response.streaming else len(response.content)
+
+        registry.inc("civitrack_http_requests_total", labels + (("status", str(response.status_code)),))
+        registry.observe("civitrack_http_request_duration_seconds", labels, elapsed)
+        registry.observe("civitrack_http_request_db_seconds", labels, stats.db_seconds)
+        registry.observe("civitrack_http_request_queries", labels, stats.queries)
+        if stats.duplicates:
+            registry.inc("civitrack_http_request_duplicate_queries_total", labels, stats.duplicates)
+        if size is not None:
+            registry.observe("civitrack_http_response_size_bytes", labels, size)
+
+        response["Server-Timing"] = (
+            f"total;dur={elapsed * 1000:.1f}, "
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+        )
+        self._log(request, response, route, stats, elapsed, size)
+        return response
+
+    def _log(self, request, response, route, stats, elapsed, size):
+        sql, repeats = stats.most_repeated()
+        slow = elapsed * 1000 >= settings.SLOW_REQUEST_MS
+        repeated = repeats >= settings.DUPLICATE_QUERY_THRESHOLD
+        level = logging.WARNING if slow or repeated else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "db_ms": round(stats.db_seconds * 1000, 2),
+            "queries": stats.queries,
+            "duplicate_queries": stats.duplicates,
+            "bytes": size,
+        }
+        if slow:
+            fields["slow"] = True
+        if repeated:
+            fields.update(repeated_sql=sql[:SQL_PREVIEW], repeats=repeats)
+        logger.log(level, json.dumps(fields), extra={"metrics": fields})
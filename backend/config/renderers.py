@@ -0,0 +1,28 @@
+try:
+    import orjson
+except ImportError:  # optional; falls back to DRF's json.dumps
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson, producing the same bytes.
+
+    Matches DRF's compact, non-ASCII-escaping output. Only use it for payloads
+    without floats: orjson writes exponents differently (``1e-7`` vs
+    ``1e-07``). Anything orjson can't encode, indented output and non-default
+    DRF JSON settings fall back to ``JSONRenderer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping of U+2028/U+2029 as JSONRenderer.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
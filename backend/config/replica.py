@@ -0,0 +1,170 @@
+"""Route read-only request traffic to an optional replica database.
+
+When ``DATABASE_REPLICA_URL`` is set, ``DATABASES["replica"]`` exists and:
+
+* ``ReplicaRoutingMiddleware`` marks safe (GET/HEAD/OPTIONS) API requests as
+  replica-eligible; everything else, and anything outside a request
+  (commands, background flushes), uses ``default``.
+* ``ReplicaRouter`` sends reads of eligible requests to the replica and every
+  write to ``default``. Once a request writes, or while a transaction is open
+  on ``default``, its remaining reads stay on the primary.
+* After a request with a valid access token writes, that token's user is
+  pinned to the primary for ``REPLICA_PIN_SECONDS`` (read-your-writes for new comments and reports).
+  Pins live in the cache, so configure ``REDIS_URL`` to share them across
+  workers.
+
+Without a replica the router and middleware are no-ops.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+REPLICA_ALIAS = "replica"
+PIN_PREFIX = "replica:pin:"
+
+
+@dataclass
+class _Routing:
+    replica: bool
+    wrote: bool = False
+
+
+_routing: ContextVar[_Routing | None] = ContextVar("db_routing", default=None)
+
+
+def enabled() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_seconds() -> int:
+    return getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+@contextmanager
+def use_primary():
+    """Force reads inside the block onto ``default``."""
+    token = _routing.set(_Routing(replica=False))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def use_replica():
+    """Allow reads inside the block to use the replica (outside a request)."""
+    token = _routing.set(_Routing(replica=enabled()))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def pin(user_id) -> None:
+    cache.set(f"{PIN_PREFIX}{user_id}", 1, pin_seconds())
+
+
+def is_pinned(user_id) -> bool:
+    return user_id is not None and cache.get(f"{PIN_PREFIX}{user_id}") is not None
+
+
+_authenticator = JWTAuthentication()
+
+
+def _token_user_id(request):
+    # Routing runs before the view authenticates, so verify the token here:
+    # unverified claims would let anyone pin (or unpin) another user's reads.
+    header = _authenticator.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw = _authenticator.get_raw_token(header)
+        if raw is None:
+            return None
+        token = _authenticator.get_validated_token(raw)
+    except AuthenticationFailed:
+        return None
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (
+            routing is None
+            or not routing.replica
+            or routing.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        # Explicit, so instances loaded from the replica are saved to default.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _begin(self, request):
+        user_id = _token_user_id(request)
+        # Session-authenticated (admin) traffic always stays on the primary.
+        replica = (
+            request.method in SAFE_METHODS
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not is_pinned(user_id)
+        )
+        return user_id, _Routing(replica=replica)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not enabled():
+            return self.get_response(request)
+        user_id, routing = self._begin(request)
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if routing.wrote and user_id is not None and response.status_code < 400:
+            pin(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not enabled():
+            return await self.get_response(request)
+        user_id, routing = await sync_to_async(self._begin)(request)
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if routing.wrote and user_id is not None and response.status_code < 400:
+            await sync_to_async(pin)(user_id)
+        return response
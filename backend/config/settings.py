@@ -14,7 +14,8 @@ from pathlib import Path
 import os
 
 from dotenv import load_dotenv
-import dj_database_url
+
+from .db import database_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -55,14 +56,20 @@ INSTALLED_APPS = [
     "reports",
     "analytics",
 ]
+# Synthetic data generators and benchmark commands (bench_api,
+# generate_load_data, ...): for development and CI, not deployments.
+if os.getenv("BENCHMARKS_ENABLED", "1" if DEBUG else "0") == "1":
+    INSTALLED_APPS.append("benchmarks")
 
 MIDDLEWARE = [
+    "config.instrumentation.InstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.replica.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -90,14 +97,54 @@ ASGI_APPLICATION = "config.asgi.application"
 
 # Database
 # Using dj-database-url so Supabase URLs (+ sslmode) work properly.
-# conn_max_age=0 is best for transaction poolers (PgBouncer).
+# DB_CONN_MODE picks the connection strategy (direct, persistent, pool or
+# pgbouncer); see config/db.py.
 DATABASES = {
-    "default": dj_database_url.config(
-        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
-        conn_max_age=0,
-    )
+    "default": database_config(f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
 }
 
+# Optional read replica for anonymous/safe reads (see config/replica.py).
+# Writers are pinned to the primary for REPLICA_PIN_SECONDS after a write.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL", "")
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = database_config(DATABASE_REPLICA_URL, env="DATABASE_REPLICA_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_ROUTERS = ["config.replica.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "10"))
+
+
+# Cache: local memory by default; set REDIS_URL (requires the `redis` package)
+# to share cached responses and invalidation across workers.
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "civitrack",
+        }
+    }
+
+# Server-side response cache for read-only endpoints (see config/http_cache.py)
+HTTP_CACHE_ALIAS = "default"
+HTTP_CACHE_SECONDS = int(os.getenv("HTTP_CACHE_SECONDS", "60"))
+
+
+# Worker threads (and so DB connections) per process for async views' concurrent queries
+ASYNC_QUERY_THREADS = int(os.getenv("ASYNC_QUERY_THREADS", "8"))
+
+# Per-project activity stream (see config/activity.py)
+ACTIVITY_BACKEND = os.getenv("ACTIVITY_BACKEND", "redis" if REDIS_URL else "memory")
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "100"))
+ACTIVITY_HEARTBEAT_SECONDS = int(os.getenv("ACTIVITY_HEARTBEAT_SECONDS", "15"))
+ACTIVITY_STREAM_SECONDS = int(os.getenv("ACTIVITY_STREAM_SECONDS", "300"))
+
 
 # Custom user model (set BEFORE making migrations for accounts)
 AUTH_USER_MODEL = "accounts.User"
@@ -110,7 +157,7 @@ CORS_ALLOWED_ORIGINS = _split_env_list(os.getenv("CORS_ALLOWED_ORIGINS", "http:/
 # DRF + JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -118,6 +165,47 @@ REST_FRAMEWORK = {
 }
 
 
+# Tokens carry username/role/staff claims so requests skip the user query
+# (see accounts/authentication.py); refresh re-reads the user.
+SIMPLE_JWT = {
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.ClaimsTokenRefreshSerializer",
+}
+# How often each process re-checks the shared cache for role/status changes.
+AUTH_REVOCATION_CHECK_SECONDS = float(os.getenv("AUTH_REVOCATION_CHECK_SECONDS", "5"))
+
+
+# Analytics beacon ingestion (see analytics/buffer.py)
+ANALYTICS_BUFFER_ENABLED = os.getenv("ANALYTICS_BUFFER_ENABLED", "1") == "1"
+ANALYTICS_BUFFER_MAX_EVENTS = int(os.getenv("ANALYTICS_BUFFER_MAX_EVENTS", "500"))
+ANALYTICS_BUFFER_FLUSH_SECONDS = float(os.getenv("ANALYTICS_BUFFER_FLUSH_SECONDS", "5"))
+ANALYTICS_SPOOL_DIR = Path(os.getenv("ANALYTICS_SPOOL_DIR", BASE_DIR / "var" / "analytics_spool"))
+ANALYTICS_PROJECT_ID_CACHE_SECONDS = int(os.getenv("ANALYTICS_PROJECT_ID_CACHE_SECONDS", "300"))
+# Raw events older than this are folded into the rollups by compact_analytics.
+ANALYTICS_RETENTION_DAYS = int(os.getenv("ANALYTICS_RETENTION_DAYS", "90"))
+
+
+# Request instrumentation (see config/instrumentation.py); off by default.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+# Requests at least this slow, or repeating one statement this often, are
+# logged at WARNING; METRICS_LOG_LEVEL=INFO logs every request.
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+DUPLICATE_QUERY_THRESHOLD = int(os.getenv("DUPLICATE_QUERY_THRESHOLD", "5"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "config.instrumentation": {
+            "handlers": ["console"],
+            "level": os.getenv("METRICS_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
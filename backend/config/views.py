@@ -1,6 +1,51 @@
-from rest_framework.decorators import api_view
+import logging
+import time
+
+from django.db import DatabaseError, connection, connections
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+from projects.permissions import IsAdmin
+from . import instrumentation, replica
+from .db import describe
+
+logger = logging.getLogger(__name__)
+
+
 @api_view(["GET"])
 def health(request):
-    return Response({"status": "ok"})
+    """Liveness; `?check=db` also pings the database.
+
+    The endpoint is anonymous, so the connection strategy is only included
+    for admins and database errors are logged rather than returned.
+    """
+    payload = {"status": "ok"}
+    if IsAdmin().has_permission(request, None):
+        payload["database"] = describe(connection)
+        if replica.enabled():
+            payload["replica"] = describe(connections[replica.REPLICA_ALIAS])
+    if request.query_params.get("check") == "db":
+        started = time.perf_counter()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            logger.exception("health check could not reach the database")
+            payload.update(status="error", db="error")
+            return Response(payload, status=503)
+        payload.update(db="ok", db_ping_ms=round((time.perf_counter() - started) * 1000, 2))
+    return Response(payload)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def metrics(request):
+    """Request metrics of this process in Prometheus text format (admin only)."""
+    if not instrumentation.enabled():
+        raise NotFound("Metrics are disabled; set METRICS_ENABLED=1.")
+    return HttpResponse(
+        instrumentation.registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -7,4 +7,5 @@ from .models import Comment
 class CommentAdmin(admin.ModelAdmin):
     list_display = ("project", "user", "created_at")
     list_filter = ("created_at",)
+    list_select_related = ("project", "user")
     search_fields = ("body", "user__username", "project__title")
@@ -12,6 +12,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "created_at"], name="comment_project_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment({self.project_id}, {self.user_id})"
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.activity import publish_on_commit
+from config.http_cache import bump_version
+from projects import counters
+from .models import Comment
+from .serializers import CommentSerializer
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust(instance.project_id, comment_count=1)
+        bump_version("projects")
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    counters.adjust(instance.project_id, comment_count=-1)
+    bump_version("projects")
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_comments_version(sender, **kwargs):
+    bump_version("comments")
+
+
+@receiver(post_save, sender=Comment)
+def broadcast_comment(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit(instance.project_id, "comment", CommentSerializer(instance).data)
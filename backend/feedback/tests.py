@@ -1,3 +1,65 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from projects.models import Project
+from .models import Comment
+
+
+class CommentThreadPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="citizen", password="pw")
+        cls.project = Project.objects.create(title="Market")
+        other = Project.objects.create(title="Other")
+        Comment.objects.bulk_create(
+            [Comment(project=cls.project, user=cls.user, body=f"c{i}") for i in range(45)]
+            + [Comment(project=other, user=cls.user, body="elsewhere")]
+        )
+        # Several comments per timestamp, so paging relies on the id tie-breaker.
+        base = timezone.now()
+        for comment in Comment.objects.filter(project=cls.project):
+            Comment.objects.filter(pk=comment.pk).update(created_at=base - timedelta(minutes=comment.pk % 4))
+        cls.url = f"/api/projects/{cls.project.pk}/comments/"
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_walk_is_newest_first_without_gaps(self):
+        page = self.get(self.url, {"page_size": 10})
+        ids = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.get(page["next"])
+            ids += [row["id"] for row in page["results"]]
+
+        expected = list(
+            Comment.objects.filter(project=self.project)
+            .order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_page_size(self):
+        self.assertEqual(len(self.get(self.url)["results"]), 20)
+        self.assertEqual(len(self.get(self.url, {"page_size": 1000})["results"]), 45)
+
+    def test_new_comment_does_not_shift_cursor(self):
+        first = self.get(self.url, {"page_size": 10})
+        self.client.force_authenticate(self.user)
+        created = self.client.post(self.url, {"body": "latest"}, format="json")
+        self.assertEqual(created.status_code, 201)
+
+        second = self.get(first["next"])
+        seen = {row["id"] for row in first["results"]}
+        self.assertFalse(seen & {row["id"] for row in second["results"]})
+        self.assertEqual(self.get(self.url)["results"][0]["body"], "latest")
 
-# Create your tests here.
+    def test_unknown_project_is_empty(self):
+        self.assertEqual(self.get("/api/projects/999999/comments/")["results"], [])
@@ -1,20 +1,27 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListCreateAPIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+from config.fastpath import FastListMixin, RowSerializer
+from config.pagination import NewestFirstCursorPagination
 from projects.models import Project
 from .models import Comment
 from .serializers import CommentSerializer
 
 
-class ProjectCommentListCreateView(ListCreateAPIView):
+class ProjectCommentListCreateView(FastListMixin, ListCreateAPIView):
     serializer_class = CommentSerializer
+    row_serializer = RowSerializer(CommentSerializer)
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         project_id = self.kwargs.get("project_id")
         return Comment.objects.filter(project_id=project_id).select_related("user", "project")
 
+    @transaction.atomic
     def perform_create(self, serializer):
         project = get_object_or_404(Project, pk=self.kwargs.get("project_id"))
-        serializer.save(project=project, user=self.request.user)
+        # request.user may be a token-backed ClaimsUser, not a model instance.
+        serializer.save(project=project, user_id=self.request.user.id)
@@ -1,5 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _repair_search_index(sender, using, **kwargs):
+    from django.db import connections
+
+    from .search import repair_sqlite_triggers
+
+    repair_sqlite_triggers(connections[using])
 
 
 class ProjectsConfig(AppConfig):
     name = 'projects'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(_repair_search_index, sender=self)
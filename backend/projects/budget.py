@@ -0,0 +1,72 @@
+"""Cached budget/spend summary used by Pulse.
+
+Totals and the per-county/per-status breakdowns are computed with database
+``Sum`` aggregates (exact ``Decimal`` arithmetic) and cached until a project's
+budget-relevant fields change (see ``projects.signals``).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from config.replica import use_primary
+
+from .models import Project
+
+CACHE_KEY = "projects:budget_summary"
+
+# Fields the summary depends on; saves that don't touch these keep the cache.
+SUMMARY_FIELDS = ("budget", "spent_amount", "county", "status")
+
+
+def _money(value):
+    return None if value is None else f"{value:.2f}"
+
+
+def _breakdown(group_field):
+    rows = (
+        Project.objects.values(group_field)
+        .annotate(projects=Count("id"), budget=Sum("budget"), spent=Sum("spent_amount"))
+        .order_by(group_field)
+    )
+    return [
+        {
+            group_field: row[group_field],
+            "projects": row["projects"],
+            "budget": _money(row["budget"]),
+            "spent": _money(row["spent"]),
+        }
+        for row in rows
+    ]
+
+
+def compute_budget_summary() -> dict:
+    totals = Project.objects.aggregate(budget=Sum("budget"), spent=Sum("spent_amount"))
+    return {
+        "total_budget": _money(totals["budget"] or 0),
+        "total_spent": _money(totals["spent"] or 0),
+        "by_county": _breakdown("county"),
+        "by_status": _breakdown("status"),
+    }
+
+
+def get_budget_summary() -> dict:
+    summary = cache.get(CACHE_KEY)
+    if summary is None:
+        # Refills follow an invalidation, i.e. a write the replica may not have
+        # applied yet, and the result is cached for minutes.
+        with use_primary():
+            summary = compute_budget_summary()
+        # The timeout only bounds staleness across processes that don't share
+        # a cache backend; in-process changes invalidate immediately.
+        cache.set(CACHE_KEY, summary, getattr(settings, "BUDGET_SUMMARY_CACHE_SECONDS", 600))
+    return summary
+
+
+def invalidate_budget_summary() -> None:
+    """Drop the cached summary once the current transaction commits.
+
+    Deleting earlier would let a concurrent request recompute from the
+    pre-commit rows and cache that for the full timeout.
+    """
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
@@ -0,0 +1,57 @@
+"""Everything the project detail page needs, in one response.
+
+The project, the first page of its comments and reports, and its engagement
+counts are read with one query each through the ``.values()`` fast path
+(``config.fastpath``), so the query count is fixed and usernames/roles come
+from the same join as the rows.
+"""
+from config.fastpath import RowSerializer
+from config.pagination import NewestFirstCursorPagination
+from feedback.models import Comment
+from feedback.serializers import CommentSerializer
+from reports.models import Report
+from reports.serializers import ReportSerializer
+
+from .serializers import ProjectSerializer
+
+project_rows = RowSerializer(ProjectSerializer)
+comment_rows = RowSerializer(CommentSerializer)
+report_rows = RowSerializer(ReportSerializer)
+
+
+def _first_page(request, queryset, row_serializer, list_path):
+    paginator = NewestFirstCursorPagination()
+    extra = tuple(f.lstrip("-") for f in paginator.ordering)
+    page = paginator.paginate_queryset(row_serializer.values(queryset, *extra), request)
+    # Links continue on the thread's own list endpoint, not on the bundle.
+    paginator.base_url = request.build_absolute_uri(list_path)
+    return paginator.get_paginated_response(row_serializer.serialize(page)).data
+
+
+def build_bundle(request, queryset, project_id) -> dict | None:
+    rows = project_rows.serialize(project_rows.values(queryset.filter(pk=project_id)))
+    if not rows:
+        return None
+    project = rows[0]
+    return {
+        "project": project,
+        "comments": _first_page(
+            request,
+            Comment.objects.filter(project_id=project_id),
+            comment_rows,
+            f"/api/projects/{project_id}/comments/",
+        ),
+        "reports": _first_page(
+            request,
+            Report.objects.filter(project_id=project_id),
+            report_rows,
+            f"/api/projects/{project_id}/reports/",
+        ),
+        "counts": {
+            "comments": project["comment_count"],
+            "reports": project["report_count"],
+            "open_reports": project["open_report_count"],
+            "views": project["view_count"],
+            "views_7d": project["views_7d"],
+        },
+    }
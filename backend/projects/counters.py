@@ -0,0 +1,125 @@
+"""Denormalized engagement counters on ``Project``.
+
+Comment and report counters are adjusted with ``F()`` updates from model
+signals (``feedback.signals``, ``reports.signals``), inside the same
+transaction as the change. View counters are added once per event batch by
+``analytics.ingest``. ``views_7d`` is a rolling window, so between runs of
+``reconcile_project_counters`` it only grows; run that command daily.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, PositiveIntegerField, Q, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import COUNTER_FIELDS, Project
+
+# Keeps each CASE expression in the view-counter UPDATE reasonably small.
+VIEW_BATCH_SIZE = 500
+
+
+def adjust(project_id: int, **deltas: int) -> None:
+    """Add ``deltas`` to the counter columns of one project.
+
+    Decrements stop at zero, so a counter that drifted low can't fail the
+    delete that triggered it on the unsigned column's check constraint.
+    """
+    updates = {
+        field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0, output_field=PositiveIntegerField())
+        for field, delta in deltas.items()
+        if delta
+    }
+    if updates:
+        Project.objects.filter(pk=project_id).update(**updates)
+
+
+def window_start():
+    """First day counted by ``views_7d``."""
+    return timezone.localdate() - timedelta(days=6)
+
+
+def _increment(field, counts):
+    whens = [When(pk=pid, then=Value(n)) for pid, n in counts.items()]
+    return F(field) + Case(*whens, default=Value(0), output_field=PositiveIntegerField())
+
+
+def add_views(views) -> None:
+    """Add ``(project_id, created_at)`` view events to the counters."""
+    since = window_start()
+    total = Counter(pid for pid, _ in views)
+    recent = Counter(pid for pid, ts in views if timezone.localdate(ts) >= since)
+    ids = sorted(total)
+    for start in range(0, len(ids), VIEW_BATCH_SIZE):
+        chunk = ids[start:start + VIEW_BATCH_SIZE]
+        updates = {"view_count": _increment("view_count", {pid: total[pid] for pid in chunk})}
+        chunk_recent = {pid: recent[pid] for pid in chunk if recent[pid]}
+        if chunk_recent:
+            updates["views_7d"] = _increment("views_7d", chunk_recent)
+        Project.objects.filter(pk__in=chunk).update(**updates)
+
+
+def _expected(ids):
+    from analytics.models import ProjectViewDaily
+    from feedback.models import Comment
+    from reports.models import OPEN_STATUSES, Report
+
+    expected = {pid: dict.fromkeys(COUNTER_FIELDS, 0) for pid in ids}
+    comments = (
+        Comment.objects.filter(project_id__in=ids)
+        .values("project_id").annotate(n=Count("id")).order_by()
+    )
+    for row in comments:
+        expected[row["project_id"]]["comment_count"] = row["n"]
+    reports = (
+        Report.objects.filter(project_id__in=ids)
+        .values("project_id")
+        .annotate(total=Count("id"), open=Count("id", filter=Q(status__in=OPEN_STATUSES)))
+        .order_by()
+    )
+    for row in reports:
+        expected[row["project_id"]].update(report_count=row["total"], open_report_count=row["open"])
+    views = (
+        ProjectViewDaily.objects.filter(project_id__in=ids)
+        .values("project_id")
+        .annotate(total=Sum("count"), recent=Sum("count", filter=Q(day__gte=window_start())))
+        .order_by()
+    )
+    for row in views:
+        expected[row["project_id"]].update(view_count=row["total"], views_7d=row["recent"] or 0)
+    return expected
+
+
+def reconcile(batch_size: int = 1000, dry_run: bool = False) -> tuple[int, int]:
+    """Recompute all counters from source tables; return ``(checked, repaired)``.
+
+    Each batch locks its project rows first, so signal updates for the same
+    projects wait and are applied on top of the recomputed values.
+    """
+    checked = repaired = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            projects = list(
+                Project.objects.select_for_update()
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", *COUNTER_FIELDS)[:batch_size]
+            )
+            if not projects:
+                break
+            last_id = projects[-1].id
+            expected = _expected([p.id for p in projects])
+            drifted = []
+            for project in projects:
+                values = expected[project.id]
+                if any(getattr(project, f) != values[f] for f in COUNTER_FIELDS):
+                    for field, value in values.items():
+                        setattr(project, field, value)
+                    drifted.append(project)
+            if drifted and not dry_run:
+                Project.objects.bulk_update(drifted, COUNTER_FIELDS)
+        checked += len(projects)
+        repaired += len(drifted)
+    return checked, repaired
@@ -0,0 +1,188 @@
+"""Constant-memory exports of projects, reports and comments.
+
+Rows are read with ``.values_list().iterator(chunk_size=...)`` (a server-side
+cursor on Postgres) and encoded incrementally, so memory use does not grow
+with the size of the dump. Output is a stream of ``bytes`` chunks suitable for
+``StreamingHttpResponse`` or writing to a file.
+"""
+import csv
+import io
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from feedback.models import Comment
+from reports.models import Report
+from .filters import filter_projects
+from .models import Project
+
+FORMATS = ("csv", "ndjson", "parquet")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+CHUNK_SIZE = 2000
+# Text output is yielded once this many bytes have been encoded.
+FLUSH_BYTES = 1 << 16
+
+# (column, type) per dataset; types drive the Parquet schema.
+COLUMNS = {
+    "projects": (
+        ("id", "int"), ("external_id", "str"), ("title", "str"), ("description", "str"),
+        ("county", "str"), ("status", "str"), ("budget", "decimal"), ("spent_amount", "decimal"),
+        ("progress", "int"), ("latitude", "coord"), ("longitude", "coord"),
+        ("start_date", "date"), ("end_date", "date"), ("comment_count", "int"),
+        ("report_count", "int"), ("open_report_count", "int"), ("view_count", "int"),
+        ("created_at", "datetime"), ("updated_at", "datetime"),
+    ),
+    "reports": (
+        ("id", "int"), ("project_id", "int"), ("user_username", "str"), ("category", "str"),
+        ("status", "str"), ("description", "str"), ("created_at", "datetime"), ("updated_at", "datetime"),
+    ),
+    "comments": (
+        ("id", "int"), ("project_id", "int"), ("user_username", "str"), ("body", "str"),
+        ("created_at", "datetime"),
+    ),
+}
+DATASETS = tuple(COLUMNS)
+
+
+def export_queryset(dataset: str, params):
+    """Rows of ``dataset`` as tuples, for projects matching the list filters."""
+    projects = filter_projects(Project.objects.all(), params)
+    if dataset == "projects":
+        qs = projects
+    else:
+        model = Report if dataset == "reports" else Comment
+        qs = model.objects.filter(project__in=projects.values("id")).annotate(
+            user_username=F("user__username")
+        )
+    names = [name for name, _ in COLUMNS[dataset]]
+    return qs.order_by("id").values_list(*names).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    # ISO 8601 dates/timestamps, matching the NDJSON and API output.
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _csv_chunks(dataset, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([name for name, _ in COLUMNS[dataset]])
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buf.tell() >= FLUSH_BYTES:
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode()
+
+
+def _ndjson_chunks(dataset, rows):
+    names = [name for name, _ in COLUMNS[dataset]]
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    parts, size = [], 0
+    for row in rows:
+        line = encoder.encode(dict(zip(names, row))) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(parts).encode()
+            parts, size = [], 0
+    yield "".join(parts).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since last drained."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet_schema(pa, dataset):
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "decimal": pa.decimal128(14, 2),
+        "coord": pa.decimal128(9, 6),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS[dataset]])
+
+
+def _parquet_chunks(dataset, rows):
+    # Optional dependency; checked up front by check_format().
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa, dataset)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            # One row group per chunk keeps memory bounded by CHUNK_SIZE rows.
+            writer.write_table(pa.Table.from_pylist([dict(zip(schema.names, r)) for r in batch], schema=schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(pa.Table.from_pylist([dict(zip(schema.names, r)) for r in batch], schema=schema))
+    writer.close()
+    yield sink.drain()
+
+
+def check_format(fmt: str) -> str | None:
+    """Return an error message if ``fmt`` cannot be produced here."""
+    if fmt not in FORMATS:
+        return f"Must be one of: {', '.join(FORMATS)}."
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return "Parquet export requires the optional 'pyarrow' package."
+    return None
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(dataset: str, fmt: str, params, compress: bool = False):
+    """Yield the encoded export as ``bytes`` chunks."""
+    rows = export_queryset(dataset, params)
+    encode = {"csv": _csv_chunks, "ndjson": _ndjson_chunks, "parquet": _parquet_chunks}[fmt]
+    chunks = (chunk for chunk in encode(dataset, rows) if chunk)
+    return _gzip(chunks) if compress else chunks
+
+
+def filename(dataset: str, fmt: str, compress: bool = False) -> str:
+    return f"{dataset}.{fmt}" + (".gz" if compress else "")
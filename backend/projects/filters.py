@@ -0,0 +1,102 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .models import Project
+
+# Orderings exposed on the list endpoint. Only non-null columns are allowed so
+# cursor positions are always comparable; each one is backed by an index.
+ORDERING_FIELDS = (
+    "created_at", "updated_at", "title", "progress",
+    "comment_count", "open_report_count", "view_count", "views_7d",
+)
+DEFAULT_ORDERING = "-created_at"
+
+
+def _parse_decimal(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return Decimal(raw)
+    except (InvalidOperation, ValueError):
+        raise ValidationError({name: "Must be a number."})
+
+
+def _parse_int(params, name, low=None, high=None):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be an integer."})
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ValidationError({name: f"Must be between {low} and {high}."})
+    return value
+
+
+def _parse_date(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = parse_date(raw)
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Must be a date (YYYY-MM-DD)."})
+    return value
+
+
+def get_ordering(params) -> tuple[str, str]:
+    """Return the validated ordering for a request, with `id` as tie-breaker."""
+    raw = (params.get("ordering") or DEFAULT_ORDERING).strip()
+    field = raw.lstrip("-")
+    if field not in ORDERING_FIELDS:
+        raise ValidationError({"ordering": f"Must be one of: {', '.join(ORDERING_FIELDS)}."})
+    prefix = "-" if raw.startswith("-") else ""
+    return (f"{prefix}{field}", f"{prefix}id")
+
+
+def filter_projects(queryset, params):
+    """Apply the project list query params to a queryset.
+
+    Supported params: q, status (comma separated), county, budget_min/max,
+    progress_min/max, start_date_from/to and end_date_from/to.
+    """
+    q = (params.get("q") or "").strip()
+    if q:
+        queryset = queryset.filter(
+            Q(title__icontains=q) | Q(description__icontains=q) | Q(county__icontains=q)
+        )
+
+    status = params.get("status")
+    if status and status.upper() != "ALL":
+        statuses = {s.strip().upper() for s in status.split(",") if s.strip()}
+        invalid = statuses - set(Project.Status.values)
+        if invalid:
+            raise ValidationError({"status": f"Unknown status: {', '.join(sorted(invalid))}."})
+        queryset = queryset.filter(status__in=statuses)
+
+    county = (params.get("county") or "").strip()
+    if county and county.upper() != "ALL":
+        queryset = queryset.filter(county=county)
+
+    ranges = {
+        "budget__gte": _parse_decimal(params, "budget_min"),
+        "budget__lte": _parse_decimal(params, "budget_max"),
+        "progress__gte": _parse_int(params, "progress_min", 0, 100),
+        "progress__lte": _parse_int(params, "progress_max", 0, 100),
+        "start_date__gte": _parse_date(params, "start_date_from"),
+        "start_date__lte": _parse_date(params, "start_date_to"),
+        "end_date__gte": _parse_date(params, "end_date_from"),
+        "end_date__lte": _parse_date(params, "end_date_to"),
+    }
+    lookups = {k: v for k, v in ranges.items() if v is not None}
+    if lookups:
+        queryset = queryset.filter(**lookups)
+
+    return queryset
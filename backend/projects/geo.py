@@ -0,0 +1,152 @@
+"""Bounding-box/nearby queries and server-side marker clustering for the map."""
+import math
+from decimal import Decimal
+
+from django.db.models import Avg, Count, F, Min, Q
+from django.db.models.functions import Floor
+from rest_framework.exceptions import ValidationError
+
+from . import geohash
+from .models import Project
+
+MIN_ZOOM = 0
+MAX_ZOOM = 20
+# At or above this zoom individual markers are returned instead of clusters.
+POINT_ZOOM = 12
+MAX_POINTS = 2000
+# Grid cells per 256px map tile edge (~64px cells).
+CELLS_PER_TILE = 4
+# Upper bound on geohash ranges OR-ed together for one area query.
+MAX_COVER_CELLS = 16
+
+
+def parse_bbox(raw: str | None):
+    """Parse ``west,south,east,north`` into Decimals."""
+    if not raw:
+        raise ValidationError({"bbox": "Required as west,south,east,north."})
+    try:
+        west, south, east, north = (Decimal(part) for part in raw.split(","))
+    except Exception:
+        raise ValidationError({"bbox": "Must be four numbers: west,south,east,north."})
+    if not (-180 <= west < east <= 180 and -90 <= south < north <= 90):
+        raise ValidationError({"bbox": "Coordinates out of range or west/south not below east/north."})
+    return west, south, east, north
+
+
+def parse_zoom(raw: str | None) -> int:
+    try:
+        zoom = int(raw)
+    except (TypeError, ValueError):
+        raise ValidationError({"zoom": "Must be an integer."})
+    if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+        raise ValidationError({"zoom": f"Must be between {MIN_ZOOM} and {MAX_ZOOM}."})
+    return zoom
+
+
+def cell_size(zoom: int) -> Decimal:
+    return Decimal(360) / (Decimal(2) ** zoom) / CELLS_PER_TILE
+
+
+def _prefix_ranges(prefixes) -> Q:
+    # Each prefix becomes ``>= prefix AND < next_prefix`` so the plain B-tree
+    # index on ``geohash`` is used on every backend and collation.
+    cond = Q()
+    for prefix in sorted(prefixes):
+        upper = geohash.next_prefix(prefix)
+        cond |= Q(geohash__gte=prefix, geohash__lt=upper) if upper else Q(geohash__gte=prefix)
+    return cond
+
+
+def geohash_ranges(south, west, north, east, max_cells=MAX_COVER_CELLS):
+    """Q matching geohash cells that cover the box, or None if too coarse."""
+    precision = geohash.covering_precision(south, west, north, east, max_cells)
+    if precision is None:
+        return None
+    return _prefix_ranges(geohash.covering(south, west, north, east, precision))
+
+
+def in_bbox(queryset, bbox):
+    west, south, east, north = bbox
+    queryset = queryset.filter(
+        latitude__gte=south, latitude__lte=north,
+        longitude__gte=west, longitude__lte=east,
+    )
+    cover = geohash_ranges(float(south), float(west), float(north), float(east))
+    return queryset.filter(cover) if cover is not None else queryset
+
+
+def nearby(queryset, lat: float, lng: float, radius_km: float, limit: int) -> list[dict]:
+    """Projects within ``radius_km`` of a point, nearest first."""
+    precision = geohash.radius_precision(radius_km, lat)
+    dlat = math.degrees(radius_km / geohash.EARTH_RADIUS_KM)
+    dlng = dlat / max(math.cos(math.radians(lat)), 0.01)
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    west, east = max(lng - dlng, -180.0), min(lng + dlng, 180.0)
+
+    cond = _prefix_ranges(geohash.covering(south, west, north, east, precision))
+    rows = queryset.filter(cond).filter(
+        latitude__gte=south, latitude__lte=north,
+        longitude__gte=west, longitude__lte=east,
+    ).values("id", "title", "status", "county", "latitude", "longitude")
+
+    results = []
+    for row in rows:
+        distance = geohash.haversine_km(lat, lng, float(row["latitude"]), float(row["longitude"]))
+        if distance <= radius_km:
+            row["distance_km"] = round(distance, 3)
+            results.append(row)
+    results.sort(key=lambda row: (row["distance_km"], row["id"]))
+    return results[:limit]
+
+
+def cluster(queryset, zoom: int) -> list[dict]:
+    """Group projects into grid cells anchored at (-180, -90).
+
+    Anchoring the grid globally (rather than at the viewport corner) keeps
+    clusters stable while panning, so repeated viewports produce identical
+    payloads.
+    """
+    size = cell_size(zoom)
+    status_counts = {
+        f"_status_{value}": Count("id", filter=Q(status=value)) for value in Project.Status.values
+    }
+    rows = (
+        queryset.annotate(
+            cx=Floor((F("longitude") + 180) / size),
+            cy=Floor((F("latitude") + 90) / size),
+        )
+        .values("cx", "cy")
+        .annotate(
+            count=Count("id"),
+            lat=Avg("latitude"),
+            lng=Avg("longitude"),
+            project_id=Min("id"),
+            **status_counts,
+        )
+        .order_by("cy", "cx")
+    )
+
+    clusters = []
+    for row in rows:
+        item = {
+            "lat": round(float(row["lat"]), 6),
+            "lng": round(float(row["lng"]), 6),
+            "count": row["count"],
+            "statuses": {
+                value: row[f"_status_{value}"]
+                for value in Project.Status.values
+                if row[f"_status_{value}"]
+            },
+        }
+        # Singletons carry their id so the client can link straight to them.
+        if row["count"] == 1:
+            item["id"] = row["project_id"]
+        clusters.append(item)
+    return clusters
+
+
+def points(queryset) -> tuple[list[dict], bool]:
+    rows = list(
+        queryset.order_by("id").values("id", "title", "status", "latitude", "longitude")[: MAX_POINTS + 1]
+    )
+    return rows[:MAX_POINTS], len(rows) > MAX_POINTS
@@ -0,0 +1,126 @@
+"""Minimal geohash encoding plus helpers for turning areas into index ranges.
+
+Projects store a precision-9 geohash (~5m cells) in an indexed column. Any
+shorter prefix identifies an enclosing cell, so area queries become a handful
+of B-tree range scans: ``prefix <= geohash < next_prefix(prefix)``.
+"""
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+
+_DECODE = {ch: i for i, ch in enumerate(BASE32)}
+# Approximate cell size (height km, width km at the equator) per precision.
+_CELL_KM = {
+    1: (4992.6, 5009.4), 2: (624.1, 1252.3), 3: (156.0, 156.5), 4: (19.5, 39.1),
+    5: (4.89, 4.89), 6: (0.61, 1.22), 7: (0.153, 0.153), 8: (0.019, 0.038),
+}
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits, lng_lo = (bits << 1) | 1, mid
+            else:
+                bits, lng_hi = bits << 1, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits, lat_lo = (bits << 1) | 1, mid
+            else:
+                bits, lat_hi = bits << 1, mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def bounds(code: str) -> tuple[float, float, float, float]:
+    """Return ``(south, west, north, east)`` of a geohash cell."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for ch in code:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                lng_lo, lng_hi = (mid, lng_hi) if bit else (lng_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lat_lo, lng_lo, lat_hi, lng_hi
+
+
+def covering(south: float, west: float, north: float, east: float, precision: int) -> set[str]:
+    """All cells of ``precision`` intersecting the box."""
+    lat_step = 180.0 / 2 ** ((5 * precision) // 2)
+    lng_step = 360.0 / 2 ** ((5 * precision + 1) // 2)
+    cells = set()
+    lat = max(-90.0, south)
+    while True:
+        lng = max(-180.0, west)
+        while True:
+            cells.add(encode(min(lat, 89.999999), min(lng, 179.999999), precision))
+            if lng >= east:
+                break
+            lng = min(lng + lng_step, east)
+        if lat >= north:
+            break
+        lat = min(lat + lat_step, north)
+    return cells
+
+
+def covering_precision(south, west, north, east, max_cells: int) -> int | None:
+    """Finest precision whose covering of the box has at most ``max_cells`` cells."""
+    best = None
+    for precision in range(1, PRECISION):
+        lat_step = 180.0 / 2 ** ((5 * precision) // 2)
+        lng_step = 360.0 / 2 ** ((5 * precision + 1) // 2)
+        estimate = (math.floor((north - south) / lat_step) + 2) * (math.floor((east - west) / lng_step) + 2)
+        if estimate > max_cells:
+            break
+        best = precision
+    return best
+
+
+def radius_precision(radius_km: float, lat: float) -> int:
+    """Finest precision whose cells are at least ``radius_km`` on each side.
+
+    The 3x3 block of such cells around a point then contains the whole circle.
+    """
+    shrink = max(math.cos(math.radians(lat)), 0.01)
+    best = 1
+    for precision, (height, width) in sorted(_CELL_KM.items()):
+        if height >= radius_km and width * shrink >= radius_km:
+            best = precision
+    return best
+
+
+def next_prefix(prefix: str) -> str | None:
+    """Smallest string greater than every string starting with ``prefix``."""
+    chars = list(prefix)
+    while chars:
+        index = _DECODE[chars[-1]]
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,309 @@
+"""Streaming bulk import of project datasets (CSV, JSON array or NDJSON).
+
+Rows are parsed one at a time, validated, and upserted in batches with
+``bulk_create(update_conflicts=True)`` keyed on ``Project.external_id``, so
+re-importing a dataset updates rows in place instead of duplicating them.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from analytics.project_ids import project_ids
+from config.http_cache import bump_version
+from .budget import invalidate_budget_summary
+from .models import Project
+
+FORMATS = ("csv", "json", "ndjson")
+IMPORT_FIELDS = (
+    "title", "description", "county", "status", "budget", "spent_amount",
+    "progress", "latitude", "longitude", "start_date", "end_date",
+)
+DEFAULT_BATCH_SIZE = 1000
+# Errors kept in the report; the total is always counted.
+MAX_REPORTED_ERRORS = 1000
+# Upper bound (exclusive) of a DecimalField(max_digits=14, decimal_places=2).
+MAX_AMOUNT = Decimal("1e12")
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole could not be parsed."""
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self, max_errors: int = 100) -> dict:
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors[:max_errors],
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def detect_format(filename: str) -> str | None:
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return {"csv": "csv", "json": "json", "ndjson": "ndjson", "jsonl": "ndjson"}.get(ext)
+
+
+def _iter_csv(fh):
+    reader = csv.DictReader(fh)
+    if not reader.fieldnames:
+        return
+    # Line numbers match the file, counting the header as line 1.
+    for index, row in enumerate(reader, start=2):
+        yield index, row
+
+
+def _iter_ndjson(fh):
+    for index, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield index, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield index, exc
+
+
+def _iter_json_array(fh, chunk_size=1 << 16):
+    """Yield the elements of a top-level JSON array without reading it whole."""
+    decoder = json.JSONDecoder()
+    buf, pos, index, eof = "", 0, 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    fill()
+    buf = buf.lstrip()
+    if not buf.startswith("["):
+        raise ImportFormatError("JSON input must be an array of objects.")
+    pos = 1
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ImportFormatError("Unexpected end of JSON array.")
+            fill()
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise ImportFormatError(f"Invalid JSON near element {index + 1}: {exc.msg}.")
+            fill()
+            continue
+        index += 1
+        pos = end
+        yield index, obj
+
+
+def iter_rows(fh, fmt: str):
+    """Yield ``(row_number, dict_or_exception)`` from a text stream."""
+    if fmt == "csv":
+        return _iter_csv(fh)
+    if fmt == "ndjson":
+        return _iter_ndjson(fh)
+    if fmt == "json":
+        return _iter_json_array(fh)
+    raise ImportFormatError(f"Unsupported format {fmt!r}; use one of: {', '.join(FORMATS)}.")
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _decimal(value, name, errors, low=None, high=None):
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        errors[name] = "Must be a number."
+        return None
+    if not number.is_finite() or (low is not None and number < low) or (high is not None and number > high):
+        errors[name] = f"Must be between {low} and {high}."
+        return None
+    return number
+
+
+def validate_row(raw) -> tuple[dict | None, dict]:
+    """Return ``(values, errors)`` for one input row."""
+    if not isinstance(raw, dict):
+        return None, {"row": "Must be an object."}
+    row = {key.strip(): _clean(value) for key, value in raw.items() if isinstance(key, str)}
+    errors = {}
+    values = {}
+
+    external_id = row.get("external_id")
+    if external_id is None:
+        errors["external_id"] = "Required."
+    elif len(str(external_id)) > 100:
+        errors["external_id"] = "At most 100 characters."
+    else:
+        values["external_id"] = str(external_id)
+
+    title = row.get("title")
+    if not title:
+        errors["title"] = "Required."
+    elif len(str(title)) > 200:
+        errors["title"] = "At most 200 characters."
+    else:
+        values["title"] = str(title)
+
+    for name in ("description", "county"):
+        if name in row:
+            values[name] = "" if row[name] is None else str(row[name])
+    if len(values.get("county", "")) > 100:
+        errors["county"] = "At most 100 characters."
+
+    if "status" in row:
+        status = str(row["status"] or Project.Status.PLANNED).upper()
+        if status not in Project.Status.values:
+            errors["status"] = f"Must be one of: {', '.join(Project.Status.values)}."
+        values["status"] = status
+
+    if "progress" in row:
+        progress = row["progress"]
+        if progress is None:
+            values["progress"] = 0
+        else:
+            try:
+                number = Decimal(str(progress))
+                if number != number.to_integral_value():
+                    raise ValueError
+                values["progress"] = int(number)
+            except (InvalidOperation, ValueError):
+                errors["progress"] = "Must be an integer."
+            else:
+                if not 0 <= values["progress"] <= 100:
+                    errors["progress"] = "Must be between 0 and 100."
+
+    for name in ("budget", "spent_amount"):
+        if name in row:
+            values[name] = None if row[name] is None else _decimal(
+                row[name], name, errors, Decimal(0), MAX_AMOUNT
+            )
+
+    for name, limit in (("latitude", 90), ("longitude", 180)):
+        if name in row:
+            values[name] = None if row[name] is None else _decimal(
+                row[name], name, errors, Decimal(-limit), Decimal(limit)
+            )
+    if (values.get("latitude") is None) != (values.get("longitude") is None):
+        errors.setdefault("latitude", "Latitude and longitude must be given together.")
+
+    for name in ("start_date", "end_date"):
+        if name in row:
+            raw_date = row[name]
+            if raw_date is None:
+                values[name] = None
+            elif isinstance(raw_date, date):
+                values[name] = raw_date
+            else:
+                try:
+                    values[name] = parse_date(str(raw_date))
+                except ValueError:
+                    values[name] = None
+                if values[name] is None:
+                    errors[name] = "Must be a date (YYYY-MM-DD)."
+    start, end = values.get("start_date"), values.get("end_date")
+    if start and end and end < start:
+        errors["end_date"] = "Must not be before start_date."
+
+    return (None, errors) if errors else (values, {})
+
+
+def _write_batch(batch: dict) -> int:
+    # One upsert per column set: a row that omits a column must leave the
+    # stored value alone, not overwrite it with the model default.
+    groups = {}
+    for values in batch.values():
+        groups.setdefault(frozenset(values), []).append(values)
+    with transaction.atomic():
+        for columns, rows in groups.items():
+            objs = []
+            for values in rows:
+                project = Project(**values)
+                project.geohash = project.compute_geohash()
+                objs.append(project)
+            update_fields = {"updated_at", *columns} - {"external_id"}
+            if {"latitude", "longitude"} & update_fields:
+                update_fields.add("geohash")
+            Project.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=sorted(update_fields),
+            )
+    return len(batch)
+
+
+def import_projects(fh, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False, progress=None):
+    """Validate and upsert every row of ``fh``; return an ``ImportReport``.
+
+    ``progress`` is called with the report after each batch is written.
+    """
+    report = ImportReport()
+    started = time.monotonic()
+    # Keyed by external_id: a repeated ID within one batch keeps its last row,
+    # since one upsert statement cannot touch the same row twice.
+    batch = {}
+
+    def flush():
+        if batch and not dry_run:
+            report.imported += _write_batch(batch)
+        elif batch:
+            report.imported += len(batch)
+        batch.clear()
+        report.seconds = time.monotonic() - started
+        if progress:
+            progress(report)
+
+    for number, raw in iter_rows(fh, fmt):
+        report.rows += 1
+        if isinstance(raw, Exception):
+            values, errors = None, {"row": f"Invalid JSON: {raw}"}
+        else:
+            values, errors = validate_row(raw)
+        if errors:
+            report.failed += 1
+            if len(report.errors) < MAX_REPORTED_ERRORS:
+                report.errors.append({"row": number, "errors": errors})
+            continue
+        batch[values["external_id"]] = values
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    if report.imported and not dry_run:
+        invalidate_budget_summary()
+        bump_version("projects")
+        project_ids.clear()
+    report.seconds = time.monotonic() - started
+    return report
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from projects import export
+from projects.filters import filter_projects
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Stream projects, reports or comments to a CSV, NDJSON or Parquet file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dataset", choices=export.DATASETS, default="projects")
+        parser.add_argument("--format", choices=export.FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("-o", "--output", default="-", help="Output path (default: stdout).")
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="Project list filter, e.g. --filter status=ONGOING --filter county=Nairobi.",
+        )
+
+    def handle(self, *args, **options):
+        error = export.check_format(options["format"])
+        if error:
+            raise CommandError(error)
+        params = {}
+        for item in options["filter"]:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"Invalid --filter {item!r}; expected KEY=VALUE.")
+            params[key] = value
+        try:
+            filter_projects(Project.objects.none(), params)
+        except ValidationError as exc:
+            raise CommandError("Invalid filters: " + "; ".join(f"{k}: {v}" for k, v in exc.detail.items()))
+
+        chunks = export.export_chunks(options["dataset"], options["format"], params, compress=options["gzip"])
+        size = 0
+        if options["output"] == "-":
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+                size += len(chunk)
+            out.flush()
+            return
+        with open(options["output"], "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['dataset']} to {options['output']} ({size} bytes)"))
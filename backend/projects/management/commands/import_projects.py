@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.importer import DEFAULT_BATCH_SIZE, FORMATS, ImportFormatError, detect_format, import_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a CSV, JSON array or NDJSON file of projects into the database, "
+        "upserting on external_id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, default=None, help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; write nothing.")
+        parser.add_argument("--max-errors", type=int, default=20, help="Row errors to print.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        def progress(report):
+            self.stdout.write(
+                f"{report.rows} rows, {report.imported} upserted, {report.failed} failed "
+                f"({report.rows_per_second:.0f} rows/s)"
+            )
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as fh:
+                report = import_projects(
+                    fh, fmt, batch_size=options["batch_size"], dry_run=options["dry_run"], progress=progress
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except ImportFormatError as exc:
+            raise CommandError(f"Could not parse {path}: {exc}")
+
+        for error in report.errors[: options["max_errors"]]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report.failed > options["max_errors"]:
+            self.stderr.write(f"... and {report.failed - options['max_errors']} more row errors")
+
+        verb = "Validated" if options["dry_run"] else "Upserted"
+        self.stdout.write(self.style.SUCCESS(
+            f"Import complete. Rows: {report.rows}, {verb}: {report.imported}, Failed: {report.failed}, "
+            f"Time: {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/s)"
+        ))
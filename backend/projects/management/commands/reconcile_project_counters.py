@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from projects import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized comment/report/view counters on Project from "
+        "source tables and repair any drift. Run daily to roll the 7-day view window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many projects have drifted without writing.",
+        )
+
+    def handle(self, *args, **options):
+        checked, repaired = counters.reconcile(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        verb = "Would repair" if options["dry_run"] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked: {checked}, {verb}: {repaired}"))
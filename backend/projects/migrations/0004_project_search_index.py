@@ -0,0 +1,101 @@
+from django.db import migrations
+
+# Inlined rather than imported from projects.search so later changes to the
+# app code can't alter what this migration does.
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE projects_project ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(county, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS project_search_vector_idx ON projects_project USING GIN (search_vector)",
+]
+POSTGRES_REMOVE = [
+    "DROP INDEX IF EXISTS project_search_vector_idx",
+    "ALTER TABLE projects_project DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_project_fts USING fts5(
+        title, county, description,
+        content='projects_project', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_project_fts_ai AFTER INSERT ON projects_project BEGIN
+        INSERT INTO projects_project_fts(rowid, title, county, description)
+        VALUES (new.id, new.title, new.county, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_project_fts_ad AFTER DELETE ON projects_project BEGIN
+        INSERT INTO projects_project_fts(projects_project_fts, rowid, title, county, description)
+        VALUES ('delete', old.id, old.title, old.county, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_project_fts_au AFTER UPDATE OF title, county, description
+    ON projects_project BEGIN
+        INSERT INTO projects_project_fts(projects_project_fts, rowid, title, county, description)
+        VALUES ('delete', old.id, old.title, old.county, old.description);
+        INSERT INTO projects_project_fts(rowid, title, county, description)
+        VALUES (new.id, new.title, new.county, new.description);
+    END
+    """,
+    "INSERT INTO projects_project_fts(projects_project_fts) VALUES ('rebuild')",
+]
+SQLITE_REMOVE = [
+    "DROP TRIGGER IF EXISTS projects_project_fts_ai",
+    "DROP TRIGGER IF EXISTS projects_project_fts_ad",
+    "DROP TRIGGER IF EXISTS projects_project_fts_au",
+    "DROP TABLE IF EXISTS projects_project_fts",
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if cursor.fetchone()[0]:
+            return True
+        # Builds that load FTS5 as a default extension don't report the option.
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp._fts5_probe")
+        except Exception:
+            return False
+        return True
+
+
+def run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql, params=None)
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        run(schema_editor, POSTGRES_INSTALL)
+    elif vendor == "sqlite" and sqlite_has_fts5(schema_editor.connection):
+        run(schema_editor, SQLITE_INSTALL)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        run(schema_editor, POSTGRES_REMOVE)
+    elif vendor == "sqlite":
+        run(schema_editor, SQLITE_REMOVE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0003_project_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+# Frozen copy of projects.geohash.encode at precision 9, so this migration
+# doesn't change if the app code does.
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+
+
+def encode_geohash(lat, lng):
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < PRECISION:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits, lng_lo = (bits << 1) | 1, mid
+            else:
+                bits, lng_hi = bits << 1, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits, lat_lo = (bits << 1) | 1, mid
+            else:
+                bits, lat_hi = bits << 1, mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    qs = Project.objects.exclude(latitude__isnull=True).exclude(longitude__isnull=True)
+    batch = []
+    for project in qs.only("id", "latitude", "longitude").iterator(chunk_size=2000):
+        project.geohash = encode_geohash(float(project.latitude), float(project.longitude))
+        batch.append(project)
+        if len(batch) >= 2000:
+            Project.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        Project.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_spent_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['latitude', 'longitude'], name='project_lat_lng_idx'),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:46
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def _per_project(queryset, aggregate):
+    rows = queryset.filter(project=OuterRef("pk")).order_by().values("project").annotate(n=aggregate).values("n")
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Comment = apps.get_model("feedback", "Comment")
+    Report = apps.get_model("reports", "Report")
+    ProjectViewDaily = apps.get_model("analytics", "ProjectViewDaily")
+    since = timezone.localdate() - timedelta(days=6)
+    Project.objects.update(
+        comment_count=_per_project(Comment.objects.all(), Count("id")),
+        report_count=_per_project(Report.objects.all(), Count("id")),
+        open_report_count=_per_project(
+            Report.objects.filter(status__in=["OPEN", "IN_REVIEW"]), Count("id")
+        ),
+        view_count=_per_project(ProjectViewDaily.objects.all(), Sum("count")),
+        views_7d=_per_project(ProjectViewDaily.objects.filter(day__gte=since), Sum("count")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_geohash'),
+        ('feedback', '0002_thread_indexes'),
+        ('reports', '0002_thread_indexes'),
+        ('analytics', '0003_event_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='open_report_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='report_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='views_7d',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-comment_count', '-id'], name='project_comment_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-open_report_count', '-id'], name='project_open_reports_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-view_count', '-id'], name='project_view_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-views_7d', '-id'], name='project_views_7d_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
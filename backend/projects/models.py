@@ -1,5 +1,11 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
+
+from . import geohash
+
+# Denormalized engagement counters, maintained by projects.counters.
+COUNTER_FIELDS = ("comment_count", "report_count", "open_report_count", "view_count", "views_7d")
+
 
 class Project(models.Model):
     class Status(models.TextChoices):
@@ -8,6 +14,8 @@ class Project(models.Model):
         COMPLETED = "COMPLETED", "Completed"
         STALLED = "STALLED", "Stalled"
 
+    # Stable ID from the source dataset; bulk imports upsert on it.
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
 
@@ -15,6 +23,7 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PLANNED)
 
     budget = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    spent_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     progress = models.PositiveSmallIntegerField(
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(100)],
@@ -22,12 +31,70 @@ class Project(models.Model):
 
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Derived from latitude/longitude on save; backs area and nearby queries.
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False, db_index=True)
 
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
 
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    report_count = models.PositiveIntegerField(default=0, editable=False)
+    # Reports still OPEN or IN_REVIEW.
+    open_report_count = models.PositiveIntegerField(default=0, editable=False)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    views_7d = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="project_created_idx"),
+            models.Index(fields=["-updated_at", "-id"], name="project_updated_idx"),
+            models.Index(fields=["status", "-created_at"], name="project_status_created_idx"),
+            models.Index(fields=["county", "-created_at"], name="project_county_created_idx"),
+            models.Index(fields=["title"], name="project_title_idx"),
+            models.Index(fields=["progress"], name="project_progress_idx"),
+            models.Index(fields=["budget"], name="project_budget_idx"),
+            models.Index(fields=["start_date"], name="project_start_date_idx"),
+            models.Index(fields=["end_date"], name="project_end_date_idx"),
+            models.Index(fields=["latitude", "longitude"], name="project_lat_lng_idx"),
+            models.Index(fields=["-comment_count", "-id"], name="project_comment_count_idx"),
+            models.Index(fields=["-open_report_count", "-id"], name="project_open_reports_idx"),
+            models.Index(fields=["-view_count", "-id"], name="project_view_count_idx"),
+            models.Index(fields=["-views_7d", "-id"], name="project_views_7d_idx"),
+        ]
+
     def __str__(self):
         return self.title
+
+    def compute_geohash(self) -> str:
+        if self.latitude is None or self.longitude is None:
+            return ""
+        return geohash.encode(float(self.latitude), float(self.longitude))
+
+    def save(self, *args, **kwargs):
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        elif update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # Counters are only changed through F() updates; writing back the
+            # values loaded with this instance would undo concurrent increments.
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in COUNTER_FIELDS
+            ]
+            using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+            try:
+                # In a savepoint, so a miss doesn't break an outer transaction.
+                with transaction.atomic(using=using):
+                    return super().save(*args, **kwargs)
+            except DatabaseError as exc:
+                # Django raises a bare DatabaseError when update_fields matched
+                # no row, i.e. it was deleted concurrently.
+                if type(exc) is not DatabaseError:
+                    raise
+            # Re-create the row like a plain save() would.
+            del kwargs["update_fields"]
+        super().save(*args, **kwargs)
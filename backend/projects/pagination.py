@@ -0,0 +1,14 @@
+from config.pagination import KeysetCursorPagination
+
+from .filters import get_ordering
+
+
+class ProjectCursorPagination(KeysetCursorPagination):
+    """Keyset pagination for the project list, honouring `?ordering=`."""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        return get_ordering(request.query_params)
@@ -8,3 +8,11 @@ class IsOfficialOrAdminForWrite(BasePermission):
         return user.is_authenticated and (
             getattr(user, "role", "") in {"ADMIN", "OFFICIAL"} or user.is_staff or user.is_superuser
         )
+
+
+class IsAdmin(BasePermission):
+    def has_permission(self, request, view):
+        user = request.user
+        return user.is_authenticated and (
+            getattr(user, "role", "") == "ADMIN" or user.is_staff or user.is_superuser
+        )
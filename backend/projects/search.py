@@ -0,0 +1,155 @@
+"""Ranked full-text search over projects.
+
+On Postgres the index is a generated, weighted ``tsvector`` column with a GIN
+index; on SQLite it is an external-content FTS5 table kept in sync by
+triggers. Both are maintained by the database itself, so every insert/update
+of a project is reflected immediately without a reindex job. Other backends
+(or SQLite builds without FTS5) fall back to unranked substring matching.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Project
+
+TABLE = Project._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_fts_tables: dict[str, bool] = {}
+
+# Installed by migration 0004; re-created here after SQLite table rebuilds.
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, county, description)
+        VALUES (new.id, new.title, new.county, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, county, description)
+        VALUES ('delete', old.id, old.title, old.county, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, county, description ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, county, description)
+        VALUES ('delete', old.id, old.title, old.county, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, county, description)
+        VALUES (new.id, new.title, new.county, new.description);
+    END
+    """,
+]
+
+
+def _run(connection, statements):
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def repair_sqlite_triggers(connection):
+    """Re-create the FTS triggers after SQLite table rebuilds.
+
+    SQLite migrations that alter ``projects_project`` copy it into a new table,
+    which silently drops triggers. Called from ``post_migrate``.
+    """
+    _fts_tables.pop(connection.alias, None)
+    if connection.vendor != "sqlite":
+        return
+    tables = connection.introspection.table_names()
+    if FTS_TABLE not in tables:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            [TABLE],
+        )
+        if cursor.fetchone()[0] == len(SQLITE_TRIGGERS):
+            return
+    _run(connection, [*SQLITE_TRIGGERS, f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"])
+
+
+def _sqlite_fts_ready(connection) -> bool:
+    if connection.alias not in _fts_tables:
+        _fts_tables[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[connection.alias]
+
+
+def search_terms(query: str) -> list[str]:
+    return _TOKEN_RE.findall((query or "").lower())[:MAX_TERMS]
+
+
+def _restrict(queryset, connection, column):
+    """SQL condition (and params) limiting ``column`` to the queryset's rows."""
+    if not queryset.query.has_filters():
+        return "", []
+    sql, params = queryset.order_by().values("id").query.get_compiler(connection=connection).as_sql()
+    return f"AND {column} IN ({sql})", list(params)
+
+
+def _search_postgres(connection, terms, limit, queryset):
+    # Every term is a prefix match so partially typed words still hit.
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    restrict, params = _restrict(queryset, connection, "id")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT id, ts_rank_cd(search_vector, query) AS rank
+            FROM {TABLE}, to_tsquery('simple', %s) AS query
+            WHERE search_vector @@ query {restrict}
+            ORDER BY rank DESC, id DESC
+            LIMIT %s
+            """,
+            [tsquery, *params, limit],
+        )
+        return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+
+def _search_sqlite(connection, terms, limit, queryset):
+    match = " AND ".join(f'"{term}"*' for term in terms)
+    restrict, params = _restrict(queryset, connection, "rowid")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT rowid, bm25({FTS_TABLE}, 10.0, 5.0, 1.0) AS rank
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s {restrict}
+            ORDER BY rank, rowid DESC
+            LIMIT %s
+            """,
+            [match, *params, limit],
+        )
+        # bm25() is "lower is better"; flip it so callers can sort descending.
+        return [(row[0], -float(row[1])) for row in cursor.fetchall()]
+
+
+def _search_fallback(terms, limit, queryset):
+    cond = Q()
+    for term in terms:
+        cond &= Q(title__icontains=term) | Q(county__icontains=term) | Q(description__icontains=term)
+    ids = queryset.filter(cond).order_by("-created_at").values_list("id", flat=True)[:limit]
+    return [(pk, 0.0) for pk in ids]
+
+
+def search_project_ids(query: str, limit: int = 50, queryset=None) -> list[tuple[int, float]]:
+    """Return ``(project_id, rank)`` pairs for ``query``, best match first.
+
+    Only projects in ``queryset`` (default: all) are ranked; its filters run in
+    the same SQL query, so ``limit`` counts matching projects only.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if queryset is None:
+        queryset = Project.objects.all()
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        return _search_postgres(connection, terms, limit, queryset)
+    if connection.vendor == "sqlite" and _sqlite_fts_ready(connection):
+        return _search_sqlite(connection, terms, limit, queryset)
+    return _search_fallback(terms, limit, queryset)
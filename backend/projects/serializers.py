@@ -1,7 +1,21 @@
 from rest_framework import serializers
 from .models import Project
 
+# Compact list representation (`?view=summary`): what list cards display.
+SUMMARY_FIELDS = (
+    "id", "title", "county", "status", "progress", "budget",
+    "comment_count", "open_report_count", "views_7d",
+)
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = "__all__"
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Optional sparse fieldset (see config.fastpath.parse_fieldset).
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
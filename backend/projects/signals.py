@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from config.activity import publish_on_commit
+from config.http_cache import bump_version
+from .budget import SUMMARY_FIELDS, invalidate_budget_summary
+from .models import Project
+from .serializers import ProjectSerializer
+
+_MISSING = object()
+# Changes to these are pushed to the project's activity stream.
+ACTIVITY_FIELDS = ("progress", "status", "spent_amount")
+
+
+@receiver(post_init, sender=Project)
+def snapshot_budget_fields(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields (.only()/.defer()) aren't fetched.
+    instance._budget_snapshot = tuple(instance.__dict__.get(f, _MISSING) for f in SUMMARY_FIELDS)
+    instance._activity_snapshot = tuple(instance.__dict__.get(f, _MISSING) for f in ACTIVITY_FIELDS)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_budget_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(SUMMARY_FIELDS):
+        return
+    current = tuple(instance.__dict__.get(f, _MISSING) for f in SUMMARY_FIELDS)
+    if created or current != getattr(instance, "_budget_snapshot", None):
+        invalidate_budget_summary()
+    instance._budget_snapshot = current
+
+
+@receiver(post_delete, sender=Project)
+def invalidate_budget_on_delete(sender, instance, **kwargs):
+    invalidate_budget_summary()
+
+
+@receiver([post_save, post_delete], sender=Project)
+def bump_projects_version(sender, **kwargs):
+    bump_version("projects")
+
+
+@receiver(post_save, sender=Project)
+def broadcast_progress(sender, instance, created, **kwargs):
+    current = tuple(instance.__dict__.get(f, _MISSING) for f in ACTIVITY_FIELDS)
+    if not created and current != instance._activity_snapshot:
+        payload = ProjectSerializer(instance, fields=["id", *ACTIVITY_FIELDS, "updated_at"]).data
+        publish_on_commit(instance.pk, "project", payload)
+    instance._activity_snapshot = current
@@ -1,3 +1,414 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.models import ProjectViewDaily
+from config.http_cache import BODY_PREFIX, VERSION_PREFIX, get_versions
+from feedback.models import Comment
+from reports.models import Report
+from . import counters
+from .importer import ImportFormatError, import_projects
+from .models import COUNTER_FIELDS, Project
+
+
+class HttpCacheTests(TestCase):
+    url = "/api/projects/map/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.project = Project.objects.create(title="Water works", latitude=-1.28, longitude=36.82)
+
+    def test_sets_etag_and_cache_control(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertEqual(response["Cache-Control"], "public, max-age=30")
+
+    def test_matching_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_stale_if_none_match_returns_body(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_serves_stored_body_without_querying(self):
+        first = self.client.get(self.url)
+        self.assertIsNotNone(cache.get(BODY_PREFIX + first["ETag"].strip('"')))
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_query_string_is_part_of_the_key(self):
+        plain = self.client.get(self.url)["ETag"]
+        filtered = self.client.get(self.url, {"status": "ONGOING"})["ETag"]
+        self.assertNotEqual(plain, filtered)
+
+    def test_write_bumps_version_only_on_commit(self):
+        etag = self.client.get(self.url)["ETag"]
+        before = get_versions(["projects"])["projects"]
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.project.title = "Sewer works"
+            self.project.save()
+            self.assertEqual(get_versions(["projects"])["projects"], before)
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        for callback in callbacks:
+            callback()
+
+        self.assertGreater(cache.get(VERSION_PREFIX + "projects"), before)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()[0]["title"], "Sewer works")
+
+    def test_uncommitted_write_keeps_version(self):
+        before = get_versions(["projects"])["projects"]
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Project.objects.create(title="Never committed")
+        self.assertTrue(callbacks)
+        self.assertEqual(get_versions(["projects"])["projects"], before)
+
+    def test_delete_invalidates(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="citizen", password="pw")
+        self.project = Project.objects.create(title="Clinic")
+
+    def counts(self):
+        return Project.objects.values(*COUNTER_FIELDS).get(pk=self.project.pk)
+
+    def report(self, **kwargs):
+        return Report.objects.create(project=self.project, user=self.user, description="x", **kwargs)
+
+    def test_comments_adjust_comment_count(self):
+        first = Comment.objects.create(project=self.project, user=self.user, body="a")
+        Comment.objects.create(project=self.project, user=self.user, body="b")
+        self.assertEqual(self.counts()["comment_count"], 2)
+        first.delete()
+        self.assertEqual(self.counts()["comment_count"], 1)
+
+    def test_reports_adjust_report_counts(self):
+        report = self.report()
+        self.report(status=Report.Status.RESOLVED)
+        self.assertEqual(self.counts()["report_count"], 2)
+        self.assertEqual(self.counts()["open_report_count"], 1)
+
+        report.status = Report.Status.IN_REVIEW
+        report.save()
+        self.assertEqual(self.counts()["open_report_count"], 1)
+        report.status = Report.Status.DISMISSED
+        report.save()
+        self.assertEqual(self.counts()["open_report_count"], 0)
+        report.status = Report.Status.OPEN
+        report.save()
+        self.assertEqual(self.counts()["open_report_count"], 1)
+
+        report.delete()
+        self.assertEqual(self.counts()["report_count"], 1)
+        self.assertEqual(self.counts()["open_report_count"], 0)
+
+    def test_decrement_stops_at_zero(self):
+        comment = Comment.objects.create(project=self.project, user=self.user, body="a")
+        Project.objects.filter(pk=self.project.pk).update(comment_count=0)
+        comment.delete()
+        self.assertEqual(self.counts()["comment_count"], 0)
+
+    def test_adjust_ignores_zero_deltas(self):
+        with self.assertNumQueries(0):
+            counters.adjust(self.project.pk, comment_count=0)
+
+    def test_add_views_counts_recent_views_in_window(self):
+        now = timezone.now()
+        counters.add_views([(self.project.pk, now), (self.project.pk, now - timedelta(days=30))])
+        self.assertEqual(self.counts()["view_count"], 2)
+        self.assertEqual(self.counts()["views_7d"], 1)
+
+    def test_save_keeps_concurrent_counter_updates(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        Comment.objects.create(project=self.project, user=self.user, body="a")
+        stale.title = "Clinic annex"
+        stale.save()
+        self.assertEqual(self.counts()["comment_count"], 1)
+        self.assertEqual(Project.objects.get(pk=self.project.pk).title, "Clinic annex")
+
+    def test_save_recreates_deleted_row(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        Project.objects.filter(pk=self.project.pk).delete()
+        stale.save()
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_reconcile_repairs_drift(self):
+        Comment.objects.create(project=self.project, user=self.user, body="a")
+        self.report()
+        ProjectViewDaily.objects.create(day=timezone.localdate(), project=self.project, count=3)
+        ProjectViewDaily.objects.create(
+            day=timezone.localdate() - timedelta(days=10), project=self.project, count=4
+        )
+        Project.objects.filter(pk=self.project.pk).update(
+            comment_count=9, report_count=0, open_report_count=5, view_count=0, views_7d=0
+        )
+        Project.objects.create(title="In sync")
+
+        self.assertEqual(counters.reconcile(batch_size=1), (2, 1))
+        self.assertEqual(self.counts(), {
+            "comment_count": 1, "report_count": 1, "open_report_count": 1, "view_count": 7, "views_7d": 3,
+        })
+        self.assertEqual(counters.reconcile(), (2, 0))
+
+    def test_reconcile_dry_run_writes_nothing(self):
+        Project.objects.filter(pk=self.project.pk).update(comment_count=4)
+        self.assertEqual(counters.reconcile(dry_run=True), (1, 1))
+        self.assertEqual(self.counts()["comment_count"], 4)
+
+    def test_reconcile_command(self):
+        Project.objects.filter(pk=self.project.pk).update(report_count=2)
+        out = StringIO()
+        call_command("reconcile_project_counters", stdout=out)
+        self.assertIn("Checked: 1, Repaired: 1", out.getvalue())
+        self.assertEqual(self.counts()["report_count"], 0)
+
+
+class ImporterTests(TestCase):
+    CSV = (
+        "external_id,title,county,status,budget,progress,latitude,longitude\n"
+        "A1,Road,Nairobi,ongoing,1000.50,40,-1.28,36.82\n"
+        "A2,Bridge,Kisumu,PLANNED,,0,,\n"
+    )
+
+    def test_csv_creates_rows(self):
+        report = import_projects(StringIO(self.CSV), "csv")
+        self.assertEqual((report.rows, report.imported, report.failed), (2, 2, 0))
+        road = Project.objects.get(external_id="A1")
+        self.assertEqual(road.status, Project.Status.ONGOING)
+        self.assertEqual(road.budget, Decimal("1000.50"))
+        self.assertTrue(road.geohash)
+        self.assertIsNone(Project.objects.get(external_id="A2").budget)
+
+    def test_reimport_updates_in_place_and_keeps_omitted_columns(self):
+        import_projects(StringIO(self.CSV), "csv")
+        road = Project.objects.get(external_id="A1")
+        report = import_projects(StringIO('{"external_id": "A1", "title": "Road phase 2", "progress": 75}\n'), "ndjson")
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(Project.objects.count(), 2)
+        road.refresh_from_db()
+        self.assertEqual((road.title, road.progress), ("Road phase 2", 75))
+        self.assertEqual(road.county, "Nairobi")
+        self.assertEqual(road.budget, Decimal("1000.50"))
+
+    def test_repeated_id_in_one_file_keeps_last_row(self):
+        rows = '[{"external_id": "B", "title": "First"}, {"external_id": "B", "title": "Last"}]'
+        report = import_projects(StringIO(rows), "json")
+        self.assertEqual(report.rows, 2)
+        self.assertEqual(Project.objects.get(external_id="B").title, "Last")
+
+    def test_dry_run_writes_nothing(self):
+        report = import_projects(StringIO(self.CSV), "csv", dry_run=True)
+        self.assertEqual((report.rows, report.imported, report.failed), (2, 2, 0))
+        self.assertFalse(Project.objects.exists())
+
+    def test_row_errors_are_reported_and_skipped(self):
+        rows = "\n".join([
+            '{"external_id": "C1", "title": "Good"}',
+            '{"external_id": "C2", "title": "Half", "progress": 12.5}',
+            '{"title": "No id", "progress": 101}',
+            '{"external_id": "C4", "title": "Dates", "start_date": "2024-05-01", "end_date": "2024-01-01"}',
+            '{"external_id": "C5", "title": "Point", "latitude": 1}',
+            "{not json",
+            '["not", "an", "object"]',
+        ])
+        report = import_projects(StringIO(rows), "ndjson")
+        self.assertEqual((report.rows, report.imported, report.failed), (7, 1, 6))
+        invalid_json = report.errors.pop(4)
+        self.assertEqual(invalid_json["row"], 6)
+        self.assertTrue(invalid_json["errors"]["row"].startswith("Invalid JSON"))
+        self.assertEqual(report.errors, [
+            {"row": 2, "errors": {"progress": "Must be an integer."}},
+            {"row": 3, "errors": {"external_id": "Required.", "progress": "Must be between 0 and 100."}},
+            {"row": 4, "errors": {"end_date": "Must not be before start_date."}},
+            {"row": 5, "errors": {"latitude": "Latitude and longitude must be given together."}},
+            {"row": 7, "errors": {"row": "Must be an object."}},
+        ])
+        self.assertEqual(list(Project.objects.values_list("external_id", flat=True)), ["C1"])
+
+    def test_csv_row_numbers_count_the_header(self):
+        report = import_projects(StringIO("external_id,title\nD1,\n"), "csv")
+        self.assertEqual(report.errors, [{"row": 2, "errors": {"title": "Required."}}])
+
+    def test_malformed_json_array_fails_whole_file(self):
+        with self.assertRaises(ImportFormatError):
+            import_projects(StringIO('{"external_id": "E"}'), "json")
+        with self.assertRaises(ImportFormatError):
+            import_projects(StringIO('[{"external_id": "E", "title": "x"}'), "json")
+        self.assertFalse(Project.objects.exists())
+
+
+class ImportEndpointTests(TestCase):
+    url = "/api/projects/import/"
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", password="pw", role=User.Role.ADMIN)
+        self.official = User.objects.create_user(username="official", password="pw", role=User.Role.OFFICIAL)
+
+    def upload(self, content, name="projects.csv", **data):
+        return self.client.post(
+            self.url, {"file": SimpleUploadedFile(name, content.encode()), **data}, format="multipart"
+        )
+
+    def test_requires_admin(self):
+        self.assertEqual(self.upload(ImporterTests.CSV).status_code, 401)
+        self.client.force_authenticate(self.official)
+        self.assertEqual(self.upload(ImporterTests.CSV).status_code, 403)
+
+    def test_imports_and_reports(self):
+        self.client.force_authenticate(self.admin)
+        response = self.upload(ImporterTests.CSV)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["imported"], 2)
+        self.assertEqual(Project.objects.count(), 2)
+
+    def test_dry_run_flag(self):
+        self.client.force_authenticate(self.admin)
+        response = self.upload(ImporterTests.CSV, dry_run="true")
+        self.assertEqual(response.json()["imported"], 2)
+        self.assertFalse(Project.objects.exists())
+
+    def test_rejects_unknown_format_and_bad_files(self):
+        self.client.force_authenticate(self.admin)
+        self.assertIn("format", self.upload("x", name="projects.xlsx").json())
+        self.assertIn("file", self.upload('{"a": 1}', name="projects.json").json())
+        self.assertIn("file", self.client.post(self.url, {}, format="multipart").json())
+
+
+class ProjectListPaginationTests(TestCase):
+    url = "/api/projects/"
+
+    @classmethod
+    def setUpTestData(cls):
+        statuses = Project.Status.values
+        Project.objects.bulk_create([
+            Project(
+                title=f"Project {i:03d}",
+                county="Nairobi" if i % 2 else "Mombasa",
+                status=statuses[i % len(statuses)],
+                progress=i % 5 * 25,
+                budget=i * 1000,
+                start_date=date(2024, 1, 1) + timedelta(days=i),
+            )
+            for i in range(120)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, **params):
+        """Follow `next` links and return every id in page order."""
+        page = self.get(**params)
+        self.assertIsNone(page["previous"])
+        ids = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.get(page["next"])
+            ids += [row["id"] for row in page["results"]]
+        return ids
+
+    def test_default_page_size_and_cap(self):
+        self.assertEqual(len(self.get()["results"]), 20)
+        self.assertEqual(len(self.get(page_size=5)["results"]), 5)
+        self.assertEqual(len(self.get(page_size=500)["results"]), 100)
+
+    def test_cursor_walk_visits_every_row_once(self):
+        ids = self.walk(page_size=25)
+        self.assertEqual(len(ids), 120)
+        self.assertEqual(len(set(ids)), 120)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_cursor_walk_with_duplicate_sort_values(self):
+        ids = self.walk(ordering="progress", page_size=7)
+        self.assertEqual(len(set(ids)), 120)
+        progress = dict(Project.objects.values_list("id", "progress"))
+        self.assertEqual(ids, sorted(ids, key=lambda pk: (progress[pk], pk)))
+
+    def test_insert_into_a_tie_does_not_repeat_rows(self):
+        first = self.get(ordering="-progress", page_size=10)
+        Project.objects.create(title="Newest", progress=100)
+        second = self.get(first["next"])
+        seen = {row["id"] for row in first["results"]}
+        self.assertFalse(seen & {row["id"] for row in second["results"]})
+        self.assertEqual(second["results"][0]["id"], first["results"][-1]["id"] - 5)
+
+    def test_cursor_walk_with_filters(self):
+        ids = self.walk(county="Nairobi", progress_min=50, page_size=10)
+        expected = Project.objects.filter(county="Nairobi", progress__gte=50)
+        self.assertEqual(set(ids), set(expected.values_list("id", flat=True)))
+        self.assertEqual(len(ids), expected.count())
+
+    def test_previous_link_returns_to_first_page(self):
+        first = self.get(page_size=10)
+        second = self.get(first["next"])
+        self.assertEqual(self.get(second["previous"])["results"], first["results"])
+
+    def test_invalid_ordering_and_cursor(self):
+        self.assertEqual(self.client.get(self.url, {"ordering": "budget"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"ordering": "-id;drop"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+    def test_status_filter(self):
+        ids = self.walk(status="ongoing,Completed")
+        self.assertEqual(
+            set(Project.objects.filter(id__in=ids).values_list("status", flat=True)),
+            {Project.Status.ONGOING, Project.Status.COMPLETED},
+        )
+        self.assertEqual(len(ids), 60)
+        self.assertEqual(len(self.walk(status="ALL")), 120)
+        response = self.client.get(self.url, {"status": "ONGOING,DONE"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("DONE", response.json()["status"])
+
+    def test_range_filters(self):
+        self.assertEqual(len(self.walk(progress_min=100)), 24)
+        self.assertEqual(len(self.walk(budget_min=10000, budget_max=19000)), 10)
+        self.assertEqual(len(self.walk(start_date_from="2024-01-01", start_date_to="2024-01-10")), 10)
+        self.assertEqual(self.walk(progress_min=100, progress_max=0), [])
 
-# Create your tests here.
+    def test_invalid_range_filters(self):
+        for params in (
+            {"progress_min": "101"},
+            {"progress_max": "-1"},
+            {"progress_min": "half"},
+            {"budget_min": "lots"},
+            {"start_date_from": "2024-13-01"},
+            {"end_date_to": "yesterday"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
@@ -1,7 +1,11 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet
+from .views import ProjectViewSet, project_activity
 
 router = DefaultRouter()
 router.register(r"projects", ProjectViewSet, basename="projects")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("projects/<int:pk>/activity/", project_activity),
+    *router.urls,
+]
@@ -1,19 +1,254 @@
+import io
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from analytics.tracking import track_project_view, track_search
+from config import activity
+from config.asyncviews import iterate_in_thread
+from config.fastpath import FastListMixin, RowSerializer, parse_fieldset
+from config.http_cache import cached_response
 from .models import Project
-from .serializers import ProjectSerializer
-from .permissions import IsOfficialOrAdminForWrite
+from .serializers import SUMMARY_FIELDS, ProjectSerializer
+from . import export
+from .bundle import build_bundle
+from .importer import FORMATS, ImportFormatError, detect_format, import_projects
+from .permissions import IsAdmin, IsOfficialOrAdminForWrite
+from .filters import filter_projects
+from .pagination import ProjectCursorPagination
+from .search import search_project_ids
+from . import geo
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+NEARBY_DEFAULT_RADIUS_KM = 5
+NEARBY_MAX_RADIUS_KM = 100
+NEARBY_MAX_LIMIT = 100
 
-class ProjectViewSet(viewsets.ModelViewSet):
+
+class ProjectViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all().order_by("-created_at")
     serializer_class = ProjectSerializer
+    row_serializer = RowSerializer(ProjectSerializer)
     permission_classes = [IsOfficialOrAdminForWrite]
+    pagination_class = ProjectCursorPagination
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action in ("list", "map"):
+            qs = filter_projects(qs, self.request.query_params)
+        elif self.action == "retrieve":
+            fields = self.get_fieldset()
+            if fields:
+                qs = qs.only(*fields)
+        return qs
+
+    def get_fieldset(self):
+        """Fields selected by `fields=`, `exclude=` or `view=summary`, or None for all."""
+        return parse_fieldset(
+            self.request.query_params,
+            self.row_serializer.field_names,
+            views={"summary": SUMMARY_FIELDS},
+        )
+
+    def get_row_serializer(self):
+        fields = self.get_fieldset()
+        return self.row_serializer.subset(fields) if fields else self.row_serializer
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "retrieve":
+            kwargs.setdefault("fields", self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    # View counters are bumped per analytics batch without a version bump;
+    # the bucket bounds how stale they can be.
+    @cached_response("projects", bucket_seconds=60)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response("projects", bucket_seconds=60)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get"])
+    def bundle(self, request, pk=None):
+        """Project, first pages of comments and reports, and counts in one response.
+
+        Also records a project view, including on 304 revalidations.
+        """
+        response = self._bundle(request, pk=pk)
+        if request.method == "GET" and response.status_code in (200, 304):
+            track_project_view(int(pk))
+        return response
+
+    @cached_response("projects", "comments", "reports", bucket_seconds=60)
+    def _bundle(self, request, pk=None):
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound()
+        payload = build_bundle(request, self.get_queryset(), project_id)
+        if payload is None:
+            raise NotFound()
+        return Response(payload)
 
     @action(detail=False, methods=["get"])
+    @cached_response("projects", max_age=30)
     def map(self, request):
-        # lightweight payload for markers
+        """Map markers.
+
+        With `bbox=west,south,east,north&zoom=N` returns grid clusters (or
+        individual points from zoom 12) for that viewport. Without `bbox`
+        returns every geolocated marker (legacy payload).
+        """
         qs = self.get_queryset().exclude(latitude__isnull=True).exclude(longitude__isnull=True)
-        data = qs.values("id", "title", "status", "latitude", "longitude")
-        return Response(list(data))
+        if "bbox" not in request.query_params:
+            # lightweight payload for markers
+            data = qs.values("id", "title", "status", "latitude", "longitude")
+            return Response(list(data))
+
+        bbox = geo.parse_bbox(request.query_params.get("bbox"))
+        zoom = geo.parse_zoom(request.query_params.get("zoom"))
+        qs = geo.in_bbox(qs.order_by(), bbox)
+
+        payload = {"bbox": [float(v) for v in bbox], "zoom": zoom}
+        if zoom >= geo.POINT_ZOOM:
+            points, truncated = geo.points(qs)
+            payload.update(mode="points", points=points, truncated=truncated)
+        else:
+            payload.update(mode="clusters", clusters=geo.cluster(qs, zoom))
+        return Response(payload)
+
+    @action(detail=False, methods=["get"])
+    @cached_response("projects", max_age=30)
+    def nearby(self, request):
+        """Projects within `radius` km of `lat`/`lng`, nearest first."""
+        params = request.query_params
+        try:
+            lat = float(params["lat"])
+            lng = float(params["lng"])
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError({"lat": "lat and lng are required numbers."})
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValidationError({"lat": "lat/lng out of range."})
+        try:
+            radius = float(params.get("radius", NEARBY_DEFAULT_RADIUS_KM))
+            limit = int(params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise ValidationError({"radius": "radius and limit must be numbers."})
+        if not 0 < radius <= NEARBY_MAX_RADIUS_KM:
+            raise ValidationError({"radius": f"Must be between 0 and {NEARBY_MAX_RADIUS_KM} km."})
+        limit = max(1, min(limit, NEARBY_MAX_LIMIT))
+
+        qs = filter_projects(Project.objects.order_by(), params)
+        results = geo.nearby(qs, lat, lng, radius, limit)
+        return Response({"lat": lat, "lng": lng, "radius": radius, "count": len(results), "results": results})
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranked full-text search; `?typeahead=1` skips logging partial input."""
+        q = (request.query_params.get("q") or "").strip()[:200]
+        if not q:
+            raise ValidationError({"q": "This query parameter is required."})
+
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise ValidationError({"limit": "Must be an integer."})
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+        params = request.query_params.copy()
+        params.pop("q", None)
+        ranked = search_project_ids(q, limit=limit, queryset=filter_projects(Project.objects.all(), params))
+        ranks = dict(ranked)
+        projects = Project.objects.in_bulk(ranks)
+        items = [projects[pk] for pk, _ in ranked if pk in projects]
+
+        if request.query_params.get("typeahead") not in ("1", "true"):
+            track_search(q)
+
+        data = ProjectSerializer(items, many=True).data
+        for row, project in zip(data, items):
+            row["rank"] = ranks[project.id]
+        return Response({"query": q, "count": len(data), "results": data})
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAdmin],
+        parser_classes=[MultiPartParser],
+    )
+    def import_file(self, request):
+        """Upsert projects from an uploaded CSV/JSON/NDJSON `file` (admin only).
+
+        Rows are keyed on `external_id`; `dry_run=1` validates without writing.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Required."})
+        fmt = request.data.get("format") or detect_format(upload.name)
+        if fmt not in FORMATS:
+            raise ValidationError({"format": f"Must be one of: {', '.join(FORMATS)}."})
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true")
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_projects(stream, fmt, dry_run=dry_run)
+        except (ImportFormatError, UnicodeDecodeError) as exc:
+            raise ValidationError({"file": str(exc)})
+        finally:
+            stream.detach()
+        return Response(report.as_dict())
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def export(self, request):
+        """Stream every matching row as `file_format=csv|ndjson|parquet`.
+
+        `dataset=projects|reports|comments` (reports/comments of the matching
+        projects); accepts the list filters; `gzip=1` compresses the file.
+        """
+        params = request.query_params
+        dataset = params.get("dataset", "projects")
+        if dataset not in export.DATASETS:
+            raise ValidationError({"dataset": f"Must be one of: {', '.join(export.DATASETS)}."})
+        # `format` is taken by DRF's renderer negotiation.
+        fmt = params.get("file_format", "csv")
+        error = export.check_format(fmt)
+        if error:
+            raise ValidationError({"file_format": error})
+        compress = params.get("gzip", "").lower() in ("1", "true")
+
+        # Validate filters before streaming starts, while errors can still be a 400.
+        filter_projects(Project.objects.none(), params)
+        chunks = export.export_chunks(dataset, fmt, params, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            chunks = iterate_in_thread(chunks)
+        response = StreamingHttpResponse(
+            chunks,
+            content_type="application/gzip" if compress else export.CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{export.filename(dataset, fmt, compress)}"'
+        return response
+
+
+@require_GET
+async def project_activity(request, pk):
+    """Server-sent events for new comments, report status changes and progress updates."""
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would have to buffer the whole stream; clients fall
+        # back to fetching the lists.
+        return JsonResponse({"detail": "The activity stream needs the ASGI server."}, status=501)
+    if not await Project.objects.filter(pk=pk).aexists():
+        raise Http404
+    response = StreamingHttpResponse(activity.stream(pk), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
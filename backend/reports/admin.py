@@ -6,5 +6,6 @@ from .models import Report
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
     list_display = ("project", "user", "category", "status", "created_at")
-    list_filter = ("status", "category", "created_at")
+    list_filter = ("status", "category", "project__county", "created_at")
+    list_select_related = ("project", "user")
     search_fields = ("description", "user__username", "project__title")
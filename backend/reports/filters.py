@@ -0,0 +1,38 @@
+from rest_framework.exceptions import ValidationError
+
+from .models import Report
+
+
+def _parse_choices(params, name, choices):
+    raw = params.get(name)
+    if not raw or raw == "ALL":
+        return None
+    values = [v.strip() for v in raw.split(",") if v.strip()]
+    invalid = [v for v in values if v not in choices]
+    if invalid:
+        raise ValidationError({name: f"Unknown value(s): {', '.join(invalid)}."})
+    return values
+
+
+def filter_reports(queryset, params):
+    """Apply the admin report list filters from query params."""
+    statuses = _parse_choices(params, "status", Report.Status.values)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+
+    categories = _parse_choices(params, "category", Report.Category.values)
+    if categories:
+        queryset = queryset.filter(category__in=categories)
+
+    county = params.get("county")
+    if county and county != "ALL":
+        queryset = queryset.filter(project__county=county)
+
+    project = params.get("project")
+    if project:
+        try:
+            queryset = queryset.filter(project_id=int(project))
+        except ValueError:
+            raise ValidationError({"project": "Must be an integer."})
+
+    return queryset
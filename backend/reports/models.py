@@ -28,6 +28,16 @@ class Report(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "created_at"], name="report_project_created_idx"),
+            models.Index(fields=["created_at"], name="report_created_idx"),
+            models.Index(fields=["status", "created_at"], name="report_status_created_idx"),
+            models.Index(fields=["category", "created_at"], name="report_category_created_idx"),
+        ]
 
     def __str__(self):
         return f"Report({self.project_id}, {self.user_id}, {self.status})"
+
+
+# Statuses counted in Project.open_report_count.
+OPEN_STATUSES = (Report.Status.OPEN, Report.Status.IN_REVIEW)
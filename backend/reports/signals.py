@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from config.activity import publish_on_commit
+from config.http_cache import bump_version
+from projects import counters
+from .models import OPEN_STATUSES, Report
+from .serializers import ReportSerializer
+
+
+@receiver(post_init, sender=Report)
+def snapshot_status(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred status isn't fetched.
+    instance._counted_open = instance.__dict__.get("status") in OPEN_STATUSES
+    instance._broadcast_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Report)
+def count_report(sender, instance, created, **kwargs):
+    is_open = instance.status in OPEN_STATUSES
+    if created:
+        counters.adjust(instance.project_id, report_count=1, open_report_count=int(is_open))
+    elif is_open != instance._counted_open:
+        counters.adjust(instance.project_id, open_report_count=1 if is_open else -1)
+    else:
+        return
+    instance._counted_open = is_open
+    bump_version("projects")
+
+
+@receiver(post_delete, sender=Report)
+def uncount_report(sender, instance, **kwargs):
+    counters.adjust(
+        instance.project_id,
+        report_count=-1,
+        open_report_count=-int(instance._counted_open),
+    )
+    bump_version("projects")
+
+
+@receiver([post_save, post_delete], sender=Report)
+def bump_reports_version(sender, **kwargs):
+    bump_version("reports")
+
+
+@receiver(post_save, sender=Report)
+def broadcast_report(sender, instance, created, **kwargs):
+    if created or instance.status != instance._broadcast_status:
+        publish_on_commit(instance.project_id, "report", ReportSerializer(instance).data)
+    instance._broadcast_status = instance.status
@@ -1,3 +1,100 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from projects.models import Project
+from .models import Report
+
+
+class ReportAdminListTests(TestCase):
+    url = "/api/reports/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.citizen = User.objects.create_user(username="citizen", password="pw")
+        cls.official = User.objects.create_user(username="official", password="pw", role=User.Role.OFFICIAL)
+        cls.road = Project.objects.create(title="Road", county="Nairobi")
+        cls.school = Project.objects.create(title="School", county="Kisumu")
+        Report.objects.bulk_create([
+            Report(
+                project=cls.road if i % 2 else cls.school,
+                user=cls.citizen,
+                description=f"r{i}",
+                category=Report.Category.values[i % len(Report.Category.values)],
+                status=Report.Status.values[i % len(Report.Status.values)],
+            )
+            for i in range(40)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.official)
+
+    def ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        page = response.json()
+        ids = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()
+            ids += [row["id"] for row in page["results"]]
+        return ids
+
+    def expected(self, **lookups):
+        return list(Report.objects.filter(**lookups).order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def test_requires_official_or_admin(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.force_authenticate(self.citizen)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_pages_newest_first(self):
+        self.assertEqual(self.ids(page_size=7), self.expected())
+
+    def test_filters(self):
+        self.assertEqual(self.ids(status="OPEN,RESOLVED"), self.expected(status__in=["OPEN", "RESOLVED"]))
+        self.assertEqual(self.ids(category="DELAY"), self.expected(category="DELAY"))
+        self.assertEqual(self.ids(county="Kisumu"), self.expected(project__county="Kisumu"))
+        self.assertEqual(self.ids(project=self.road.pk, status="ALL"), self.expected(project=self.road))
+        self.assertEqual(
+            self.ids(project=self.road.pk, status="OPEN", category="BUDGET"),
+            self.expected(project=self.road, status="OPEN", category="BUDGET"),
+        )
+
+    def test_invalid_filters(self):
+        for params in ({"status": "OPEN,CLOSED"}, {"category": "NOISE"}, {"project": "road"}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
+
+
+class ProjectReportThreadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(username="citizen", password="pw")
+        self.project = Project.objects.create(title="Dam")
+        self.url = f"/api/projects/{self.project.pk}/reports/"
+
+    def test_create_and_page(self):
+        self.client.force_authenticate(self.citizen)
+        for i in range(3):
+            response = self.client.post(self.url, {"description": f"r{i}", "category": "DELAY"}, format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.json()["status"], Report.Status.OPEN)
+
+        page = self.client.get(self.url, {"page_size": 2}).json()
+        self.assertEqual([row["description"] for row in page["results"]], ["r2", "r1"])
+        page = self.client.get(page["next"]).json()
+        self.assertEqual([row["description"] for row in page["results"]], ["r0"])
+        self.assertIsNone(page["next"])
+
+    def test_status_update_requires_official(self):
+        report = Report.objects.create(project=self.project, user=self.citizen, description="x")
+        self.client.force_authenticate(self.citizen)
+        self.assertEqual(self.client.patch(f"/api/reports/{report.pk}/", {"status": "RESOLVED"}).status_code, 403)
+        self.client.force_authenticate(User.objects.create_user(username="admin", password="pw", role=User.Role.ADMIN))
+        self.assertEqual(self.client.patch(f"/api/reports/{report.pk}/", {"status": "RESOLVED"}).status_code, 200)
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.Status.RESOLVED)
@@ -1,24 +1,32 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListCreateAPIView, UpdateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
+from config.fastpath import FastListMixin, RowSerializer
+from config.pagination import NewestFirstCursorPagination
 from projects.models import Project
+from .filters import filter_reports
 from .models import Report
 from .serializers import ReportSerializer, ReportStatusSerializer
 from .permissions import IsOfficialOrAdmin
 
 
-class ProjectReportListCreateView(ListCreateAPIView):
+class ProjectReportListCreateView(FastListMixin, ListCreateAPIView):
     serializer_class = ReportSerializer
+    row_serializer = RowSerializer(ReportSerializer)
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         project_id = self.kwargs.get("project_id")
         return Report.objects.filter(project_id=project_id).select_related("user", "project")
 
+    @transaction.atomic
     def perform_create(self, serializer):
         project = get_object_or_404(Project, pk=self.kwargs.get("project_id"))
-        serializer.save(project=project, user=self.request.user)
+        # request.user may be a token-backed ClaimsUser, not a model instance.
+        serializer.save(project=project, user_id=self.request.user.id)
 
 
 class ReportStatusUpdateView(UpdateAPIView):
@@ -26,8 +34,19 @@ class ReportStatusUpdateView(UpdateAPIView):
     serializer_class = ReportStatusSerializer
     permission_classes = [IsOfficialOrAdmin]
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+
+class ReportAdminListView(FastListMixin, ListAPIView):
+    """All reports, filterable by `status`, `category`, `county` and `project`."""
 
-class ReportAdminListView(ListAPIView):
-    queryset = Report.objects.all().select_related("user", "project")
     serializer_class = ReportSerializer
+    row_serializer = RowSerializer(ReportSerializer)
     permission_classes = [IsOfficialOrAdmin]
+    pagination_class = NewestFirstCursorPagination
+
+    def get_queryset(self):
+        qs = Report.objects.all().select_related("user")
+        return filter_reports(qs, self.request.query_params)
@@ -4,6 +4,13 @@ import { parseApiError } from "./errors";
 
 const API_BASE = import.meta.env.VITE_API_BASE ?? "http://127.0.0.1:8000";
 
+// Cursor-paginated list response; `next`/`previous` are absolute URLs.
+export type Page<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+};
+
 let refreshing: Promise<string> | null = null;
 
 async function getFreshAccessToken(): Promise<string> {
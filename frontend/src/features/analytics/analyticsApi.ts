@@ -1,34 +1,83 @@
 import { apiFetch } from "../../api/http";
 
-export async function trackSearch(query: string) {
-  try {
-    await apiFetch("/api/analytics/search/", {
-      method: "POST",
-      body: JSON.stringify({ query }),
-    });
-  } catch {}
+const API_BASE = import.meta.env.VITE_API_BASE ?? "http://127.0.0.1:8000";
+
+type BeaconEvent =
+  | { type: "search"; query: string; ts: string }
+  | { type: "project_view"; project_id: number; ts: string };
+
+// Beacons are queued and sent together to /api/analytics/batch/: after a short
+// idle delay, when the queue fills up, or when the page is hidden.
+const FLUSH_DELAY_MS = 2000;
+const MAX_QUEUE = 50;
+
+let queue: BeaconEvent[] = [];
+let timer: ReturnType<typeof setTimeout> | null = null;
+
+function flushBeacons() {
+  if (timer) {
+    clearTimeout(timer);
+    timer = null;
+  }
+  if (queue.length === 0) return;
+  const events = queue;
+  queue = [];
+  // keepalive lets the request outlive the page; the endpoint needs no auth.
+  fetch(`${API_BASE}/api/analytics/batch/`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ events }),
+    keepalive: true,
+  }).catch(() => {});
+}
+
+function enqueue(event: BeaconEvent) {
+  queue.push(event);
+  if (queue.length >= MAX_QUEUE) flushBeacons();
+  else if (!timer) timer = setTimeout(flushBeacons, FLUSH_DELAY_MS);
+}
+
+if (typeof window !== "undefined") {
+  window.addEventListener("pagehide", flushBeacons);
+  document.addEventListener("visibilitychange", () => {
+    if (document.visibilityState === "hidden") flushBeacons();
+  });
+}
+
+export function trackSearch(query: string) {
+  enqueue({ type: "search", query, ts: new Date().toISOString() });
 }
 
-export async function trackProjectView(project_id: number) {
-  try {
-    await apiFetch("/api/analytics/project-view/", {
-      method: "POST",
-      body: JSON.stringify({ project_id }),
-    });
-  } catch {}
+export function trackProjectView(project_id: number) {
+  enqueue({ type: "project_view", project_id, ts: new Date().toISOString() });
 }
 
+export type BudgetBreakdown = {
+  projects: number;
+  budget: string | null;
+  spent: string | null;
+};
+
+export type BudgetSummary = {
+  total_budget: string;
+  total_spent: string;
+  by_county: (BudgetBreakdown & { county: string })[];
+  by_status: (BudgetBreakdown & { status: string })[];
+};
+
 export type PulseData = {
   total_projects: number;
   status_counts: { status: string; count: number }[];
   top_searches: { query: string; count: number }[];
   top_viewed: { project_id: number; project__title: string; project__status: string | null; project__county: string | null; count: number }[];
+  most_discussed?: { id: number; title: string; status: string; county: string; comment_count: number; open_report_count: number }[];
   top_searches_7d: { query: string; count: number }[];
   trending_projects_7d: { project_id: number; project__title: string; project__status: string | null; project__county: string | null; count: number }[];
   recent_searches: { query: string; created_at: string }[];
   recent_views: { project_id: number; project__title: string; created_at: string }[];
   total_budget: number;
   total_spent: number | null;
+  budget?: BudgetSummary;
 };
 
 export async function fetchPulse(): Promise<PulseData> {
@@ -1,4 +1,4 @@
-import { apiFetch } from "../../api/http";
+import { apiFetch, type Page } from "../../api/http";
 
 export type Comment = {
   id: number;
@@ -8,10 +8,15 @@ export type Comment = {
   user_role?: string;
 };
 
-export async function fetchComments(projectId: number | string): Promise<Comment[]> {
+// Newest first; follow `next` with fetchCommentsPage for older comments.
+export async function fetchComments(projectId: number | string): Promise<Page<Comment>> {
   return apiFetch(`/api/projects/${projectId}/comments/`);
 }
 
+export async function fetchCommentsPage(url: string): Promise<Page<Comment>> {
+  return apiFetch(url);
+}
+
 export async function createComment(projectId: number | string, body: string): Promise<Comment> {
   return apiFetch(`/api/projects/${projectId}/comments/`, {
     method: "POST",
@@ -1,4 +1,10 @@
-import { apiFetch } from "../../api/http";
+import { apiFetch, type Page } from "../../api/http";
+import type { Comment } from "../comments/commentsApi";
+import type { Report } from "../reports/reportsApi";
+
+export type { Page };
+
+const API_BASE = import.meta.env.VITE_API_BASE ?? "http://127.0.0.1:8000";
 
 export type Project = {
   id: number;
@@ -13,14 +19,166 @@ export type Project = {
   longitude?: string | null;
   start_date?: string | null;
   end_date?: string | null;
+  comment_count?: number;
+  report_count?: number;
+  open_report_count?: number;
+  view_count?: number;
+  views_7d?: number;
   created_at?: string;
   updated_at?: string;
 };
 
-export async function fetchProjects(): Promise<Project[]> {
-  return apiFetch("/api/projects/");
+export type ProjectQuery = {
+  q?: string;
+  status?: string;
+  county?: string;
+  ordering?: string;
+  page_size?: number;
+  // Sparse fieldsets: a named `view` or a comma-separated `fields` list.
+  view?: "summary";
+  fields?: string;
+};
+
+function toSearch(query: Record<string, string | number | undefined>): string {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(query)) {
+    if (value === undefined || value === null || value === "" || value === "ALL") continue;
+    params.set(key, String(value));
+  }
+  const s = params.toString();
+  return s ? `?${s}` : "";
+}
+
+export async function fetchProjects(query: ProjectQuery = {}): Promise<Page<Project>> {
+  return apiFetch(`/api/projects/${toSearch(query)}`);
+}
+
+// `next`/`previous` links from a page are absolute URLs.
+export async function fetchProjectsPage(url: string): Promise<Page<Project>> {
+  return apiFetch(url);
+}
+
+export async function fetchAllProjects(query: ProjectQuery = {}): Promise<Project[]> {
+  const items: Project[] = [];
+  let page = await fetchProjects({ page_size: 100, ...query });
+  items.push(...page.results);
+  while (page.next) {
+    page = await fetchProjectsPage(page.next);
+    items.push(...page.results);
+  }
+  return items;
+}
+
+export type SearchResult = Project & { rank: number };
+
+export type SearchResponse = {
+  query: string;
+  count: number;
+  results: SearchResult[];
+};
+
+// The search endpoint logs the query for Pulse unless `typeahead` is set.
+export async function searchProjects(
+  query: ProjectQuery & { q: string; limit?: number; typeahead?: boolean }
+): Promise<SearchResponse> {
+  const { typeahead, ...rest } = query;
+  return apiFetch(`/api/projects/search/${toSearch({ ...rest, ...(typeahead ? { typeahead: 1 } : {}) })}`);
+}
+
+export type MapCluster = {
+  lat: number;
+  lng: number;
+  count: number;
+  statuses: Record<string, number>;
+  id?: number;
+};
+
+export type MapPoint = Pick<Project, "id" | "title" | "status"> & {
+  latitude: number;
+  longitude: number;
+};
+
+export type MapMarkers = {
+  bbox: [number, number, number, number];
+  zoom: number;
+} & (
+  | { mode: "clusters"; clusters: MapCluster[] }
+  | { mode: "points"; points: MapPoint[]; truncated: boolean }
+);
+
+// bbox is [west, south, east, north]; responses carry an ETag, so revisiting a
+// viewport is served from the browser cache or answered with 304.
+export async function fetchMapMarkers(
+  bbox: [number, number, number, number],
+  zoom: number,
+  query: Pick<ProjectQuery, "status" | "county"> = {}
+): Promise<MapMarkers> {
+  return apiFetch(`/api/projects/map/${toSearch({ ...query, bbox: bbox.join(","), zoom })}`);
+}
+
+export type NearbyProject = Pick<Project, "id" | "title" | "status" | "county"> & {
+  latitude: number;
+  longitude: number;
+  distance_km: number;
+};
+
+export async function fetchNearbyProjects(
+  lat: number,
+  lng: number,
+  radius = 5
+): Promise<{ count: number; results: NearbyProject[] }> {
+  return apiFetch(`/api/projects/nearby/${toSearch({ lat, lng, radius })}`);
 }
 
 export async function fetchProject(id: string | number): Promise<Project> {
   return apiFetch(`/api/projects/${id}/`);
 }
+
+export type ProjectBundle = {
+  project: Project;
+  comments: Page<Comment>;
+  reports: Page<Report>;
+  counts: { comments: number; reports: number; open_reports: number; views: number; views_7d: number };
+};
+
+// Project, first pages of comments and reports, and counts in one request.
+// The server records the project view, so no separate beacon is needed.
+export async function fetchProjectBundle(id: string | number): Promise<ProjectBundle> {
+  return apiFetch(`/api/projects/${id}/bundle/`);
+}
+
+export type ProjectActivityHandlers = {
+  comment?: (comment: Comment) => void;
+  report?: (report: Report) => void;
+  project?: (update: Partial<Project> & { id: number }) => void;
+  // Events may have been missed (the stream (re)connected, the server dropped
+  // this client's backlog, or there is no stream); refetch the project and lists.
+  resync?: () => void;
+};
+
+// How often to refetch when the server has no activity stream (501 under WSGI).
+const ACTIVITY_POLL_MS = 30_000;
+
+// Live comments, report status changes and progress updates for one project.
+// Returns a function that closes the stream.
+export function subscribeProjectActivity(id: string | number, handlers: ProjectActivityHandlers): () => void {
+  const source = new EventSource(`${API_BASE}/api/projects/${id}/activity/`);
+  let poll: number | undefined;
+  for (const [event, handler] of Object.entries(handlers)) {
+    source.addEventListener(event, (e) => (handler as (data: any) => void)(JSON.parse((e as MessageEvent).data)));
+  }
+  // Events published while disconnected aren't replayed, so catch up every
+  // time the stream (re)opens.
+  source.addEventListener("open", () => handlers.resync?.());
+  source.addEventListener("error", () => {
+    // A non-stream response closes the source for good; poll instead.
+    if (source.readyState === EventSource.CLOSED && poll === undefined) {
+      handlers.resync?.();
+      poll = window.setInterval(() => handlers.resync?.(), ACTIVITY_POLL_MS);
+    }
+  });
+  return () => {
+    source.close();
+    window.clearInterval(poll);
+  };
+}
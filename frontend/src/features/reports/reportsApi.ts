@@ -1,4 +1,4 @@
-import { apiFetch } from "../../api/http";
+import { apiFetch, type Page } from "../../api/http";
 
 export type Report = {
   id: number;
@@ -12,10 +12,15 @@ export type Report = {
   user_role?: string;
 };
 
-export async function fetchReports(projectId: number | string): Promise<Report[]> {
+// Newest first; follow `next` with fetchReportsPage for older reports.
+export async function fetchReports(projectId: number | string): Promise<Page<Report>> {
   return apiFetch(`/api/projects/${projectId}/reports/`);
 }
 
+export async function fetchReportsPage(url: string): Promise<Page<Report>> {
+  return apiFetch(url);
+}
+
 export async function createReport(
   projectId: number | string,
   payload: { category: string; description: string }
@@ -33,6 +38,17 @@ export async function updateReportStatus(reportId: number, status: string): Prom
   });
 }
 
-export async function fetchAllReports(): Promise<Report[]> {
-  return apiFetch(`/api/reports/`);
+export type ReportQuery = {
+  status?: string;
+  category?: string;
+  county?: string;
+};
+
+export async function fetchAdminReports(query: ReportQuery = {}): Promise<Page<Report>> {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(query)) {
+    if (value && value !== "ALL") params.set(key, value);
+  }
+  const s = params.toString();
+  return apiFetch(`/api/reports/${s ? `?${s}` : ""}`);
 }
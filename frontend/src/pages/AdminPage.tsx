@@ -1,17 +1,35 @@
 import { useEffect, useState } from "react";
+import Button from "../components/ui/Button";
 import Card from "../components/ui/Card";
+import Input from "../components/ui/Input";
+import Select from "../components/ui/Select";
 import { useAuth } from "../features/auth/authContext";
-import { fetchAllReports, updateReportStatus, type Report } from "../features/reports/reportsApi";
+import {
+  fetchAdminReports,
+  fetchReportsPage,
+  updateReportStatus,
+  type Report,
+} from "../features/reports/reportsApi";
+import useDebounce from "../hooks/useDebounce";
 
 export default function AdminPage() {
   const { user } = useAuth();
   const [reports, setReports] = useState<Report[]>([]);
+  const [next, setNext] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [err, setErr] = useState<string | null>(null);
 
+  const [status, setStatus] = useState("ALL");
+  const [category, setCategory] = useState("ALL");
+  const [county, setCounty] = useState("");
+  const debouncedCounty = useDebounce(county, 300);
+
   const isStaff = user?.role === "ADMIN" || user?.role === "OFFICIAL";
 
+  // Filtering happens server-side; refetch the first page whenever filters change.
   useEffect(() => {
+    let cancelled = false;
     (async () => {
       if (!isStaff) {
         setLoading(false);
@@ -20,15 +38,34 @@ export default function AdminPage() {
       try {
         setErr(null);
         setLoading(true);
-        const data = await fetchAllReports();
-        setReports(data);
+        const page = await fetchAdminReports({ status, category, county: debouncedCounty.trim() });
+        if (cancelled) return;
+        setReports(page.results);
+        setNext(page.next);
       } catch (e: any) {
-        setErr(e?.message ?? "Failed to load reports");
+        if (!cancelled) setErr(e?.message ?? "Failed to load reports");
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     })();
-  }, [isStaff]);
+    return () => {
+      cancelled = true;
+    };
+  }, [isStaff, status, category, debouncedCounty]);
+
+  async function loadMore() {
+    if (!next) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchReportsPage(next);
+      setReports((prev) => [...prev, ...page.results]);
+      setNext(page.next);
+    } catch (e: any) {
+      setErr(e?.message ?? "Failed to load reports");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
 
   async function handleStatusChange(reportId: number, status: string) {
     try {
@@ -50,12 +87,38 @@ export default function AdminPage() {
         <p className="muted">Review citizen reports and update their status.</p>
       </div>
 
+      <Card className="stack" style={{ padding: 18 }}>
+        <div className="grid gridAuto">
+          <Select label="Status" value={status} onChange={(e) => setStatus(e.target.value)}>
+            <option value="ALL">All</option>
+            <option value="OPEN">Open</option>
+            <option value="IN_REVIEW">In review</option>
+            <option value="RESOLVED">Resolved</option>
+            <option value="DISMISSED">Dismissed</option>
+          </Select>
+          <Select label="Category" value={category} onChange={(e) => setCategory(e.target.value)}>
+            <option value="ALL">All</option>
+            <option value="CORRUPTION">Corruption</option>
+            <option value="DELAY">Delay</option>
+            <option value="QUALITY">Quality issue</option>
+            <option value="BUDGET">Budget concern</option>
+            <option value="OTHER">Other</option>
+          </Select>
+          <Input
+            label="County"
+            value={county}
+            onChange={(e) => setCounty(e.target.value)}
+            placeholder="e.g. Nairobi"
+          />
+        </div>
+      </Card>
+
       {err ? <div className="errorCard">{err}</div> : null}
 
       {loading ? (
         <Card className="emptyState">Loading reports…</Card>
       ) : reports.length === 0 ? (
-        <Card className="emptyState">No reports yet.</Card>
+        <Card className="emptyState">No reports match these filters.</Card>
       ) : (
         <div className="stack">
           {reports.map((r) => (
@@ -88,6 +151,14 @@ export default function AdminPage() {
           ))}
         </div>
       )}
+
+      {!loading && next ? (
+        <div style={{ display: "flex", justifyContent: "center" }}>
+          <Button onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading…" : "Load more"}
+          </Button>
+        </div>
+      ) : null}
     </div>
   );
 }
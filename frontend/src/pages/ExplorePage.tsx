@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
-import { fetchPulse, trackSearch, type PulseData } from "../features/analytics/analyticsApi";
+import { fetchPulse, type PulseData } from "../features/analytics/analyticsApi";
 import Card from "../components/ui/Card";
 import Button from "../components/ui/Button";
 import Input from "../components/ui/Input";
@@ -69,7 +69,6 @@ export default function ExplorePage() {
   function onSearch(e: React.FormEvent) {
     e.preventDefault();
     const term = q.trim();
-    if (term) trackSearch(term);
     nav(`/projects${term ? `?q=${encodeURIComponent(term)}` : ""}`);
   }
 
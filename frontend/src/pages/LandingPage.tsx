@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import { fetchProjects, type Project } from "../features/projects/projectsApi";
-import { trackSearch } from "../features/analytics/analyticsApi";
+import { fetchPulse, type PulseData } from "../features/analytics/analyticsApi";
 import { useAuth } from "../features/auth/authContext";
 import Card from "../components/ui/Card";
 import Button from "../components/ui/Button";
@@ -12,36 +12,43 @@ export default function LandingPage() {
   const nav = useNavigate();
   const { user } = useAuth();
   const [items, setItems] = useState<Project[]>([]);
+  const [pulse, setPulse] = useState<PulseData | null>(null);
   const [q, setQ] = useState("");
   const authed = !!user;
 
   useEffect(() => {
     (async () => {
       try {
-        const data = await fetchProjects();
-        setItems(data);
+        const data = await fetchProjects({ status: "ONGOING", page_size: 6, view: "summary" });
+        setItems(data.results);
       } catch {
         setItems([]);
       }
     })();
+    (async () => {
+      try {
+        setPulse(await fetchPulse());
+      } catch {
+        setPulse(null);
+      }
+    })();
   }, []);
 
-  const ongoingTop = useMemo(() => {
-    const ongoing = items.filter((p) => (p.status || "").toUpperCase() === "ONGOING");
-    return ongoing.slice(0, 6);
-  }, [items]);
+  const ongoingTop = items;
 
   const counts = useMemo(() => {
-    const total = items.length;
-    const ongoing = items.filter((p) => (p.status || "").toUpperCase() === "ONGOING").length;
-    const completed = items.filter((p) => (p.status || "").toUpperCase() === "COMPLETED").length;
-    return { total, ongoing, completed };
-  }, [items]);
+    const byStatus = (status: string) =>
+      pulse?.status_counts.find((s) => s.status === status)?.count ?? 0;
+    return {
+      total: pulse?.total_projects ?? 0,
+      ongoing: byStatus("ONGOING"),
+      completed: byStatus("COMPLETED"),
+    };
+  }, [pulse]);
 
   function onSearch(e: React.FormEvent) {
     e.preventDefault();
     const term = q.trim();
-    if (term) trackSearch(term);
     nav(`/projects${term ? `?q=${encodeURIComponent(term)}` : ""}`);
   }
 
@@ -6,7 +6,7 @@ import type { Map as LeafletMap } from "leaflet";
 import "leaflet/dist/leaflet.css";
 import "react-leaflet-cluster/lib/assets/MarkerCluster.css";
 import "react-leaflet-cluster/lib/assets/MarkerCluster.Default.css";
-import { fetchProjects, type Project } from "../features/projects/projectsApi";
+import { fetchAllProjects, type Project } from "../features/projects/projectsApi";
 import { configureLeafletIcons } from "../features/maps/leaflet";
 import Card from "../components/ui/Card";
 import Button from "../components/ui/Button";
@@ -45,7 +45,7 @@ export default function MapPage() {
       try {
         setErr(null);
         setLoading(true);
-        const data = await fetchProjects();
+        const data = await fetchAllProjects({ fields: "id,title,county,status,progress,latitude,longitude" });
         setProjects(data);
       } catch (e: any) {
         setErr(e?.message ?? "Failed to load projects");
@@ -1,15 +1,14 @@
-import { useEffect, useMemo, useRef, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 import { Link, useNavigate, useParams } from "react-router-dom";
-import { fetchProject, type Project } from "../features/projects/projectsApi";
+import { fetchProject, fetchProjectBundle, subscribeProjectActivity, type Project } from "../features/projects/projectsApi";
 import StatusPill from "../components/StatusPill";
-import { trackProjectView } from "../features/analytics/analyticsApi";
 import { useAuth } from "../features/auth/authContext";
 import Card from "../components/ui/Card";
 import Button from "../components/ui/Button";
 import Tabs from "../components/ui/Tabs";
 import Modal from "../components/ui/Modal";
-import { createComment, fetchComments, type Comment } from "../features/comments/commentsApi";
-import { createReport, fetchReports, type Report } from "../features/reports/reportsApi";
+import { createComment, fetchComments, fetchCommentsPage, type Comment } from "../features/comments/commentsApi";
+import { createReport, fetchReports, fetchReportsPage, type Report } from "../features/reports/reportsApi";
 
 export default function ProjectDetails() {
   const { id } = useParams();
@@ -20,6 +19,8 @@ export default function ProjectDetails() {
 
   const [comments, setComments] = useState<Comment[]>([]);
   const [reports, setReports] = useState<Report[]>([]);
+  const [commentsNext, setCommentsNext] = useState<string | null>(null);
+  const [reportsNext, setReportsNext] = useState<string | null>(null);
   const [socialLoading, setSocialLoading] = useState(true);
   const [socialErr, setSocialErr] = useState<string | null>(null);
   const [actionErr, setActionErr] = useState<string | null>(null);
@@ -30,43 +31,55 @@ export default function ProjectDetails() {
   const [reportCategory, setReportCategory] = useState("DELAY");
   const [reportBody, setReportBody] = useState("");
 
-  const trackedRef = useRef<string | null>(null);
-
-  useEffect(() => {
-    (async () => {
-      try {
-        setErr(null);
-        if (!id) return;
-        const data = await fetchProject(id);
-        setItem(data);
-
-        if (id && trackedRef.current !== id) {
-          trackedRef.current = id;
-          trackProjectView(Number(id));
-        }
-      } catch (e: any) {
-        setErr(e?.message ?? "Failed to load project");
-      }
-    })();
-  }, [id]);
-
   useEffect(() => {
     (async () => {
       if (!id) return;
       try {
+        setErr(null);
         setSocialErr(null);
         setSocialLoading(true);
-        const [c, r] = await Promise.all([fetchComments(id), fetchReports(id)]);
-        setComments(c);
-        setReports(r);
+        // One request for the project and its threads; it also counts the view.
+        const bundle = await fetchProjectBundle(id);
+        setItem(bundle.project);
+        setComments(bundle.comments.results);
+        setCommentsNext(bundle.comments.next);
+        setReports(bundle.reports.results);
+        setReportsNext(bundle.reports.next);
       } catch (e: any) {
-        setSocialErr(e?.message ?? "Failed to load community activity");
+        setErr(e?.message ?? "Failed to load project");
       } finally {
         setSocialLoading(false);
       }
     })();
   }, [id]);
 
+  // Push new activity instead of polling the lists.
+  useEffect(() => {
+    if (!id) return;
+    const refetch = async () => {
+      const [p, c, r] = await Promise.all([fetchProject(id), fetchComments(id), fetchReports(id)]);
+      setItem(p);
+      setComments(c.results);
+      setCommentsNext(c.next);
+      setReports(r.results);
+      setReportsNext(r.next);
+    };
+    return subscribeProjectActivity(id, {
+      comment: (comment) =>
+        setComments((prev) => (prev.some((c) => c.id === comment.id) ? prev : [comment, ...prev])),
+      report: (report) =>
+        setReports((prev) =>
+          prev.some((r) => r.id === report.id)
+            ? prev.map((r) => (r.id === report.id ? report : r))
+            : [report, ...prev]
+        ),
+      project: (update) => setItem((prev) => (prev ? { ...prev, ...update } : prev)),
+      resync: () => {
+        refetch().catch(() => undefined);
+      },
+    });
+  }, [id]);
+
   async function submitComment() {
     if (!id || !commentBody.trim()) return;
     try {
@@ -74,8 +87,9 @@ export default function ProjectDetails() {
       await createComment(id, commentBody.trim());
       setCommentBody("");
       setCommentModal(false);
-      const data = await fetchComments(id);
-      setComments(data);
+      const page = await fetchComments(id);
+      setComments(page.results);
+      setCommentsNext(page.next);
     } catch (e: any) {
       setActionErr(e?.message ?? "Failed to submit comment");
     }
@@ -88,13 +102,36 @@ export default function ProjectDetails() {
       await createReport(id, { category: reportCategory, description: reportBody.trim() });
       setReportBody("");
       setReportModal(false);
-      const data = await fetchReports(id);
-      setReports(data);
+      const page = await fetchReports(id);
+      setReports(page.results);
+      setReportsNext(page.next);
     } catch (e: any) {
       setActionErr(e?.message ?? "Failed to submit report");
     }
   }
 
+  async function loadMoreComments() {
+    if (!commentsNext) return;
+    try {
+      const page = await fetchCommentsPage(commentsNext);
+      setComments((prev) => [...prev, ...page.results]);
+      setCommentsNext(page.next);
+    } catch (e: any) {
+      setSocialErr(e?.message ?? "Failed to load comments");
+    }
+  }
+
+  async function loadMoreReports() {
+    if (!reportsNext) return;
+    try {
+      const page = await fetchReportsPage(reportsNext);
+      setReports((prev) => [...prev, ...page.results]);
+      setReportsNext(page.next);
+    } catch (e: any) {
+      setSocialErr(e?.message ?? "Failed to load reports");
+    }
+  }
+
   const progress = Math.max(0, Math.min(100, Number(item?.progress ?? 0)));
   const rawBudget = item?.budget;
   const budget = rawBudget === null || rawBudget === undefined ? null : Number(rawBudget);
@@ -229,6 +266,9 @@ export default function ProjectDetails() {
                     <div className="muted" style={{ whiteSpace: "pre-wrap" }}>{c.body}</div>
                   </div>
                 ))}
+                {commentsNext ? (
+                  <Button variant="ghost" onClick={loadMoreComments}>Load older comments</Button>
+                ) : null}
               </div>
             )}
           </Card>
@@ -251,6 +291,9 @@ export default function ProjectDetails() {
                     <div className="muted" style={{ fontSize: 12 }}>Filed by {r.user_username || "Citizen"}</div>
                   </div>
                 ))}
+                {reportsNext ? (
+                  <Button variant="ghost" onClick={loadMoreReports}>Load older reports</Button>
+                ) : null}
               </div>
             )}
           </Card>
@@ -1,39 +1,83 @@
 import { useEffect, useMemo, useState } from "react";
 import { Link, useSearchParams } from "react-router-dom";
-import { fetchProjects, type Project } from "../features/projects/projectsApi";
+import {
+  fetchProjects,
+  fetchProjectsPage,
+  searchProjects,
+  type Project,
+} from "../features/projects/projectsApi";
 import StatusPill from "../components/StatusPill";
+import Button from "../components/ui/Button";
 import Card from "../components/ui/Card";
 import Input from "../components/ui/Input";
 import Select from "../components/ui/Select";
 import Skeleton from "../components/ui/Skeleton";
 import useDebounce from "../hooks/useDebounce";
 
+// Only what the cards below display.
+const CARD_FIELDS = "id,title,description,county,status,budget,progress,comment_count,open_report_count,views_7d";
+
 export default function ProjectsPage() {
   const [searchParams] = useSearchParams();
   const [items, setItems] = useState<Project[]>([]);
+  const [next, setNext] = useState<string | null>(null);
   const [err, setErr] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const [q, setQ] = useState(() => searchParams.get("q") ?? "");
   const [status, setStatus] = useState(() => (searchParams.get("status") ?? "ALL").toUpperCase());
   const [county, setCounty] = useState(() => searchParams.get("county") ?? "ALL");
+  const [ordering, setOrdering] = useState("-created_at");
 
   const debouncedQ = useDebounce(q, 300);
 
+  // Filtering happens server-side; refetch the first page whenever filters change.
+  // Keyword searches go through the ranked search endpoint, which also records
+  // the search for Pulse (only for the term submitted via the URL, not while typing).
   useEffect(() => {
+    let cancelled = false;
     (async () => {
       try {
         setErr(null);
         setLoading(true);
-        const data = await fetchProjects();
-        setItems(data);
+        const term = debouncedQ.trim();
+        if (term) {
+          const submitted = (searchParams.get("q") ?? "").trim();
+          const res = await searchProjects({ q: term, status, county, limit: 50, typeahead: term !== submitted });
+          if (cancelled) return;
+          setItems(res.results);
+          setNext(null);
+          return;
+        }
+        const page = await fetchProjects({ status, county, ordering, fields: CARD_FIELDS });
+        if (cancelled) return;
+        setItems(page.results);
+        setNext(page.next);
       } catch (e: any) {
-        setErr(e?.message ?? "Failed to load projects");
+        if (!cancelled) setErr(e?.message ?? "Failed to load projects");
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     })();
-  }, []);
+    return () => {
+      cancelled = true;
+    };
+  }, [debouncedQ, status, county, ordering]);
+
+  async function loadMore() {
+    if (!next) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchProjectsPage(next);
+      setItems((prev) => [...prev, ...page.results]);
+      setNext(page.next);
+    } catch (e: any) {
+      setErr(e?.message ?? "Failed to load projects");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
 
   useEffect(() => {
     const nextQ = searchParams.get("q") ?? "";
@@ -47,28 +91,14 @@ export default function ProjectsPage() {
   const counties = useMemo(() => {
     const set = new Set<string>();
     for (const p of items) if (p.county) set.add(p.county);
+    if (county !== "ALL") set.add(county);
     return ["ALL", ...Array.from(set).sort()];
-  }, [items]);
-
-  const filtered = useMemo(() => {
-    const term = debouncedQ.trim().toLowerCase();
-    return items.filter((p) => {
-      const matchQ =
-        !term ||
-        (p.title || "").toLowerCase().includes(term) ||
-        (p.description || "").toLowerCase().includes(term);
-
-      const matchStatus = status === "ALL" || (p.status || "").toUpperCase() === status;
-      const matchCounty = county === "ALL" || (p.county || "") === county;
-
-      return matchQ && matchStatus && matchCounty;
-    });
-  }, [items, debouncedQ, status, county]);
+  }, [items, county]);
 
   return (
     <div className="page">
       <h2 className="sectionTitle">Projects</h2>
-      <p className="muted">Showing {filtered.length} of {items.length}</p>
+      <p className="muted">Showing {items.length}{next ? "+" : ""} projects</p>
 
       <Card className="stack" style={{ padding: 18 }}>
         <div className="grid gridAuto">
@@ -92,6 +122,13 @@ export default function ProjectsPage() {
               </option>
             ))}
           </Select>
+          <Select label="Sort by" value={ordering} onChange={(e) => setOrdering(e.target.value)}>
+            <option value="-created_at">Newest</option>
+            <option value="-updated_at">Recently updated</option>
+            <option value="-views_7d">Most viewed this week</option>
+            <option value="-comment_count">Most discussed</option>
+            <option value="-open_report_count">Most open reports</option>
+          </Select>
         </div>
       </Card>
 
@@ -110,11 +147,11 @@ export default function ProjectsPage() {
         </div>
       ) : err ? (
         <div className="errorCard">{err}</div>
-      ) : filtered.length === 0 ? (
+      ) : items.length === 0 ? (
         <Card className="emptyState">No projects match your filters.</Card>
       ) : (
         <div className="grid gridAuto">
-          {filtered.map((p) => {
+          {items.map((p) => {
             const progress = Math.max(0, Math.min(100, Number(p.progress ?? 0)));
             return (
               <Link key={p.id} to={`/projects/${p.id}`} className="projectCardLink">
@@ -143,12 +180,24 @@ export default function ProjectsPage() {
                       <div className="progressFill" style={{ width: `${progress}%` }} />
                     </div>
                   </div>
+
+                  <div className="muted" style={{ fontSize: 12 }}>
+                    {p.comment_count ?? 0} comments • {p.open_report_count ?? 0} open reports • {p.views_7d ?? 0} views this week
+                  </div>
                 </Card>
               </Link>
             );
           })}
         </div>
       )}
+
+      {!loading && !err && next ? (
+        <div style={{ display: "flex", justifyContent: "center", marginTop: 16 }}>
+          <Button onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading…" : "Load more"}
+          </Button>
+        </div>
+      ) : null}
     </div>
   );
 }